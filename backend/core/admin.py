@@ -1,7 +1,112 @@
+from django.conf import settings
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.core.exceptions import PermissionDenied
+from django.core.paginator import Paginator
+from django.db import connections
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import path, reverse
+from django.utils.functional import cached_property
 from django.utils.html import format_html
-from .models import User, Category, Tag, BlogPost, Event, ContactMessage, GalleryImage , Project
+from django.utils.translation import gettext_lazy as _
+from .models import User, Category, Tag, BlogPost, Event, ContactMessage, GalleryImage , Project, Speaker, RequestProfile
+from .profiling import MODE_PARAM, QUERY_PARAM, make_token
+
+
+# ========================
+# Listagens grandes
+# ========================
+# Abaixo disso o COUNT(*) exato é barato e a estimativa não compensa
+ESTIMATED_COUNT_THRESHOLD = 10_000
+
+
+def estimated_count(model):
+    """Número aproximado de linhas da tabela pelas estatísticas do banco (ou None)."""
+    connection = connections[model.objects.db]
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass', [table])
+        elif connection.vendor == 'sqlite':
+            # Só existe depois de ANALYZE / PRAGMA optimize; a 1ª coluna de "stat" é o total de linhas
+            cursor.execute("SELECT name FROM sqlite_master WHERE name = 'sqlite_stat1'")
+            if cursor.fetchone() is None:
+                return None
+            cursor.execute('SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1', [table])
+        else:
+            return None
+        row = cursor.fetchone()
+    if not row or row[0] is None:
+        return None
+    value = int(str(row[0]).split()[0])
+    return value if value >= 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """Na listagem sem filtros de uma tabela grande, usa a estimativa no lugar do COUNT(*)."""
+
+    @cached_property
+    def count(self):
+        query = getattr(self.object_list, 'query', None)
+        if query is not None and not query.where:
+            estimate = estimated_count(self.object_list.model)
+            if estimate is not None and estimate >= ESTIMATED_COUNT_THRESHOLD:
+                return estimate
+        return super().count
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """Base dos admins de tabelas que crescem sem limite.
+
+    Sem o segundo COUNT(*) da tabela inteira ("x de N selecionados"), com total
+    estimado quando não há filtro e ordenação coberta por índice. Evite
+    ``date_hierarchy`` nesses admins: ele faz um SELECT DISTINCT na tabela
+    inteira a cada acesso; o filtro de data da lateral não consulta o banco.
+    """
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+    list_per_page = 50
+
+
+class InputFilter(admin.SimpleListFilter):
+    """Filtro por texto digitado, no lugar da lista com todos os valores possíveis."""
+    template = 'admin/input_filter.html'
+
+    def lookups(self, request, model_admin):
+        # Uma opção fictícia só para o Django exibir o filtro
+        return (('', ''),)
+
+    def choices(self, changelist):
+        all_choice = next(super().choices(changelist))
+        all_choice['query_parts'] = [
+            (key, value)
+            for key, values in changelist.get_filters_params().items()
+            if key != self.parameter_name
+            for value in values
+        ]
+        yield all_choice
+
+
+class AuthorFilter(InputFilter):
+    title = _('autor (usuário)')
+    parameter_name = 'autor'
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(author__username=self.value().strip())
+
+
+class EventFilter(InputFilter):
+    title = _('evento (id ou título)')
+    parameter_name = 'evento'
+
+    def queryset(self, request, queryset):
+        value = (self.value() or '').strip()
+        if value.isdigit():
+            return queryset.filter(event_id=int(value))
+        if value:
+            return queryset.filter(event__title__icontains=value)
 
 
 @admin.register(User)
@@ -22,21 +127,21 @@ class UserAdmin(BaseUserAdmin):
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
-    list_display = ('name', 'slug')
+    list_display = ('name', 'slug', 'post_count', 'event_count', 'project_count')
     search_fields = ('name',)
     prepopulated_fields = {'slug': ('name',)}
     ordering = ('name',)
 
 @admin.register(Tag)
 class TagAdmin(admin.ModelAdmin):
-    list_display = ('name', 'slug', 'created_at')
+    list_display = ('name', 'slug', 'post_count', 'event_count', 'project_count', 'created_at')
     search_fields = ('name',)
     prepopulated_fields = {'slug': ('name',)}
     ordering = ('name',)
 
 
 @admin.register(BlogPost)
-class BlogPostAdmin(admin.ModelAdmin):
+class BlogPostAdmin(LargeTableAdmin):
     list_display = (
         'title', 
         'author', 
@@ -46,12 +151,13 @@ class BlogPostAdmin(admin.ModelAdmin):
         'views', 
         'published_date'
     )
-    list_filter = ('status', 'featured', 'category', 'published_date', 'author')
+    list_filter = ('status', 'featured', 'category', 'published_date', AuthorFilter)
+    list_select_related = ('author', 'category')
     search_fields = ('title', 'excerpt', 'content')
     prepopulated_fields = {'slug': ('title',)}
-    filter_horizontal = ('tags',)
-    date_hierarchy = 'published_date'
-    ordering = ('-published_date',)
+    autocomplete_fields = ('author', 'category', 'tags')
+    # Coberta pelo índice post_published_idx
+    ordering = ('-published_date', '-id')
     
     fieldsets = (
         ('Informações Básicas', {
@@ -79,7 +185,7 @@ class BlogPostAdmin(admin.ModelAdmin):
 
 
 @admin.register(Event)
-class EventAdmin(admin.ModelAdmin):
+class EventAdmin(LargeTableAdmin):
     list_display = (
         'title', 
         'date', 
@@ -91,11 +197,12 @@ class EventAdmin(admin.ModelAdmin):
         'organizer'
     )
     list_filter = ('status', 'event_type', 'featured', 'date', 'category')
+    list_select_related = ('category',)
     search_fields = ('title', 'description', 'location', 'organizer')
     prepopulated_fields = {'slug': ('title',)}
-    filter_horizontal = ('tags',)
-    date_hierarchy = 'date'
-    ordering = ('-date',)
+    autocomplete_fields = ('category', 'tags')
+    # Coberta pelo índice event_date_start_idx (percorrido de trás para frente)
+    ordering = ('-date', '-start_time', '-id')
     
     fieldsets = (
         ('Informações Básicas', {
@@ -131,12 +238,24 @@ class EventAdmin(admin.ModelAdmin):
     registered_capacity.short_description = 'Inscritos/Capacidade'
 
 
+@admin.register(Speaker)
+class SpeakerAdmin(admin.ModelAdmin):
+    list_display = ('name', 'slug', 'created_at')
+    search_fields = ('name',)
+    # O slug é a chave usada para ligar o texto "Palestrantes" dos eventos a este cadastro
+    readonly_fields = ('slug',)
+    ordering = ('name',)
+
+
 @admin.register(GalleryImage)
-class GalleryImageAdmin(admin.ModelAdmin):
+class GalleryImageAdmin(LargeTableAdmin):
     list_display = ('title', 'event', 'published', 'uploaded_at')
-    list_filter = ('published', 'event')
+    list_filter = ('published', EventFilter)
+    list_select_related = ('event',)
     search_fields = ('title', 'description')
-    ordering = ('-uploaded_at',)
+    autocomplete_fields = ('event',)
+    # Coberta pelo índice gallery_uploaded_idx
+    ordering = ('-uploaded_at', '-id')
     
     fieldsets = (
         ('Detalhes da Imagem', {
@@ -149,12 +268,13 @@ class GalleryImageAdmin(admin.ModelAdmin):
 
 
 @admin.register(ContactMessage)
-class ContactMessageAdmin(admin.ModelAdmin):
+class ContactMessageAdmin(LargeTableAdmin):
     list_display = ('name', 'email', 'subject', 'is_read', 'created_at')
     list_filter = ('is_read', 'created_at')
     search_fields = ('name', 'email', 'subject', 'message')
     readonly_fields = ('name', 'email', 'subject', 'message', 'created_at')
-    ordering = ('-created_at',)
+    # Coberta pelo índice contact_created_idx
+    ordering = ('-created_at', '-id')
     
     def has_add_permission(self, request):
         return False  # Prevent adding through admin
@@ -176,7 +296,7 @@ class ContactMessageAdmin(admin.ModelAdmin):
 # 🌟 NOVO: CONFIGURAÇÃO DO ADMIN PARA O MODELO PROJECT
 # ----------------------------------------------------
 @admin.register(Project)
-class ProjectAdmin(admin.ModelAdmin):
+class ProjectAdmin(LargeTableAdmin):
     list_display = (
         'title',
         'status',
@@ -186,10 +306,12 @@ class ProjectAdmin(admin.ModelAdmin):
         'updated_at'
     )
 
-    list_filter = ('status', 'featured', 'category')
+    list_filter = ('status', 'featured', 'category', 'created_at')
+    list_select_related = ('category',)
     search_fields = ('title', 'description')
-    date_hierarchy = 'created_at'
-    ordering = ('-created_at',)
+    autocomplete_fields = ('category', 'tags')
+    # Coberta pelo índice project_created_idx
+    ordering = ('-created_at', '-id')
 
     # Preenche slug automaticamente a partir do título
     prepopulated_fields = {'slug': ('title',)}
@@ -211,3 +333,59 @@ class ProjectAdmin(admin.ModelAdmin):
     )
 
     readonly_fields = ('created_at', 'updated_at')
+
+
+@admin.register(RequestProfile)
+class RequestProfileAdmin(admin.ModelAdmin):
+    list_display = ('path', 'method', 'status_code', 'mode', 'duration_ms', 'samples', 'user', 'created_at', 'download_link')
+    list_filter = ('mode', 'status_code')
+    list_select_related = ('user',)
+    search_fields = ('path',)
+    exclude = ('data',)
+    readonly_fields = ('user', 'method', 'path', 'status_code', 'mode', 'duration_ms', 'samples', 'created_at', 'download_link')
+    change_list_template = 'admin/core/requestprofile/change_list.html'
+
+    def get_queryset(self, request):
+        # O perfil em si só é lido no download
+        return super().get_queryset(request).defer('data')
+
+    def has_add_permission(self, request):
+        return False  # Criados pelo core.profiling.RequestProfilerMiddleware
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def get_urls(self):
+        urls = [
+            path(
+                '<int:pk>/download/',
+                self.admin_site.admin_view(self.download_view),
+                name='core_requestprofile_download',
+            ),
+        ]
+        return urls + super().get_urls()
+
+    def download_view(self, request, pk):
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        profile = get_object_or_404(RequestProfile, pk=pk)
+        content_type = 'text/plain; charset=utf-8' if profile.mode == 'sampling' else 'application/octet-stream'
+        response = HttpResponse(bytes(profile.data), content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="{profile.filename}"'
+        return response
+
+    @admin.display(description=_('Arquivo'))
+    def download_link(self, obj):
+        url = reverse('admin:core_requestprofile_download', args=[obj.pk])
+        return format_html('<a href="{}">{}</a>', url, obj.filename)
+
+    def changelist_view(self, request, extra_context=None):
+        token = make_token(request.user)
+        extra_context = {
+            **(extra_context or {}),
+            'profile_token': token,
+            'profile_param': QUERY_PARAM,
+            'profile_mode_param': MODE_PARAM,
+            'profile_token_hours': settings.PROFILER_TOKEN_MAX_AGE // 3600,
+        }
+        return super().changelist_view(request, extra_context)
@@ -5,3 +5,8 @@ class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
     verbose_name = 'NEABI Core'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from . import slowlog
+        slowlog.setup()
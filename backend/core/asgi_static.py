@@ -0,0 +1,62 @@
+"""Arquivos estáticos no modo ASGI, na frente da aplicação Django.
+
+O ``WhiteNoiseMiddleware`` só funciona de forma síncrona: dentro de
+``MIDDLEWARE`` ele faria o Django adaptar toda requisição com
+``async_to_sync``, prendendo uma thread até nas views assíncronas (contato,
+``/api/eventos/``, mídia). No ASGI ele sai de ``MIDDLEWARE`` (ver settings) e
+``StaticFilesApp`` atende ``STATIC_URL`` antes da pilha do Django, com a mesma
+configuração e o mesmo índice de arquivos do WhiteNoise (cabeçalhos de
+cache, variantes .br/.gz, Range, 304). O arquivo é lido em blocos fora do
+event loop.
+"""
+import asyncio
+
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+
+CHUNK_SIZE = 64 * 1024
+
+
+class StaticFilesApp:
+    def __init__(self, application):
+        self.application = application
+        # Só o índice de arquivos e a configuração (WHITENOISE_*); nunca entra na pilha
+        self.whitenoise = WhiteNoiseMiddleware()
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'http':
+            static_file = await self.find(scope['path'])
+            if static_file is not None:
+                await self.serve(static_file, scope, send)
+                return
+        await self.application(scope, receive, send)
+
+    async def find(self, path):
+        if self.whitenoise.autorefresh:
+            # DEBUG: procura no disco (e nos finders) a cada requisição
+            return await asyncio.to_thread(self.whitenoise.find_file, path)
+        return self.whitenoise.files.get(path)
+
+    async def serve(self, static_file, scope, send):
+        # O StaticFile do WhiteNoise lê os cabeçalhos no formato do environ WSGI
+        request_headers = {
+            'HTTP_' + name.decode('latin-1').upper().replace('-', '_'): value.decode('latin-1')
+            for name, value in scope['headers']
+        }
+        response = await asyncio.to_thread(static_file.get_response, scope['method'], request_headers)
+        await send({
+            'type': 'http.response.start',
+            'status': int(response.status),
+            'headers': [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in response.headers],
+        })
+        if response.file is None:
+            await send({'type': 'http.response.body', 'body': b''})
+            return
+        try:
+            while True:
+                chunk = await asyncio.to_thread(response.file.read, CHUNK_SIZE)
+                await send({'type': 'http.response.body', 'body': chunk, 'more_body': bool(chunk)})
+                if not chunk:
+                    break
+        finally:
+            await asyncio.to_thread(response.file.close)
@@ -0,0 +1,47 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.db.models import Case, Q, Value, When
+from django.db.models.functions import Lower
+
+
+class EmailOrUsernameBackend(ModelBackend):
+    """Autentica por nome de usuário ou email, sem diferenciar maiúsculas.
+
+    Resolve o usuário em uma única consulta pelos índices LOWER(username) e
+    LOWER(email) e verifica a senha exatamente uma vez. Para usuários
+    inexistentes calcula um hash descartável, mantendo o tempo de resposta
+    igual ao de uma senha errada.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        UserModel = get_user_model()
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+
+        login = username.strip()
+        login_lower = login.lower()
+        # Emails duplicados não geram erro: vale o username exato, depois o
+        # username sem caixa, depois o email — e, no empate, o usuário mais antigo.
+        user = (
+            UserModel._default_manager
+            .alias(username_lower=Lower('username'), email_lower=Lower('email'))
+            .filter(Q(username_lower=login_lower) | Q(email_lower=login_lower))
+            .order_by(
+                Case(
+                    When(username=login, then=Value(0)),
+                    When(username_lower=login_lower, then=Value(1)),
+                    default=Value(2),
+                ),
+                'pk',
+            )
+            .first()
+        )
+
+        if user is None:
+            UserModel().set_password(password)
+            return None
+        if user.check_password(password) and self.user_can_authenticate(user):
+            return user
+        return None
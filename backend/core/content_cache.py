@@ -0,0 +1,127 @@
+"""Carimbo de versão do conteúdo público.
+
+Caches que dependem de posts, eventos, projetos, tags ou galeria incluem
+``get_content_version()`` na chave; qualquer alteração chama
+``bump_content_version()`` e as entradas antigas simplesmente deixam de
+ser lidas (e expiram sozinhas).
+"""
+import hashlib
+import time
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import parse_http_date_safe, quote_etag, urlencode
+
+from .db_router import use_primary
+
+
+CONTENT_VERSION_KEY = 'content:version'
+
+
+def get_content_version():
+    version = cache.get(CONTENT_VERSION_KEY)
+    if version is None:
+        version = time.time_ns()
+        cache.add(CONTENT_VERSION_KEY, version, timeout=None)
+        version = cache.get(CONTENT_VERSION_KEY, version)
+    return version
+
+
+def bump_content_version():
+    cache.set(CONTENT_VERSION_KEY, time.time_ns(), timeout=None)
+
+
+async def aget_content_version():
+    version = await cache.aget(CONTENT_VERSION_KEY)
+    if version is None:
+        version = time.time_ns()
+        await cache.aadd(CONTENT_VERSION_KEY, version, timeout=None)
+        version = await cache.aget(CONTENT_VERSION_KEY, version)
+    return version
+
+
+def _view_cache_key(request, prefix, version, query_params):
+    # Sitemaps e feeds trazem URLs absolutas: o host também faz parte da chave
+    params = urlencode(sorted((name, request.GET[name]) for name in query_params if name in request.GET))
+    location = f'{request.scheme}://{request.get_host()}{request.path}?{params}'
+    return f'view:{prefix}:{version}:{hashlib.md5(location.encode()).hexdigest()}'
+
+
+def _render_entry(view, request, args, kwargs):
+    """Executa a view e devolve (entrada para o cache, None) ou (None, resposta a repassar)."""
+    # Guardada sob a versão atual: lê do principal, não de uma réplica atrasada
+    with use_primary():
+        response = view(request, *args, **kwargs)
+        if hasattr(response, 'render'):
+            # TemplateResponse (views de sitemap)
+            response.render()
+    if response.status_code != 200 or response.streaming:
+        return None, response
+    return {
+        'content': response.content,
+        'content_type': response['Content-Type'],
+        'etag': quote_etag(hashlib.md5(response.content).hexdigest()),
+        'last_modified': response.headers.get('Last-Modified'),
+    }, None
+
+
+def _cached_response(request, entry):
+    last_modified = parse_http_date_safe(entry['last_modified']) if entry['last_modified'] else None
+    response = get_conditional_response(
+        request, etag=entry['etag'], last_modified=last_modified,
+    ) or HttpResponse(entry['content'], content_type=entry['content_type'])
+    response['ETag'] = entry['etag']
+    if entry['last_modified']:
+        response['Last-Modified'] = entry['last_modified']
+    patch_cache_control(response, public=True, max_age=0, must_revalidate=True)
+    return response
+
+
+def content_cached_view(prefix, timeout=60 * 60 * 24, query_params=()):
+    """Guarda a resposta de uma view pública até o conteúdo mudar.
+
+    A chave inclui o carimbo de versão, o host, o caminho e só os parâmetros
+    de ``query_params`` (ex.: ``p`` do sitemap): outras query strings caem na
+    mesma entrada em vez de encher o cache. Na renovação, a própria view calcula o Last-Modified (o
+    ``updated_at`` mais recente); os acessos seguintes não tocam o banco e
+    respondem 304 a quem já tem a mesma versão.
+
+    No modo ASGI o resultado é uma view assíncrona: os acessos com cache não
+    ocupam thread, e só a renovação roda a view (síncrona) via ``sync_to_async``.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view(request, *args, **kwargs)
+
+            cache_key = _view_cache_key(request, prefix, get_content_version(), query_params)
+            entry = cache.get(cache_key)
+            if entry is None:
+                entry, response = _render_entry(view, request, args, kwargs)
+                if entry is None:
+                    return response
+                cache.set(cache_key, entry, timeout)
+            return _cached_response(request, entry)
+
+        @wraps(view)
+        async def async_wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return await sync_to_async(view)(request, *args, **kwargs)
+
+            cache_key = _view_cache_key(request, prefix, await aget_content_version(), query_params)
+            entry = await cache.aget(cache_key)
+            if entry is None:
+                entry, response = await sync_to_async(_render_entry)(view, request, args, kwargs)
+                if entry is None:
+                    return response
+                await cache.aset(cache_key, entry, timeout)
+            return _cached_response(request, entry)
+
+        return async_wrapper if settings.ASGI_MODE else wrapper
+
+    return decorator
@@ -0,0 +1,6 @@
+from django.conf import settings
+
+
+def static_pipeline(request):
+    """Indica aos templates se o Tailwind pré-compilado está disponível."""
+    return {'tailwind_prebuilt': settings.TAILWIND_PREBUILT}
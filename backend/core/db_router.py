@@ -0,0 +1,138 @@
+"""Leituras públicas nas réplicas, escritas e área administrativa no principal.
+
+Com réplicas configuradas (``DATABASE_REPLICAS``), ``ReplicaRoutingMiddleware``
+marca as requisições que podem ler de uma réplica: GET/HEAD/OPTIONS fora dos
+caminhos de ``DATABASE_PRIMARY_PATHS`` (/admin-area/, /django-admin/, /messages/,
+login).
+Todo o resto — escritas, formulários, comandos de gerenciamento, tarefas
+periódicas, shell — usa o banco principal.
+
+Ler o que acabou de escrever: a réplica pode estar alguns segundos atrasada,
+então depois de um POST (ou outro método que altera dados) o visitante recebe
+o cookie ``DATABASE_STICKY_COOKIE`` e, enquanto ele valer
+(``DATABASE_STICKY_SECONDS``), todas as suas leituras vão ao principal. Dentro
+de uma transação no principal as leituras também ficam nele.
+
+``use_primary()`` força o principal num trecho: é usado ao reconstruir os
+caches com o carimbo de versão do conteúdo, que logo após uma alteração
+guardariam dados velhos da réplica sob a versão nova. Views que gravam mesmo
+em GET usam ``primary_view``.
+"""
+import contextvars
+import random
+from contextlib import contextmanager
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_replica_reads = contextvars.ContextVar('replica_reads', default=False)
+
+
+@contextmanager
+def use_primary():
+    """Lê do banco principal dentro do bloco, mesmo numa requisição liberada para a réplica."""
+    token = _replica_reads.set(False)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def _stick_to_primary(response):
+    # As próximas leituras do visitante vão ao principal até a réplica alcançá-lo
+    if settings.DATABASE_REPLICAS and settings.DATABASE_STICKY_SECONDS:
+        response.set_cookie(
+            settings.DATABASE_STICKY_COOKIE, '1',
+            max_age=settings.DATABASE_STICKY_SECONDS, httponly=True, samesite='Lax',
+        )
+    return response
+
+
+def primary_view(view):
+    """Para views que gravam em GET: lê do principal e fixa o visitante nele, como um POST."""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        with use_primary():
+            response = view(request, *args, **kwargs)
+        return _stick_to_primary(response)
+
+    return wrapper
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if not settings.DATABASE_REPLICAS or not _replica_reads.get():
+            return DEFAULT_DB_ALIAS
+        # Objetos relacionados são lidos do mesmo banco do objeto de origem
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db:
+            return instance._state.db
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return random.choice(settings.DATABASE_REPLICAS)
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Principal e réplicas têm os mesmos dados
+        aliases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # O esquema chega às réplicas pela replicação (ou por sync_replicas)
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    """Deve vir antes de ``SessionMiddleware`` e ``AuthenticationMiddleware`` em ``MIDDLEWARE``."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.DATABASE_REPLICAS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = _replica_reads.set(self._replica_reads(request))
+        try:
+            response = self.get_response(request)
+        finally:
+            _replica_reads.reset(token)
+        return self._stick(request, response)
+
+    async def __acall__(self, request):
+        # As consultas feitas via sync_to_async herdam o ContextVar
+        token = _replica_reads.set(self._replica_reads(request))
+        try:
+            response = await self.get_response(request)
+        finally:
+            _replica_reads.reset(token)
+        return self._stick(request, response)
+
+    def _replica_reads(self, request):
+        return (
+            request.method in SAFE_METHODS
+            and settings.DATABASE_STICKY_COOKIE not in request.COOKIES
+            and not request.path.startswith(settings.DATABASE_PRIMARY_PATHS)
+        )
+
+    def _stick(self, request, response):
+        if request.method not in SAFE_METHODS:
+            _stick_to_primary(response)
+        return response
@@ -0,0 +1,136 @@
+"""Contagens dos filtros (facetas) das listagens públicas.
+
+Cada faceta conta os itens que sobram ao aplicar os *outros* filtros ativos
+(o próprio filtro é ignorado, para que as demais opções continuem visíveis).
+Todas as facetas de uma listagem saem de uma única consulta — um UNION ALL
+de GROUP BYs — e o resultado fica em cache por estado de filtro até o
+conteúdo mudar (core.content_cache).
+"""
+import hashlib
+
+from django.core.cache import cache
+from django.db.models import CharField, Count, F, Value
+from django.db.models.functions import Cast
+
+from .content_cache import get_content_version
+from .db_router import use_primary
+from .models import Event
+
+
+FACET_CACHE_TIMEOUT = 60 * 10
+
+
+def _toggle(params, param, value):
+    """Query string com ``param`` trocado (ou removido), voltando à página 1."""
+    query = params.copy()
+    query.pop('page', None)
+    query.pop(param, None)
+    if value is not None:
+        query[param] = value
+    return '?' + query.urlencode()
+
+
+class Facet:
+    """Um filtro da listagem: parâmetro da URL e os campos usados para filtrar e rotular."""
+
+    def __init__(self, param, title, lookup, label=None, choices=None):
+        self.param = param
+        self.title = title
+        self.lookup = lookup
+        self.label = label or lookup
+        self.choices = dict(choices or ())
+
+
+class FacetSet:
+    def __init__(self, name, facets):
+        self.name = name
+        self.facets = facets
+
+    def active(self, params):
+        """Valores selecionados na query string, ignorando vazios e o antigo "Todos"."""
+        selected = {}
+        for facet in self.facets:
+            value = params.get(facet.param)
+            if value and value != 'Todos':
+                selected[facet.param] = value
+        return selected
+
+    def filter(self, queryset, selected, skip=None):
+        for facet in self.facets:
+            if facet.param in selected and facet.param != skip:
+                queryset = queryset.filter(**{facet.lookup: selected[facet.param]})
+        return queryset
+
+    def _counts(self, queryset, selected):
+        parts = []
+        for facet in self.facets:
+            parts.append(
+                self.filter(queryset, selected, skip=facet.param)
+                .order_by()
+                .annotate(
+                    facet=Value(facet.param, output_field=CharField()),
+                    value=Cast(F(facet.lookup), CharField()),
+                    text=Cast(F(facet.label), CharField()),
+                )
+                .values('facet', 'value', 'text')
+                .annotate(n=Count('pk', distinct=True))
+            )
+        rows = parts[0].union(*parts[1:], all=True) if len(parts) > 1 else parts[0]
+        return [(row['facet'], row['value'], row['text'], row['n']) for row in rows]
+
+    def counts(self, queryset, params, cache_extra=''):
+        """Lista de facetas prontas para o template.
+
+        ``queryset`` já deve ter os filtros que não são facetas (ex.: busca);
+        ``cache_extra`` identifica esses filtros na chave do cache.
+        ``params`` é o ``request.GET``, usado para montar os links das opções.
+        """
+        selected = self.active(params)
+        state = repr((sorted(selected.items()), cache_extra)).encode()
+        cache_key = 'facets:%s:%s:%s' % (
+            self.name, get_content_version(), hashlib.md5(state).hexdigest(),
+        )
+        rows = cache.get(cache_key)
+        if rows is None:
+            with use_primary():
+                rows = self._counts(queryset, selected)
+            cache.set(cache_key, rows, FACET_CACHE_TIMEOUT)
+
+        groups = []
+        for facet in self.facets:
+            options = []
+            for param, value, text, count in rows:
+                if param != facet.param or value is None:
+                    continue
+                active = selected.get(facet.param) == value
+                options.append({
+                    'value': value,
+                    'label': str(facet.choices.get(value, text)),
+                    'count': count,
+                    'active': active,
+                    'url': _toggle(params, facet.param, None if active else value),
+                })
+            options.sort(key=lambda option: (-option['count'], option['label'].lower()))
+            groups.append({
+                'param': facet.param,
+                'title': facet.title,
+                'options': options,
+                'clear_url': _toggle(params, facet.param, None),
+                'selected': facet.param in selected,
+            })
+        return groups
+
+
+# ========================
+# Facetas de cada listagem
+# ========================
+CATEGORY_FACET = Facet('category', 'Categorias', 'category__slug', 'category__name')
+TAG_FACET = Facet('tag', 'Tags', 'tags__slug', 'tags__name')
+
+POST_FACETS = FacetSet('posts', [CATEGORY_FACET, TAG_FACET])
+EVENT_FACETS = FacetSet('events', [
+    CATEGORY_FACET,
+    Facet('type', 'Tipo', 'event_type', choices=Event.TYPE_CHOICES),
+    TAG_FACET,
+])
+PROJECT_FACETS = FacetSet('projects', [CATEGORY_FACET, TAG_FACET])
@@ -0,0 +1,81 @@
+"""Feeds RSS/Atom de posts e eventos, montados a partir de ``values()``."""
+
+from django.contrib.syndication.views import Feed
+from django.urls import reverse, reverse_lazy
+from django.utils.feedgenerator import Atom1Feed
+
+from .models import BlogPost, Event
+
+
+FEED_SIZE = 20
+
+
+class LatestPostsFeed(Feed):
+    title = 'NEABI - Blog'
+    link = reverse_lazy('blog')
+    description = 'Artigos e reflexões sobre diversidade étnico-racial publicados pelo NEABI.'
+
+    def items(self):
+        return (
+            BlogPost.objects.filter(status='published')
+            .order_by('-published_date')
+            .values('title', 'slug', 'excerpt', 'published_date', 'updated_at',
+                    'author__first_name', 'author__last_name', 'author__username')[:FEED_SIZE]
+        )
+
+    def item_title(self, item):
+        return item['title']
+
+    def item_description(self, item):
+        return item['excerpt']
+
+    def item_link(self, item):
+        return reverse('blog_detail', kwargs={'slug': item['slug']})
+
+    def item_author_name(self, item):
+        full_name = f"{item['author__first_name']} {item['author__last_name']}".strip()
+        return full_name or item['author__username']
+
+    def item_pubdate(self, item):
+        return item['published_date']
+
+    def item_updateddate(self, item):
+        return item['updated_at']
+
+
+class LatestPostsAtomFeed(LatestPostsFeed):
+    feed_type = Atom1Feed
+    subtitle = LatestPostsFeed.description
+
+
+class EventsFeed(Feed):
+    title = 'NEABI - Eventos'
+    link = reverse_lazy('eventos')
+    description = 'Agenda de eventos do NEABI.'
+
+    def items(self):
+        return (
+            Event.objects.exclude(status='cancelled')
+            .order_by('-date', '-start_time')
+            .values('title', 'slug', 'description', 'date', 'start_time', 'location', 'created_at', 'updated_at')[:FEED_SIZE]
+        )
+
+    def item_title(self, item):
+        return f"{item['title']} ({item['date']:%d/%m/%Y})"
+
+    def item_description(self, item):
+        return f"{item['date']:%d/%m/%Y} às {item['start_time']:%H:%M} — {item['location']}\n\n{item['description']}"
+
+    def item_link(self, item):
+        return reverse('event_detail', kwargs={'slug': item['slug']})
+
+    def item_pubdate(self, item):
+        return item['created_at']
+
+    def item_updateddate(self, item):
+        return item['updated_at']
+
+
+class EventsAtomFeed(EventsFeed):
+    feed_type = Atom1Feed
+    subtitle = EventsFeed.description
@@ -253,7 +253,46 @@ class GalleryImageForm(forms.ModelForm):
             'event': forms.Select(attrs={'class': 'form-select'}),
             'image': forms.ClearableFileInput(attrs={'class': 'form-input'}),
             'published': forms.CheckboxInput(attrs={'class': 'form-checkbox'}),
-        }    
+        }
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.exact_duplicate = None
+        self.near_duplicates = []
+
+    def clean(self):
+        cleaned_data = super().clean()
+        upload = self.files.get('image')
+        if not upload or self.errors:
+            return cleaned_data
+
+        # Impressões digitais do arquivo enviado, comparadas com a tabela indexada
+        self.instance.set_fingerprint(upload)
+        others = GalleryImage.objects.exclude(pk=self.instance.pk)
+        exact = others.filter(content_hash=self.instance.content_hash).order_by('pk').first()
+        if exact is not None:
+            if exact.event_id == getattr(cleaned_data.get('event'), 'pk', None):
+                raise forms.ValidationError(
+                    f'Esta imagem já está na galeria deste evento ("{exact.title}").'
+                )
+            # Mesmo arquivo em outro evento: reaproveita o arquivo já armazenado
+            self.exact_duplicate = exact
+        else:
+            self.near_duplicates = GalleryImage.find_similar(
+                self.instance.phash, exclude_pk=self.instance.pk
+            )
+        return cleaned_data
+
+    def save(self, commit=True):
+        instance = super().save(commit=False)
+        if self.exact_duplicate is not None:
+            instance.image = self.exact_duplicate.image.name
+        elif self.near_duplicates:
+            instance.near_duplicate_of = self.near_duplicates[0]
+        if commit:
+            instance.save()
+        return instance
+
 class UserPermissionForm(forms.ModelForm):
     class Meta:
         model = User
@@ -0,0 +1,81 @@
+"""Impressões digitais de imagens para detectar uploads repetidos.
+
+* ``content_hash``: SHA-256 dos bytes — cópias idênticas do arquivo.
+* ``perceptual_hash``: pHash de 64 bits (DCT da imagem reduzida a 32x32 em
+  tons de cinza) — a mesma foto reexportada, redimensionada ou recomprimida
+  fica a poucos bits de distância.
+
+Para procurar hashes próximos pelo índice do banco, o pHash é dividido em
+quatro faixas de 16 bits (``hash_bands``): duas imagens a até 3 bits de
+distância têm, obrigatoriamente, ao menos uma faixa idêntica.
+"""
+import hashlib
+import math
+
+
+HASH_SIZE = 8
+SAMPLE_SIZE = 32
+BAND_COUNT = 4
+BAND_BITS = 64 // BAND_COUNT
+
+_COSINES = [
+    [math.cos(math.pi * (2 * x + 1) * u / (2 * SAMPLE_SIZE)) for x in range(SAMPLE_SIZE)]
+    for u in range(HASH_SIZE)
+]
+
+
+def content_hash(file):
+    digest = hashlib.sha256()
+    file.seek(0)
+    for chunk in iter(lambda: file.read(64 * 1024), b''):
+        digest.update(chunk)
+    file.seek(0)
+    return digest.hexdigest()
+
+
+def perceptual_hash(file):
+    """pHash sem numpy: só os 8x8 coeficientes de baixa frequência da DCT são calculados."""
+    # Importado aqui: o Pillow pesa no import de core.models (manage.py, workers)
+    from PIL import Image, ImageOps
+
+    file.seek(0)
+    with Image.open(file) as image:
+        image = ImageOps.exif_transpose(image).convert('L')
+        image = image.resize((SAMPLE_SIZE, SAMPLE_SIZE), Image.Resampling.LANCZOS)
+        pixels = list(image.getdata())
+    file.seek(0)
+
+    rows = [pixels[y * SAMPLE_SIZE:(y + 1) * SAMPLE_SIZE] for y in range(SAMPLE_SIZE)]
+    # DCT separável: primeiro nas linhas, depois nas colunas
+    row_dct = [[sum(c * p for c, p in zip(_COSINES[u], row)) for u in range(HASH_SIZE)] for row in rows]
+    coefficients = [
+        sum(_COSINES[v][y] * row_dct[y][u] for y in range(SAMPLE_SIZE))
+        for v in range(HASH_SIZE)
+        for u in range(HASH_SIZE)
+    ]
+
+    # O termo DC (brilho médio) fica de fora da mediana
+    median = sorted(coefficients[1:])[len(coefficients[1:]) // 2]
+    value = 0
+    for coefficient in coefficients:
+        value = (value << 1) | (coefficient > median)
+    return value
+
+
+def to_signed(value):
+    """Converte o hash de 64 bits sem sinal para caber em um BigIntegerField."""
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+
+def to_unsigned(value):
+    return value + (1 << 64) if value < 0 else value
+
+
+def hash_bands(value):
+    value = to_unsigned(value)
+    mask = (1 << BAND_BITS) - 1
+    return [(value >> (BAND_BITS * index)) & mask for index in range(BAND_COUNT)]
+
+
+def hamming(a, b):
+    return bin(to_unsigned(a) ^ to_unsigned(b)).count('1')
@@ -0,0 +1,45 @@
+"""Metadados extraídos uma única vez, no upload, para as imagens do site.
+
+* ``width``/``height``: dimensões já com a orientação EXIF aplicada — as
+  mesmas que o navegador exibe —, para os templates emitirem ``width`` e
+  ``height`` no ``<img>`` e a página não "pular" enquanto as fotos carregam.
+* ``placeholder``: miniatura de poucos pixels (LQIP) em data URI, usada como
+  fundo borrado do ``<img>`` até a imagem real chegar.
+
+O módulo só depende do Pillow (nada de Django), para poder rodar nos
+processos filhos do comando ``image_metadata``.
+"""
+import base64
+from io import BytesIO
+
+
+PLACEHOLDER_SIZE = 16
+PLACEHOLDER_QUALITY = 40
+# Orientações EXIF que giram a foto em 90°: largura e altura trocam de lugar
+ROTATED_ORIENTATIONS = {5, 6, 7, 8}
+
+
+def extract(file):
+    """Dimensões exibidas e placeholder de um arquivo de imagem (ou objeto com ``read``)."""
+    # Importado aqui, como em core.imagehash, para não pesar no import de core.models
+    from PIL import ExifTags, Image, ImageOps
+
+    file.seek(0)
+    with Image.open(file) as image:
+        width, height = image.size
+        if image.getexif().get(ExifTags.Base.Orientation, 1) in ROTATED_ORIENTATIONS:
+            width, height = height, width
+        # JPEG: decodifica já reduzido (1/2 a 1/8), bem mais rápido que abrir a foto inteira
+        image.draft('RGB', (PLACEHOLDER_SIZE * 8, PLACEHOLDER_SIZE * 8))
+        thumb = ImageOps.exif_transpose(image).convert('RGB')
+        thumb.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE), Image.Resampling.BOX)
+    file.seek(0)
+
+    buffer = BytesIO()
+    thumb.save(buffer, 'WEBP', quality=PLACEHOLDER_QUALITY)
+    placeholder = 'data:image/webp;base64,' + base64.b64encode(buffer.getvalue()).decode('ascii')
+    return {'width': width, 'height': height, 'placeholder': placeholder}
+
+
+def extract_bytes(data):
+    return extract(BytesIO(data))
@@ -0,0 +1,268 @@
+"""Curtidas de posts com deduplicação e gravação em lote.
+
+O total exibido é ``BlogPost.likes`` (o valor do banco, que o admin pode
+editar e o ``setup_neabi`` semeia) mais o saldo ainda não gravado. Quem
+curtiu fica em ``PostLikeSet``: um array ordenado de impressões digitais de
+64 bits (uma por usuário ou sessão).
+
+Curtir/descurtir não toca o banco nem regrava o array: guarda no cache o
+estado daquela impressão digital, acrescenta uma operação numerada ao diário
+do post e soma ±1 ao total acumulado do diário. ``flush_pending_likes``
+aplica o diário ao array e a ``likes`` com um UPDATE por post — no máximo uma
+vez a cada ``LIKES_FLUSH_INTERVAL`` segundos ou pelo comando ``flush_likes``.
+
+O que já foi aplicado fica só no banco: o número da última operação em
+``PostLikeSet.applied_seq`` e a soma das operações em ``BlogPost.likes_applied``
+(no mesmo UPDATE de ``likes``). O saldo pendente é o total do diário menos
+essa soma, então uma gravação interrompida em qualquer ponto nem se repete
+nem deixa o total inflado.
+
+Tudo fica no cache ``likes`` (settings.CACHES), separado do cache de páginas
+para que o descarte de páginas nunca apague curtidas pendentes. Em produção
+com vários workers ele precisa ser compartilhado (Redis).
+"""
+import hashlib
+import secrets
+import time
+from array import array
+from bisect import bisect_left
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+
+from .models import BlogPost, PostLikeSet
+
+
+LOCK_TIMEOUT = 5
+# O estado de cada pessoa no cache só precisa durar até a próxima gravação
+STATE_TIMEOUT = 60 * 60 * 24
+DIRTY_KEY = 'dirty'
+FLUSH_KEY = 'flush'
+
+
+def _cache():
+    return caches['likes']
+
+
+def _members_key(post_id):
+    # Cópia de leitura do array gravado no banco
+    return f'members:{post_id}'
+
+
+def _state_key(post_id, fingerprint):
+    # 1/0: curtiu ou não desde a última gravação
+    return f'state:{post_id}:{fingerprint}'
+
+
+def _seq_key(post_id):
+    return f'seq:{post_id}'
+
+
+def _op_key(post_id, seq):
+    return f'op:{post_id}:{seq}'
+
+
+def _total_key(post_id):
+    # Soma de todas as operações do diário; nunca diminui na gravação
+    return f'total:{post_id}'
+
+
+def _queued_key(post_id):
+    return f'queued:{post_id}'
+
+
+@contextmanager
+def _lock(name):
+    """Trava simples baseada em ``cache.add`` (atômico no Redis e no LocMem).
+
+    Expira sozinha depois de ``LOCK_TIMEOUT`` segundos (se um worker morreu
+    segurando-a); quem a libera só a apaga se ela ainda for sua.
+    """
+    cache = _cache()
+    key = f'lock:{name}'
+    token = secrets.token_hex(8)
+    deadline = time.monotonic() + LOCK_TIMEOUT
+    acquired = cache.add(key, token, timeout=LOCK_TIMEOUT)
+    while not acquired and time.monotonic() < deadline:
+        time.sleep(0.005)
+        acquired = cache.add(key, token, timeout=LOCK_TIMEOUT)
+    try:
+        yield
+    finally:
+        if acquired and cache.get(key) == token:
+            cache.delete(key)
+
+
+def _add(key, delta):
+    """``incr`` que cria a chave zerada se ela não existir."""
+    cache = _cache()
+    cache.add(key, 0, timeout=None)
+    return cache.incr(key, delta)
+
+
+def liker_fingerprint(request):
+    """Identificador de 64 bits do usuário logado ou da sessão anônima."""
+    if request.user.is_authenticated:
+        identity = f'user:{request.user.pk}'
+    else:
+        liker_id = request.session.get('liker_id')
+        if not liker_id:
+            liker_id = request.session['liker_id'] = secrets.token_hex(8)
+        identity = f'session:{liker_id}'
+    digest = hashlib.blake2b(identity.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'big')
+
+
+def _load_members(post_id):
+    cache = _cache()
+    members = cache.get(_members_key(post_id))
+    if members is None:
+        members = array('Q')
+        raw = PostLikeSet.objects.filter(post_id=post_id).values_list('members', flat=True).first()
+        if raw:
+            members.frombytes(bytes(raw))
+        cache.add(_members_key(post_id), members, timeout=None)
+    return members
+
+
+def _contains(members, fingerprint):
+    index = bisect_left(members, fingerprint)
+    return index < len(members) and members[index] == fingerprint
+
+
+def like_total(post_id, likes, likes_applied):
+    """Total de curtidas a partir de ``likes`` e ``likes_applied`` lidos juntos do banco."""
+    total = _cache().get(_total_key(post_id))
+    pending = 0 if total is None else total - likes_applied
+    return max(likes + pending, 0)
+
+
+def get_like_count(post):
+    """Total de curtidas, incluindo as que ainda não foram gravadas no banco."""
+    return like_total(post.pk, post.likes, post.likes_applied)
+
+
+def has_liked(post, fingerprint):
+    state = _cache().get(_state_key(post.pk, fingerprint))
+    if state is not None:
+        return bool(state)
+    return _contains(_load_members(post.pk), fingerprint)
+
+
+def toggle_like(post, fingerprint):
+    """Curte ou descurte o post. Retorna ``(curtiu, total)``."""
+    cache = _cache()
+    # Só serializa cliques repetidos da mesma pessoa; curtidas de outras não esperam
+    with _lock(f'{post.pk}:{fingerprint}'):
+        liked = not has_liked(post, fingerprint)
+        delta = 1 if liked else -1
+        cache.set(_state_key(post.pk, fingerprint), int(liked), timeout=STATE_TIMEOUT)
+        _start_journal(post.pk)
+        seq = cache.incr(_seq_key(post.pk))
+        cache.set(_op_key(post.pk, seq), (fingerprint, delta), timeout=None)
+        total = _add(_total_key(post.pk), delta)
+
+    _mark_dirty(post.pk)
+
+    # Só uma requisição por intervalo consegue o "add" e faz a gravação em lote
+    if cache.add(FLUSH_KEY, 1, timeout=settings.LIKES_FLUSH_INTERVAL):
+        flush_pending_likes()
+
+    return liked, max(post.likes + total - post.likes_applied, 0)
+
+
+def _start_journal(post_id):
+    """Diário novo (ou cache reiniciado): continua do que já foi gravado no banco."""
+    cache = _cache()
+    if cache.get(_seq_key(post_id)) is not None and cache.get(_total_key(post_id)) is not None:
+        return
+    row = PostLikeSet.objects.filter(post_id=post_id).values_list('applied_seq', 'post__likes_applied').first()
+    applied_seq, likes_applied = row or (0, 0)
+    cache.add(_seq_key(post_id), applied_seq, timeout=None)
+    # Operações ainda não aplicadas que sobreviveram no cache continuam pendentes
+    last = cache.get(_seq_key(post_id))
+    ops = cache.get_many([_op_key(post_id, seq) for seq in range(applied_seq + 1, last + 1)])
+    cache.add(_total_key(post_id), likes_applied + sum(delta for _fingerprint, delta in ops.values()), timeout=None)
+
+
+def _mark_dirty(post_id):
+    # Cada post entra no conjunto de pendentes uma vez por gravação
+    cache = _cache()
+    if cache.add(_queued_key(post_id), 1, timeout=None):
+        with _lock(DIRTY_KEY):
+            dirty = cache.get(DIRTY_KEY) or set()
+            dirty.add(post_id)
+            cache.set(DIRTY_KEY, dirty, timeout=None)
+
+
+def flush_pending_likes():
+    """Grava no banco as curtidas pendentes: um UPDATE por post alterado."""
+    cache = _cache()
+    with _lock(DIRTY_KEY):
+        dirty = cache.get(DIRTY_KEY) or set()
+        cache.delete(DIRTY_KEY)
+
+    flushed = 0
+    for post_id in sorted(dirty):
+        # Curtidas que chegarem daqui em diante voltam a marcar o post
+        cache.delete(_queued_key(post_id))
+        with _lock(f'flush:{post_id}'):
+            flushed += _flush_post(post_id)
+    return flushed
+
+
+def _flush_post(post_id):
+    cache = _cache()
+    last = cache.get(_seq_key(post_id)) or 0
+
+    with transaction.atomic():
+        if not BlogPost.objects.filter(pk=post_id).exists():
+            # Post excluído: descarta o diário
+            cache.delete_many([_seq_key(post_id), _total_key(post_id), _members_key(post_id)])
+            return 0
+        like_set, _created = PostLikeSet.objects.select_for_update().get_or_create(post_id=post_id)
+        first = like_set.applied_seq + 1
+        op_keys = [_op_key(post_id, seq) for seq in range(first, last + 1)]
+        found = cache.get_many(op_keys)
+        # Aplica só as operações contíguas (a última pode ainda estar sendo gravada)
+        ops = []
+        for key in op_keys:
+            if key not in found:
+                break
+            ops.append(found[key])
+        if not ops:
+            if op_keys:
+                _mark_dirty(post_id)
+            return 0
+
+        members = array('Q')
+        members.frombytes(bytes(like_set.members))
+        before = len(members)
+        for fingerprint, delta in ops:
+            index = bisect_left(members, fingerprint)
+            present = index < len(members) and members[index] == fingerprint
+            if delta > 0 and not present:
+                members.insert(index, fingerprint)
+            elif delta < 0 and present:
+                del members[index]
+
+        # Soma só o que o array mudou: uma curtida repetida (estado perdido do cache) não conta duas vezes.
+        # likes_applied recebe a soma das operações, que já não entram no saldo pendente
+        BlogPost.objects.filter(pk=post_id).update(
+            likes=Greatest(F('likes') + (len(members) - before), 0),
+            likes_applied=F('likes_applied') + sum(delta for _fingerprint, delta in ops),
+        )
+        like_set.members = members.tobytes()
+        like_set.applied_seq = first + len(ops) - 1
+        like_set.save(update_fields=['members', 'applied_seq', 'updated_at'])
+
+    # Só limpeza: se o worker morrer aqui, o banco já tem tudo o que importa
+    cache.set(_members_key(post_id), members, timeout=None)
+    cache.delete_many(op_keys[:len(ops)])
+    if len(ops) < len(op_keys):
+        _mark_dirty(post_id)
+    return 1
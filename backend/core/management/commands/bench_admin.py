@@ -0,0 +1,134 @@
+import statistics
+import time
+from datetime import timedelta
+
+from django.contrib import admin
+from django.core.paginator import Paginator
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models import BlogPost, Category, ContactMessage, Event, GalleryImage, Project, User
+
+
+# Configuração padrão do ModelAdmin, para comparar com a ajustada em core.admin
+DEFAULT_ADMIN_OPTIONS = {
+    'show_full_result_count': True,
+    'paginator': Paginator,
+    'list_select_related': False,
+    'list_per_page': 100,
+}
+# date_hierarchy que esses admins tinham antes do ajuste
+DEFAULT_DATE_HIERARCHY = {
+    BlogPost: 'published_date',
+    Event: 'date',
+    Project: 'created_at',
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Mede o tempo e o número de consultas das listagens do /django-admin/ '
+        '(configuração padrão x ajustada), com linhas de teste. Não altera o banco.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=20000, help='Linhas de teste por tabela')
+        parser.add_argument('--repeat', type=int, default=5, help='Requisições por cenário')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            user = self._seed(options['rows'])
+            # Estatísticas usadas pela contagem estimada (core.admin.estimated_count)
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+
+            client = Client()
+            client.force_login(user)
+            models = [BlogPost, GalleryImage, ContactMessage, Event, Project]
+            self.stdout.write(f'{options["rows"]} linhas de teste por tabela, mediana de {options["repeat"]} requisições')
+            self.stdout.write(f'{"listagem":<28}{"padrão ms":>11}{"consultas":>11}{"ajustado ms":>13}{"consultas":>11}')
+            for model in models:
+                model_admin = admin.site._registry[model]
+                url = reverse(f'admin:core_{model._meta.model_name}_changelist')
+                default_options = dict(DEFAULT_ADMIN_OPTIONS, date_hierarchy=DEFAULT_DATE_HIERARCHY.get(model))
+                default = self._measure(client, url, model_admin, options['repeat'], default_options)
+                tuned = self._measure(client, url, model_admin, options['repeat'], {})
+                self.stdout.write(
+                    f'{model._meta.verbose_name_plural:<28}'
+                    f'{default[0]:>11.1f}{default[1]:>11}{tuned[0]:>13.1f}{tuned[1]:>11}'
+                )
+            # Descarta as linhas de teste
+            transaction.set_rollback(True)
+
+    def _measure(self, client, url, model_admin, repeat, overrides):
+        saved = {name: getattr(model_admin, name) for name in overrides}
+        for name, value in overrides.items():
+            setattr(model_admin, name, value)
+        try:
+            timings = []
+            for _ in range(repeat):
+                with CaptureQueriesContext(connection) as queries:
+                    start = time.perf_counter()
+                    response = client.get(url)
+                    timings.append((time.perf_counter() - start) * 1000)
+                if response.status_code != 200:
+                    raise RuntimeError(f'{url}: HTTP {response.status_code}')
+        finally:
+            for name, value in saved.items():
+                setattr(model_admin, name, value)
+        return statistics.median(timings), len(queries.captured_queries)
+
+    def _seed(self, rows):
+        user = User.objects.create_superuser('bench_admin', 'bench.admin@neabi.edu.br', 'bench-senha-123')
+        authors = User.objects.bulk_create(
+            User(username=f'bench_autor_{i}', email=f'bench.autor.{i}@neabi.edu.br') for i in range(50)
+        )
+        categories = Category.objects.bulk_create(
+            Category(name=f'Bench {i}', slug=f'bench-{i}') for i in range(20)
+        )
+        events = Event.objects.bulk_create(
+            Event(
+                title=f'Evento bench {i}', slug=f'evento-bench-{i}', description='-',
+                date=timezone.localdate() - timedelta(days=i % 3650), start_time='19:00', end_time='21:00',
+                location='Campus', event_type='presencial', capacity=50, category=categories[i % 20], organizer='NEABI',
+            )
+            for i in range(rows)
+        )
+        now = timezone.now()
+        BlogPost.objects.bulk_create(
+            (
+                BlogPost(
+                    title=f'Post bench {i}', slug=f'post-bench-{i}', excerpt='-', content='-',
+                    author=authors[i % 50], category=categories[i % 20],
+                    published_date=now - timedelta(minutes=i),
+                )
+                for i in range(rows)
+            ),
+            batch_size=2000,
+        )
+        GalleryImage.objects.bulk_create(
+            (
+                GalleryImage(title=f'Foto bench {i}', image='gallery/bench.jpg', event=events[i % len(events)])
+                for i in range(rows)
+            ),
+            batch_size=2000,
+        )
+        ContactMessage.objects.bulk_create(
+            (
+                ContactMessage(name=f'Pessoa {i}', email=f'p{i}@example.com', subject='Bench', message='-')
+                for i in range(rows)
+            ),
+            batch_size=2000,
+        )
+        Project.objects.bulk_create(
+            (
+                Project(title=f'Projeto bench {i}', slug=f'projeto-bench-{i}', description='-', category=categories[i % 20])
+                for i in range(rows)
+            ),
+            batch_size=2000,
+        )
+        return user
@@ -0,0 +1,104 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from wsgiref.util import setup_testing_defaults
+
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = (
+        'Compara WSGI (pool de N workers) e ASGI com clientes lentos simulados, '
+        'no mesmo processo e sem rede.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default='/api/eventos/', help='URL requisitada')
+        parser.add_argument('--clients', type=int, default=50, help='Clientes simultâneos')
+        parser.add_argument('--workers', type=int, default=4, help='Workers WSGI (ex.: gunicorn --workers)')
+        parser.add_argument(
+            '--delay', type=float, default=0.05,
+            help='Segundos que o cliente lento leva para consumir cada bloco da resposta',
+        )
+
+    def handle(self, *args, **options):
+        path, clients = options['path'], options['clients']
+        workers, delay = options['workers'], options['delay']
+
+        wsgi_elapsed, wsgi_status = self._run_wsgi(path, clients, workers, delay)
+        asgi_elapsed, asgi_status = asyncio.run(self._run_asgi(path, clients, delay))
+
+        self.stdout.write(f'{path}: {clients} clientes, atraso de {delay * 1000:.0f} ms por bloco')
+        self.stdout.write(f'{"modo":<22}{"status":>8}{"total s":>10}{"req/s":>10}')
+        for label, elapsed, status in (
+            (f'WSGI ({workers} workers)', wsgi_elapsed, wsgi_status),
+            ('ASGI (event loop)', asgi_elapsed, asgi_status),
+        ):
+            self.stdout.write(f'{label:<22}{status:>8}{elapsed:>10.2f}{clients / elapsed:>10.1f}')
+
+    # ========================
+    # WSGI: cada cliente lento prende um worker enquanto lê a resposta
+    # ========================
+    def _run_wsgi(self, path, clients, workers, delay):
+        handler = WSGIHandler()
+        statuses = []
+
+        def request(_):
+            environ = {'PATH_INFO': path, 'REQUEST_METHOD': 'GET', 'wsgi.input': BytesIO()}
+            setup_testing_defaults(environ)
+
+            def start_response(status, headers, exc_info=None):
+                statuses.append(status.split()[0])
+
+            body = handler(environ, start_response)
+            try:
+                for _chunk in body:
+                    time.sleep(delay)
+            finally:
+                if hasattr(body, 'close'):
+                    body.close()
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(request, range(clients)))
+        return time.perf_counter() - start, ','.join(sorted(set(statuses)))
+
+    # ========================
+    # ASGI: a espera pelo cliente libera o event loop para os demais
+    # ========================
+    async def _run_asgi(self, path, clients, delay):
+        handler = ASGIHandler()
+        statuses = []
+
+        async def request():
+            scope = {
+                'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+                'method': 'GET', 'scheme': 'http', 'path': path, 'raw_path': path.encode(),
+                'query_string': b'', 'root_path': '',
+                'headers': [(b'host', b'127.0.0.1')],
+                'client': ('127.0.0.1', 0), 'server': ('127.0.0.1', 80),
+            }
+            received = False
+
+            async def receive():
+                nonlocal received
+                if received:
+                    # Mantém a conexão "aberta" até o fim da resposta
+                    await asyncio.Event().wait()
+                received = True
+                return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+            async def send(message):
+                if message['type'] == 'http.response.start':
+                    statuses.append(str(message['status']))
+                elif message['type'] == 'http.response.body':
+                    await asyncio.sleep(delay)
+
+            await handler(scope, receive, send)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(request() for _ in range(clients)))
+        return time.perf_counter() - start, ','.join(sorted(set(statuses)))
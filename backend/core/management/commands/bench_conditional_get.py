@@ -0,0 +1,57 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import Client
+
+from core.models import BlogPost, Event, Project
+
+
+class Command(BaseCommand):
+    help = 'Mede bytes e tempo economizados por GET condicional (ETag) nas páginas de detalhe. Não altera o banco.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=50, help='Requisições por cenário')
+
+    def _measure(self, client, url, iterations, **headers):
+        total_bytes = 0
+        start = time.perf_counter()
+        for _ in range(iterations):
+            response = client.get(url, **headers)
+            total_bytes += len(response.content)
+        elapsed = (time.perf_counter() - start) / iterations
+        return response, total_bytes // iterations, elapsed * 1000
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        pages = [
+            ('post', BlogPost.objects.filter(status='published').first()),
+            ('evento', Event.objects.first()),
+            ('projeto', Project.objects.first()),
+        ]
+        client = Client()
+        # As visualizações contadas durante a medição são descartadas no final
+        with transaction.atomic():
+            self._run(client, pages, iterations)
+            transaction.set_rollback(True)
+
+    def _run(self, client, pages, iterations):
+        self.stdout.write(
+            f'{"página":<10}{"200 bytes":>12}{"200 ms":>10}{"304 bytes":>12}{"304 ms":>10}{"economia":>10}'
+        )
+        for label, obj in pages:
+            if obj is None:
+                self.stdout.write(f'{label:<10}{"(sem dados)":>12}')
+                continue
+            url = obj.get_absolute_url()
+            first, full_bytes, full_ms = self._measure(client, url, iterations)
+            etag = first.get('ETag')
+            revalidated, cond_bytes, cond_ms = self._measure(
+                client, url, iterations, HTTP_IF_NONE_MATCH=etag
+            )
+            if revalidated.status_code != 304:
+                self.stderr.write(f'{label}: esperado 304, recebido {revalidated.status_code}')
+            saved = 100 * (1 - cond_ms / full_ms) if full_ms else 0
+            self.stdout.write(
+                f'{label:<10}{full_bytes:>12}{full_ms:>10.2f}{cond_bytes:>12}{cond_ms:>10.2f}{saved:>9.0f}%'
+            )
@@ -0,0 +1,58 @@
+import time
+
+from django.contrib.auth import authenticate, get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+User = get_user_model()
+
+PASSWORD = 'bench-senha-123'
+
+
+def legacy_login(username_or_email, password):
+    """Fluxo antigo do login_view: tenta username e, se falhar, busca por email."""
+    backend = ModelBackend()
+    user = backend.authenticate(None, username=username_or_email, password=password)
+    if user is None:
+        try:
+            user_obj = User.objects.get(email=username_or_email)
+            user = backend.authenticate(None, username=user_obj.username, password=password)
+        except User.DoesNotExist:
+            user = None
+    return user
+
+
+def current_login(username_or_email, password):
+    return authenticate(None, username=username_or_email, password=password)
+
+
+class Command(BaseCommand):
+    help = 'Mede a vazão do login (fluxo antigo x EmailOrUsernameBackend). Não altera o banco.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20, help='Logins por cenário')
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        scenarios = [
+            ('username', 'bench_login_user'),
+            ('email', 'bench.login@neabi.edu.br'),
+            ('desconhecido', 'ninguem@neabi.edu.br'),
+        ]
+
+        with transaction.atomic():
+            User.objects.create_user(
+                username='bench_login_user', email='bench.login@neabi.edu.br', password=PASSWORD
+            )
+            self.stdout.write(f'{"cenário":<14}{"antigo (login/s)":>18}{"novo (login/s)":>18}')
+            for label, login in scenarios:
+                rates = []
+                for strategy in (legacy_login, current_login):
+                    start = time.perf_counter()
+                    for _ in range(iterations):
+                        strategy(login, PASSWORD)
+                    rates.append(iterations / (time.perf_counter() - start))
+                self.stdout.write(f'{label:<14}{rates[0]:>18.2f}{rates[1]:>18.2f}')
+            # Descarta o usuário de teste
+            transaction.set_rollback(True)
@@ -0,0 +1,125 @@
+import os
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import models
+
+
+BATCH_SIZE = 500
+
+
+def file_fields():
+    """(modelo, campo) de todos os FileField/ImageField do projeto."""
+    for model in apps.get_models():
+        if model._meta.proxy or not model._meta.managed:
+            continue
+        for field in model._meta.concrete_fields:
+            if isinstance(field, models.FileField):
+                yield model, field.name
+
+
+class Command(BaseCommand):
+    help = (
+        'Coleta de lixo da mídia (mark-and-sweep): apaga de MEDIA_ROOT os arquivos '
+        'que nenhum registro referencia. Memória limitada: percorre um diretório por vez '
+        'e confere os nomes no banco em lotes.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Só lista o que seria apagado')
+        parser.add_argument(
+            '--min-age', type=float, default=24,
+            help='Ignora arquivos modificados há menos de N horas (uploads ainda sem registro salvo)',
+        )
+
+    def handle(self, *args, **options):
+        root = str(settings.MEDIA_ROOT)
+        fields = list(file_fields())
+        cutoff = time.time() - options['min_age'] * 3600
+        dry_run = options['dry_run']
+
+        self.scanned = self.scanned_bytes = 0
+        self.orphans = self.orphan_bytes = 0
+        largest_dir, largest_count = '', 0
+
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames.sort()
+            if len(filenames) > largest_count:
+                largest_dir, largest_count = dirpath, len(filenames)
+
+            relative_dir = os.path.relpath(dirpath, root)
+            names = []
+            for filename in sorted(filenames):
+                name = filename if relative_dir == '.' else f'{relative_dir}/{filename}'.replace(os.sep, '/')
+                names.append(name)
+                if len(names) >= BATCH_SIZE:
+                    self._sweep(root, names, fields, cutoff, dry_run)
+                    names = []
+            if names:
+                self._sweep(root, names, fields, cutoff, dry_run)
+
+        if not dry_run:
+            self._remove_empty_dirs(root)
+
+        verb = 'seriam apagados' if dry_run else 'apagados'
+        self.stdout.write(
+            f'{self.scanned} arquivos ({self.scanned_bytes / 2**20:.1f} MiB) verificados; '
+            f'maior diretório: {os.path.relpath(largest_dir, root) if largest_dir else "-"} '
+            f'({largest_count} arquivos).'
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'{self.orphans} arquivos órfãos ({self.orphan_bytes / 2**20:.1f} MiB) {verb}.'
+        ))
+
+    def _sweep(self, root, names, fields, cutoff, dry_run):
+        # Marcação: quais destes nomes ainda aparecem em algum campo de arquivo
+        referenced = set()
+        for model, field_name in fields:
+            referenced.update(
+                model._base_manager.filter(**{f'{field_name}__in': names})
+                .values_list(field_name, flat=True)
+            )
+
+        # Varredura
+        for name in names:
+            path = os.path.join(root, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            self.scanned += 1
+            self.scanned_bytes += stat.st_size
+            if name in referenced or stat.st_mtime > cutoff:
+                continue
+            if dry_run:
+                self.stdout.write(f'  {name}')
+            elif not self._remove(path, cutoff):
+                continue
+            self.orphans += 1
+            self.orphan_bytes += stat.st_size
+
+    def _remove(self, path, cutoff):
+        """Apaga o arquivo se ele continuar antigo; False se voltou a ser usado.
+
+        O upload de um blob repetido (ContentAddressedStorage.save) só renova a
+        data de modificação. O arquivo sai do lugar antes da conferência final:
+        depois do rename, um upload novo grava outra cópia em vez de renovar
+        esta, e um que renovou antes aparece aqui com a data nova.
+        """
+        trash = f'{path}.collect-{os.getpid()}'
+        try:
+            os.rename(path, trash)
+        except FileNotFoundError:
+            return False
+        if os.stat(trash).st_mtime > cutoff:
+            os.replace(trash, path)
+            return False
+        os.remove(trash)
+        return True
+
+    def _remove_empty_dirs(self, root):
+        for dirpath, _dirnames, _filenames in os.walk(root, topdown=False):
+            if dirpath != root and not os.listdir(dirpath):
+                os.rmdir(dirpath)
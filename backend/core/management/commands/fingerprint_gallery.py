@@ -0,0 +1,55 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+
+from core.models import GalleryImage
+
+
+class Command(BaseCommand):
+    help = 'Calcula o hash de conteúdo e o pHash das imagens da galeria ainda sem impressão digital e sinaliza quase-duplicatas.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Recalcula também as imagens que já têm hash')
+
+    def handle(self, *args, **options):
+        images = GalleryImage.objects.exclude(image='').order_by('pk')
+        if not options['all']:
+            images = images.filter(content_hash='')
+
+        done = missing = flagged = 0
+        for image in images.iterator():
+            try:
+                with image.image.open('rb') as file:
+                    image.set_fingerprint(file)
+            except (FileNotFoundError, OSError) as exc:
+                missing += 1
+                self.stderr.write(f'#{image.pk} {image.image.name}: {exc}')
+                continue
+
+            # Só imagens mais antigas contam como "original"
+            similar = [
+                other for other in GalleryImage.find_similar(image.phash, exclude_pk=image.pk)
+                if other.pk < image.pk and other.content_hash != image.content_hash
+            ]
+            image.near_duplicate_of = similar[0] if similar else None
+            flagged += bool(similar)
+
+            # update() não dispara sinais: não invalida o cache de conteúdo à toa
+            GalleryImage.objects.filter(pk=image.pk).update(
+                content_hash=image.content_hash,
+                phash=image.phash,
+                phash_band0=image.phash_band0,
+                phash_band1=image.phash_band1,
+                phash_band2=image.phash_band2,
+                phash_band3=image.phash_band3,
+                near_duplicate_of=image.near_duplicate_of,
+            )
+            done += 1
+
+        exact_groups = (
+            GalleryImage.objects.exclude(content_hash='')
+            .values('content_hash').annotate(n=Count('pk')).filter(n__gt=1).count()
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'{done} imagens processadas, {missing} arquivos ausentes, '
+            f'{flagged} quase-duplicatas sinalizadas, {exact_groups} grupos de cópias idênticas.'
+        ))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from core.likes import flush_pending_likes
+
+
+class Command(BaseCommand):
+    help = 'Grava no banco as curtidas pendentes no cache (executar periodicamente, ex.: cron a cada minuto)'
+
+    def handle(self, *args, **options):
+        flushed = flush_pending_likes()
+        self.stdout.write(self.style.SUCCESS(f'Curtidas gravadas para {flushed} post(s).'))
@@ -0,0 +1,104 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from core import imagemeta
+from core.content_cache import bump_content_version
+from core.models import BlogPost, Event, GalleryImage, Project
+
+
+MODELS = {
+    'blog': BlogPost,
+    'eventos': Event,
+    'galeria': GalleryImage,
+    'projetos': Project,
+}
+
+
+def _extract(source):
+    # Executado nos processos filhos: só Pillow, sem banco. ``source`` é o
+    # caminho do arquivo ou, em storages sem disco local, os bytes já lidos.
+    try:
+        if isinstance(source, bytes):
+            return imagemeta.extract_bytes(source)
+        with open(source, 'rb') as file:
+            return imagemeta.extract(file)
+    except Exception as exc:  # arquivo corrompido ou ausente não derruba o lote
+        return exc
+
+
+class Command(BaseCommand):
+    help = (
+        'Preenche largura, altura e placeholder das imagens já enviadas, '
+        'decodificando os arquivos em paralelo.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--model', choices=sorted(MODELS), action='append',
+            help='Limita a um tipo de conteúdo (pode repetir). Padrão: todos.',
+        )
+        parser.add_argument('--all', action='store_true', help='Reprocessa também as imagens que já têm metadados')
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Processos em paralelo')
+        parser.add_argument('--batch-size', type=int, default=200, help='Imagens lidas e gravadas por lote')
+
+    def handle(self, *args, **options):
+        total_done = 0
+        with ProcessPoolExecutor(max_workers=options['workers']) as pool:
+            for name in options['model'] or sorted(MODELS):
+                done, failed = self._backfill(MODELS[name], pool, options)
+                total_done += done
+                self.stdout.write(f'{name}: {done} imagens processadas, {failed} com erro')
+
+        # bulk_update não dispara sinais: invalida o cache das páginas uma vez só, no fim
+        if total_done:
+            bump_content_version()
+        self.stdout.write(self.style.SUCCESS(f'{total_done} imagens atualizadas.'))
+
+    def _backfill(self, model, pool, options):
+        objects = model.objects.exclude(image='').exclude(image__isnull=True).order_by('pk')
+        if not options['all']:
+            objects = objects.filter(image_width__isnull=True)
+
+        done = failed = 0
+        batch = []
+        for obj in objects.only('pk', 'image').iterator(chunk_size=options['batch_size']):
+            batch.append(obj)
+            if len(batch) >= options['batch_size']:
+                batch_done, batch_failed = self._process(model, batch, pool)
+                done, failed, batch = done + batch_done, failed + batch_failed, []
+        if batch:
+            batch_done, batch_failed = self._process(model, batch, pool)
+            done, failed = done + batch_done, failed + batch_failed
+        return done, failed
+
+    def _process(self, model, batch, pool):
+        # Os processos filhos recebem só o caminho e abrem o arquivo eles mesmos;
+        # só storages sem disco local (ex.: S3) são lidos aqui.
+        readable, sources = [], []
+        failed = 0
+        for obj in batch:
+            try:
+                sources.append(obj.image.path)
+            except NotImplementedError:
+                try:
+                    with obj.image.open('rb') as file:
+                        sources.append(file.read())
+                except OSError as exc:
+                    failed += 1
+                    self.stderr.write(f'{model.__name__} #{obj.pk} {obj.image.name}: {exc}')
+                    continue
+            readable.append(obj)
+
+        updated = []
+        for obj, metadata in zip(readable, pool.map(_extract, sources)):
+            if isinstance(metadata, Exception):
+                failed += 1
+                self.stderr.write(f'{model.__name__} #{obj.pk} {obj.image.name}: {metadata}')
+                continue
+            obj.set_image_metadata(metadata)
+            updated.append(obj)
+
+        model.objects.bulk_update(updated, ['image_width', 'image_height', 'image_placeholder'])
+        return len(updated), failed
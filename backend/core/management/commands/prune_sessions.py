@@ -0,0 +1,35 @@
+from importlib import import_module
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+
+BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = 'Remove sessões expiradas do backend atual e da tabela django_session (executar diariamente)'
+
+    def handle(self, *args, **options):
+        engine = import_module(settings.SESSION_ENGINE)
+        try:
+            engine.SessionStore.clear_expired()
+        except NotImplementedError:
+            # Cookies assinados expiram no navegador; não há nada a limpar
+            pass
+
+        # Linhas deixadas pelo backend em banco usado antes da troca de SESSION_ENGINE.
+        # Apaga em lotes para não travar a tabela por muito tempo.
+        now = timezone.now()
+        deleted = 0
+        while True:
+            keys = list(
+                Session.objects.filter(expire_date__lt=now).values_list('pk', flat=True)[:BATCH_SIZE]
+            )
+            if not keys:
+                break
+            deleted += Session.objects.filter(pk__in=keys).delete()[0]
+
+        self.stdout.write(self.style.SUCCESS(f'{deleted} sessão(ões) expirada(s) removida(s) do banco.'))
@@ -0,0 +1,42 @@
+from functools import reduce
+from operator import or_
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F, Q
+
+from core.content_cache import bump_content_version
+from core.models import Category, Tag
+
+
+class Command(BaseCommand):
+    help = (
+        'Recalcula em lote os contadores de categorias e tags (posts publicados, '
+        'eventos não cancelados e projetos ativos) e informa quantos estavam errados.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Só informa as divergências, sem corrigir')
+
+    def handle(self, *args, **options):
+        repaired = 0
+        with transaction.atomic():
+            for label, model in (('categorias', Category), ('tags', Tag)):
+                expressions = model.count_expressions()
+                # Registros em que alguma coluna difere do valor recalculado
+                stale = model.objects.annotate(
+                    **{f'correct_{field}': expression for field, expression in expressions.items()}
+                ).filter(reduce(or_, (~Q(**{field: F(f'correct_{field}')}) for field in expressions)))
+                count = stale.count()
+                if count and not options['dry_run']:
+                    model.refresh_counts()
+                repaired += count
+                self.stdout.write(f'{label}: {count} com contadores divergentes')
+
+        if options['dry_run']:
+            self.stdout.write('Nada foi alterado (--dry-run).')
+        elif repaired:
+            bump_content_version()
+            self.stdout.write(self.style.SUCCESS(f'{repaired} registros corrigidos.'))
+        else:
+            self.stdout.write(self.style.SUCCESS('Todos os contadores estão corretos.'))
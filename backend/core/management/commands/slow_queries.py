@@ -0,0 +1,58 @@
+import glob
+import json
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Resume o log de consultas lentas (core.slowlog): SQLs com maior tempo total.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=10, help='Quantidade de consultas listadas')
+        parser.add_argument('--file', default=settings.SLOW_QUERY_LOG_FILE, help='Arquivo de log (inclui os rotacionados .1, .2, ...)')
+        parser.add_argument('--plans', action='store_true', help='Mostra o plano da execução mais lenta de cada consulta')
+
+    def handle(self, *args, **options):
+        groups = defaultdict(lambda: {'count': 0, 'total': 0.0, 'worst': None, 'views': defaultdict(int)})
+        entries = 0
+        for path in sorted(glob.glob(glob.escape(options['file']) + '*')):
+            with open(path, encoding='utf-8') as log:
+                for line in log:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    entries += 1
+                    group = groups[entry['sql']]
+                    group['count'] += 1
+                    group['total'] += entry['ms']
+                    group['views'][entry.get('view') or '-'] += 1
+                    if group['worst'] is None or entry['ms'] > group['worst']['ms']:
+                        group['worst'] = entry
+
+        if not entries:
+            self.stdout.write('Nenhuma consulta lenta registrada.')
+            return
+
+        ranking = sorted(groups.items(), key=lambda item: item[1]['total'], reverse=True)[:options['top']]
+        self.stdout.write(f'{entries} consultas lentas, {len(groups)} SQLs distintos\n')
+        for position, (sql, group) in enumerate(ranking, 1):
+            worst = group['worst']
+            views = ', '.join(
+                f'{view} ({count})'
+                for view, count in sorted(group['views'].items(), key=lambda item: -item[1])[:3]
+            )
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f'#{position}  total {group["total"]:.1f} ms  |  {group["count"]}x  |  '
+                f'média {group["total"] / group["count"]:.1f} ms  |  pior {worst["ms"]:.1f} ms'
+            ))
+            self.stdout.write(f'  views: {views}')
+            self.stdout.write(f'  sql:   {sql[:300]}{"…" if len(sql) > 300 else ""}')
+            if worst.get('stack'):
+                self.stdout.write(f'  em:    {worst["stack"][-1]}')
+            if options['plans'] and worst.get('plan'):
+                for line in worst['plan'].splitlines():
+                    self.stdout.write(f'         {line}')
+            self.stdout.write('')
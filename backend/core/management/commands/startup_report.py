@@ -0,0 +1,119 @@
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+# Mesma carga de um worker: configura o Django e importa a aplicação WSGI
+STARTUP_CODE = 'import neabi_django.wsgi'
+
+
+def parse_importtime(output):
+    """Linhas ``import time: self [us] | cumulative | nome`` -> {módulo: (self_us, cumulativo_us)}."""
+    modules = {}
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # cabeçalho
+        modules[fields[2].strip()] = (int(fields[0]), int(fields[1]))
+    return modules
+
+
+class Command(BaseCommand):
+    help = (
+        'Mede o tempo de importação da aplicação (python -X importtime) em um processo novo '
+        'e lista os módulos mais caros. Com --save/--compare, acompanha regressões.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=20, help='Quantidade de módulos listados')
+        parser.add_argument('--sort', choices=['cumulative', 'self'], default='cumulative')
+        parser.add_argument('--runs', type=int, default=3, help='Execuções; vale a mediana por módulo')
+        parser.add_argument('--save', metavar='ARQUIVO', help='Grava o resultado em JSON (linha de base)')
+        parser.add_argument('--compare', metavar='ARQUIVO', help='Compara com uma linha de base gravada por --save')
+        parser.add_argument('--threshold', type=float, default=20.0, help='Piora (%%) que conta como regressão')
+
+    def handle(self, *args, **options):
+        samples = defaultdict(list)
+        totals = []
+        for _ in range(max(options['runs'], 1)):
+            modules = self._run()
+            totals.append(sum(self_us for self_us, _cumulative in modules.values()))
+            for name, timing in modules.items():
+                samples[name].append(timing)
+        modules = {name: _median(values) for name, values in samples.items()}
+        total = _median_value(totals)
+
+        column = 1 if options['sort'] == 'cumulative' else 0
+        ranking = sorted(modules.items(), key=lambda item: item[1][column], reverse=True)[:options['top']]
+        self.stdout.write(f'{len(modules)} módulos importados em {total / 1000:.1f} ms (mediana de {len(totals)} execuções)\n')
+        self.stdout.write(f'{"próprio ms":>11}{"acumulado ms":>14}  módulo')
+        for name, (self_us, cumulative_us) in ranking:
+            self.stdout.write(f'{self_us / 1000:>11.1f}{cumulative_us / 1000:>14.1f}  {name}')
+
+        if options['save']:
+            with open(options['save'], 'w', encoding='utf-8') as baseline:
+                json.dump({'total_us': total, 'modules': modules}, baseline, indent=1, sort_keys=True)
+            self.stdout.write(f'\nLinha de base gravada em {options["save"]}')
+        if options['compare']:
+            self._compare(options['compare'], total, modules, options['threshold'], options['top'])
+
+    def _run(self):
+        # Só a importação: o aquecimento (core.warmup) é medido pelo comando warmup
+        env = dict(os.environ, NEABI_WARMUP='0')
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', STARTUP_CODE],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        if result.returncode != 0:
+            raise CommandError(f'A importação da aplicação falhou:\n{result.stderr[-2000:]}')
+        return parse_importtime(result.stderr)
+
+    def _compare(self, path, total, modules, threshold, top):
+        try:
+            with open(path, encoding='utf-8') as baseline_file:
+                baseline = json.load(baseline_file)
+        except (OSError, ValueError) as exc:
+            raise CommandError(f'Linha de base ilegível: {exc}')
+
+        self.stdout.write(f'\nComparação com {path}:')
+        before = baseline['total_us']
+        self.stdout.write(f'total: {before / 1000:.1f} ms -> {total / 1000:.1f} ms ({_change(before, total):+.0f}%)')
+
+        # Módulos novos ou mais lentos, pelo tempo acumulado; ignora variações abaixo de 1 ms
+        regressions = []
+        for name, (_self_us, cumulative_us) in modules.items():
+            old = baseline['modules'].get(name)
+            old_cumulative = old[1] if old else 0
+            if cumulative_us - old_cumulative < 1000:
+                continue
+            if old is None or _change(old_cumulative, cumulative_us) >= threshold:
+                regressions.append((cumulative_us - old_cumulative, name, old_cumulative, cumulative_us))
+        regressions.sort(reverse=True)
+        for _delta, name, old_cumulative, cumulative_us in regressions[:top]:
+            label = 'novo' if not old_cumulative else f'{old_cumulative / 1000:.1f} ms'
+            self.stdout.write(self.style.WARNING(f'  {name}: {label} -> {cumulative_us / 1000:.1f} ms'))
+
+        if _change(before, total) >= threshold:
+            raise CommandError(f'O tempo de importação piorou mais de {threshold:.0f}%.')
+        if not regressions:
+            self.stdout.write(self.style.SUCCESS('Nenhum módulo ficou mais lento.'))
+
+
+def _median_value(values):
+    values = sorted(values)
+    return values[len(values) // 2]
+
+
+def _median(timings):
+    return (_median_value([t[0] for t in timings]), _median_value([t[1] for t in timings]))
+
+
+def _change(before, after):
+    return (after - before) / before * 100 if before else 0.0
@@ -0,0 +1,46 @@
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class Command(BaseCommand):
+    help = (
+        'Copia o banco SQLite principal para as réplicas de NEABI_DB_REPLICAS, '
+        'simulando a replicação no ambiente local. Com --interval, repete a cópia '
+        '(o atraso entre as cópias imita o atraso de uma réplica real).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, default=0, help='Segundos entre cópias (0 = copia uma vez)')
+
+    def handle(self, *args, **options):
+        if not settings.DATABASE_REPLICAS:
+            raise CommandError('Nenhuma réplica configurada (NEABI_DB_REPLICAS).')
+        aliases = [DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS]
+        if any(connections[alias].vendor != 'sqlite' for alias in aliases):
+            raise CommandError('Só bancos SQLite são copiados; PostgreSQL usa a própria replicação.')
+
+        while True:
+            start = time.perf_counter()
+            for alias in settings.DATABASE_REPLICAS:
+                self._copy(alias)
+            self.stdout.write(
+                f'{len(settings.DATABASE_REPLICAS)} réplica(s) atualizadas em {(time.perf_counter() - start) * 1000:.0f} ms'
+            )
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
+
+    def _copy(self, alias):
+        # A API de backup do SQLite copia um retrato consistente, mesmo com o principal em uso
+        connections[alias].close()
+        source = sqlite3.connect(settings.DATABASES[DEFAULT_DB_ALIAS]['NAME'])
+        target = sqlite3.connect(settings.DATABASES[alias]['NAME'])
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+            source.close()
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from core.content_cache import bump_content_version
+from core.models import Event
+
+
+class Command(BaseCommand):
+    help = 'Atualiza o status dos eventos a partir da data e horário (executar periodicamente, ex.: cron a cada 5 min)'
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        # Um único UPDATE por estado; eventos cancelados nunca mudam automaticamente
+        with transaction.atomic():
+            counts = {
+                'completed': Event.objects.finished(now).exclude(status='completed')
+                    .update(status='completed', updated_at=now),
+                'ongoing': Event.objects.ongoing(now).exclude(status='ongoing')
+                    .update(status='ongoing', updated_at=now),
+                'upcoming': Event.objects.upcoming(now).exclude(status='upcoming')
+                    .update(status='upcoming', updated_at=now),
+            }
+            # UPDATE em lote não dispara sinais: o cache é invalidado manualmente.
+            # Os contadores de Category/Tag não mudam (nenhum evento é cancelado aqui)
+            if any(counts.values()):
+                transaction.on_commit(bump_content_version)
+
+        self.stdout.write(self.style.SUCCESS(
+            'Status atualizados: '
+            + ', '.join(f'{count} {status}' for status, count in counts.items())
+        ))
@@ -0,0 +1,66 @@
+import heapq
+import math
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from core.models import BlogPost, Event, TrendingItem
+
+
+# Peso de cada sinal de engajamento na pontuação
+VIEW_WEIGHT = 1.0
+LIKE_WEIGHT = 5.0
+REGISTRATION_WEIGHT = 3.0
+
+
+def decay(age_hours, half_life_hours):
+    """Fator de decaimento exponencial: 1 no instante zero, 0.5 após uma meia-vida."""
+    return math.exp(-math.log(2) * max(age_hours, 0) / half_life_hours)
+
+
+class Command(BaseCommand):
+    help = 'Recalcula o ranking de posts e eventos "em alta" (executar periodicamente, ex.: cron a cada 15 min)'
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        half_life = settings.TRENDING_HALF_LIFE_HOURS
+        size = settings.TRENDING_SIZE
+
+        # Posts: visualizações e curtidas, decaindo a partir da data de publicação
+        posts = BlogPost.objects.filter(status='published', published_date__lte=now).values_list(
+            'id', 'views', 'likes', 'published_date'
+        )
+        top_posts = heapq.nlargest(size, (
+            ((views * VIEW_WEIGHT + likes * LIKE_WEIGHT)
+             * decay((now - published).total_seconds() / 3600, half_life), pk)
+            for pk, views, likes, published in posts.iterator()
+        ))
+
+        # Eventos: inscrições, decaindo a partir da criação do evento
+        events = Event.objects.upcoming(now).values_list(
+            'id', 'registered', 'created_at'
+        )
+        top_events = heapq.nlargest(size, (
+            ((registered + 1) * REGISTRATION_WEIGHT
+             * decay((now - created).total_seconds() / 3600, half_life), pk)
+            for pk, registered, created in events.iterator()
+        ))
+
+        items = [
+            TrendingItem(kind='post', rank=rank, score=score, post_id=pk, computed_at=now)
+            for rank, (score, pk) in enumerate(top_posts, start=1)
+        ] + [
+            TrendingItem(kind='event', rank=rank, score=score, event_id=pk, computed_at=now)
+            for rank, (score, pk) in enumerate(top_events, start=1)
+        ]
+
+        # Troca o ranking inteiro de uma vez para que nenhuma página veja uma tabela parcial
+        with transaction.atomic():
+            TrendingItem.objects.all().delete()
+            TrendingItem.objects.bulk_create(items)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Ranking atualizado: {len(top_posts)} posts e {len(top_events)} eventos.'
+        ))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from core.warmup import warm_up
+
+
+class Command(BaseCommand):
+    help = 'Executa o aquecimento do worker (core.warmup) e mostra o tempo de cada etapa.'
+
+    def handle(self, *args, **options):
+        results = warm_up()
+        for name, elapsed, summary in results:
+            self.stdout.write(f'{name:<12}{elapsed * 1000:>9.1f} ms  {summary}')
+        total = sum(elapsed for _name, elapsed, _summary in results)
+        self.stdout.write(f'{"total":<12}{total * 1000:>9.1f} ms')
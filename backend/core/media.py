@@ -0,0 +1,204 @@
+"""Entrega dos arquivos enviados (MEDIA_ROOT) em produção.
+
+- Cabeçalhos de cache longos e ``immutable``: o Django nunca reaproveita o
+  nome de um arquivo com conteúdo diferente.
+- GET condicional (ETag/Last-Modified) e requisições parciais (Range).
+- ``MEDIA_ACCEL = 'nginx'`` delega a transferência ao nginx via
+  ``X-Accel-Redirect``; ``'apache'`` usa ``X-Sendfile``. Assim o worker
+  Python libera a thread imediatamente.
+- Sem servidor na frente, responde com ``FileResponse``: servidores WSGI com
+  ``wsgi.file_wrapper`` (gunicorn) enviam o arquivo com ``os.sendfile``,
+  sem cópia pelo espaço do usuário, inclusive em intervalos parciais.
+- No modo ASGI (``aserve_media``) o arquivo é lido em blocos fora do event
+  loop, sem prender uma thread durante a transferência para clientes lentos.
+"""
+import asyncio
+import mimetypes
+import os
+import re
+import stat
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+from django.views.decorators.http import require_safe
+
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class _FileRange:
+    """Arquivo limitado a ``length`` bytes a partir da posição atual.
+
+    Expõe ``fileno()`` para que o servidor use ``os.sendfile`` (o gunicorn
+    lê o deslocamento atual do descritor e limita pelo Content-Length).
+    """
+
+    def __init__(self, file, length):
+        self.file = file
+        self.remaining = length
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b''
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+def _parse_range(header, size):
+    """Converte um cabeçalho Range de intervalo único em (início, fim) inclusivos.
+
+    Retorna ``None`` para cabeçalhos ausentes ou não suportados (múltiplos
+    intervalos) e ``False`` quando o intervalo não pode ser satisfeito.
+    """
+    match = RANGE_RE.match(header or '')
+    if not match:
+        return None
+    start, end = match.groups()
+    if not start and not end:
+        return None
+    if not start:
+        # Sufixo: últimos N bytes
+        length = int(end)
+        if length == 0:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+CHUNK_SIZE = 64 * 1024
+
+
+class _MediaRequest:
+    """Resolve o arquivo pedido e decide cabeçalhos, 304, Range e offload."""
+
+    def __init__(self, request, path):
+        try:
+            self.fullpath = safe_join(settings.MEDIA_ROOT, path)
+            st = os.stat(self.fullpath)
+        except (ValueError, OSError):
+            raise Http404('Arquivo não encontrado.')
+        if not stat.S_ISREG(st.st_mode):
+            raise Http404('Arquivo não encontrado.')
+
+        self.request = request
+        self.path = path
+        self.size = st.st_size
+        self.mtime = int(st.st_mtime)
+        self.etag = quote_etag(f'{st.st_size:x}-{st.st_mtime_ns:x}')
+
+        content_type, encoding = mimetypes.guess_type(self.fullpath)
+        if encoding or not content_type:
+            # Não anuncia Content-Encoding para o navegador não descompactar sozinho
+            content_type = 'application/octet-stream'
+        self.content_type = content_type
+
+        self.byte_range = _parse_range(request.headers.get('Range'), self.size)
+        if_range = request.headers.get('If-Range')
+        if (self.byte_range is not None and if_range and if_range != self.etag
+                and parse_http_date_safe(if_range) != self.mtime):
+            # O cliente tem uma versão antiga: envia o arquivo inteiro
+            self.byte_range = None
+
+    def finish(self, response):
+        response['ETag'] = self.etag
+        response['Last-Modified'] = http_date(self.mtime)
+        response['Cache-Control'] = f'public, max-age={settings.MEDIA_CACHE_MAX_AGE}, immutable'
+        response['Accept-Ranges'] = 'bytes'
+        return response
+
+    def early_response(self):
+        """Respostas que não transferem o arquivo pelo Python (304, offload, 416)."""
+        not_modified = get_conditional_response(self.request, etag=self.etag, last_modified=self.mtime)
+        if not_modified is not None:
+            return self.finish(not_modified)
+
+        accel = settings.MEDIA_ACCEL
+        if accel:
+            # O servidor web trata Range e envia o arquivo; o worker só valida o caminho
+            response = HttpResponse(content_type=self.content_type)
+            if accel == 'nginx':
+                response['X-Accel-Redirect'] = quote(settings.MEDIA_ACCEL_PREFIX + self.path)
+            else:
+                response['X-Sendfile'] = self.fullpath
+            return self.finish(response)
+
+        if self.byte_range is False:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{self.size}'
+            return self.finish(response)
+        return None
+
+    def span(self):
+        """(início, quantidade de bytes, status) do conteúdo a enviar."""
+        if self.byte_range is None:
+            return 0, self.size, 200
+        start, end = self.byte_range
+        return start, end - start + 1, 206
+
+    def content_headers(self, response):
+        start, length, status = self.span()
+        response['Content-Length'] = length
+        if status == 206:
+            response['Content-Range'] = f'bytes {start}-{start + length - 1}/{self.size}'
+        return self.finish(response)
+
+    async def aiter_content(self):
+        start, remaining, status = self.span()
+        file = await asyncio.to_thread(open, self.fullpath, 'rb')
+        try:
+            await asyncio.to_thread(file.seek, start)
+            while remaining > 0:
+                chunk = await asyncio.to_thread(file.read, min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+        finally:
+            await asyncio.to_thread(file.close)
+
+
+@require_safe
+def serve_media(request, path):
+    media = _MediaRequest(request, path)
+    response = media.early_response()
+    if response is not None:
+        return response
+
+    start, length, status = media.span()
+    file = open(media.fullpath, 'rb')
+    if status == 200:
+        response = FileResponse(file, content_type=media.content_type)
+    else:
+        file.seek(start)
+        response = FileResponse(_FileRange(file, length), content_type=media.content_type, status=status)
+    return media.content_headers(response)
+
+
+@require_safe
+async def aserve_media(request, path):
+    """Versão assíncrona de ``serve_media`` para o modo ASGI."""
+    media = await asyncio.to_thread(_MediaRequest, request, path)
+    response = media.early_response()
+    if response is not None:
+        return response
+
+    start, length, status = media.span()
+    response = StreamingHttpResponse(media.aiter_content(), content_type=media.content_type, status=status)
+    return media.content_headers(response)
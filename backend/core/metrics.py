@@ -0,0 +1,271 @@
+"""Tempo por requisição: cabeçalho ``Server-Timing`` e endpoint ``/metrics``.
+
+``RequestMetricsMiddleware`` mede, em cada requisição, o número e o tempo
+das consultas SQL (um ``execute_wrapper`` em cada conexão), o tempo de
+renderização dos templates e o restante (código da view e middlewares). A
+medição segue a requisição por um ``ContextVar``, então também funciona em
+ASGI, onde as consultas rodam em outra thread (``sync_to_async``). Para usuários da
+equipe (``is_staff``) os valores saem no cabeçalho ``Server-Timing``, que o
+DevTools do navegador mostra na aba Network → Timing.
+
+Os mesmos valores são agregados por rota em histogramas, expostos em
+``/metrics`` no formato texto do Prometheus. Os agregados ficam na memória
+do processo: com vários workers, cada coleta lê o worker que a atendeu.
+
+Com ``METRICS_ENABLED`` desligado o middleware se remove da pilha
+(``MiddlewareNotUsed``) e nada é instrumentado.
+"""
+import contextvars
+import threading
+import time
+from bisect import bisect_left
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import Http404, HttpResponse
+from django.template import base as template_base
+from django.utils.crypto import constant_time_compare
+
+
+# Limites (em segundos) dos baldes dos histogramas
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_current = contextvars.ContextVar('request_timing', default=None)
+
+
+class RequestTiming:
+    __slots__ = ('sql_count', 'sql_time', 'sql_time_in_templates', 'template_time', 'template_depth')
+
+    def __init__(self):
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.sql_time_in_templates = 0.0
+        self.template_time = 0.0
+        self.template_depth = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.sql_count += 1
+            self.sql_time += elapsed
+            if self.template_depth:
+                self.sql_time_in_templates += elapsed
+
+
+def _timed_execute(execute, sql, params, many, context):
+    # execute_wrapper permanente de cada conexão; só mede dentro de uma requisição
+    timing = _current.get()
+    if timing is None:
+        return execute(sql, params, many, context)
+    return timing(execute, sql, params, many, context)
+
+
+def _install_sql_timer(sender=None, connection=None, **kwargs):
+    # connection_created dispara de novo a cada reconexão do mesmo DatabaseWrapper
+    if _timed_execute not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_timed_execute)
+
+
+def install_sql_timer():
+    connection_created.connect(_install_sql_timer, dispatch_uid='core.metrics.install_sql_timer')
+    for connection in connections.all(initialized_only=True):
+        _install_sql_timer(connection=connection)
+
+
+# ========================
+# Tempo de template
+# ========================
+_original_render = template_base.Template.render
+
+
+def _timed_render(self, context):
+    timing = _current.get()
+    # Só o template mais externo é cronometrado ({% include %} e {% extends %} ficam dentro dele)
+    if timing is None or timing.template_depth:
+        return _original_render(self, context)
+    timing.template_depth += 1
+    start = time.perf_counter()
+    try:
+        return _original_render(self, context)
+    finally:
+        timing.template_depth -= 1
+        timing.template_time += time.perf_counter() - start
+
+
+def install_template_timer():
+    template_base.Template.render = _timed_render
+
+
+# ========================
+# Agregados por rota
+# ========================
+class Histogram:
+    __slots__ = ('counts', 'total', 'count')
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        # Guarda por balde; a exposição acumula (o formato do Prometheus é cumulativo)
+        index = bisect_left(BUCKETS, value)
+        if index < len(BUCKETS):
+            self.counts[index] += 1
+        self.total += value
+        self.count += 1
+
+
+class Registry:
+    HISTOGRAMS = (
+        ('neabi_request_duration_seconds', 'Tempo total da requisição'),
+        ('neabi_request_db_seconds', 'Tempo gasto em consultas SQL por requisição'),
+        ('neabi_request_template_seconds', 'Tempo de renderização de templates por requisição'),
+    )
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = {}      # (rota, método, status) -> total
+        self.queries = {}       # rota -> consultas SQL
+        self.histograms = {name: {} for name, _help in self.HISTOGRAMS}
+
+    def record(self, route, method, status, total, timing):
+        with self._lock:
+            key = (route, method, str(status))
+            self.requests[key] = self.requests.get(key, 0) + 1
+            self.queries[route] = self.queries.get(route, 0) + timing.sql_count
+            for name, value in (
+                ('neabi_request_duration_seconds', total),
+                ('neabi_request_db_seconds', timing.sql_time),
+                ('neabi_request_template_seconds', timing.template_time),
+            ):
+                histogram = self.histograms[name].get(route)
+                if histogram is None:
+                    histogram = self.histograms[name][route] = Histogram()
+                histogram.observe(value)
+
+    def render(self):
+        lines = []
+        with self._lock:
+            lines += [
+                '# HELP neabi_requests_total Requisições atendidas',
+                '# TYPE neabi_requests_total counter',
+            ]
+            for (route, method, status), value in sorted(self.requests.items()):
+                lines.append(
+                    f'neabi_requests_total{{route="{_escape(route)}",method="{method}",status="{status}"}} {value}'
+                )
+            lines += [
+                '# HELP neabi_request_db_queries_total Consultas SQL executadas',
+                '# TYPE neabi_request_db_queries_total counter',
+            ]
+            for route, value in sorted(self.queries.items()):
+                lines.append(f'neabi_request_db_queries_total{{route="{_escape(route)}"}} {value}')
+
+            for name, help_text in self.HISTOGRAMS:
+                lines += [f'# HELP {name} {help_text}', f'# TYPE {name} histogram']
+                for route, histogram in sorted(self.histograms[name].items()):
+                    label = f'route="{_escape(route)}"'
+                    cumulative = 0
+                    for bound, count in zip(BUCKETS, histogram.counts):
+                        cumulative += count
+                        lines.append(f'{name}_bucket{{{label},le="{bound}"}} {cumulative}')
+                    lines.append(f'{name}_bucket{{{label},le="+Inf"}} {histogram.count}')
+                    lines.append(f'{name}_sum{{{label}}} {histogram.total:.6f}')
+                    lines.append(f'{name}_count{{{label}}} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+registry = Registry()
+
+
+def route_name(request):
+    """Padrão da URL (ex.: ``blog/<slug:slug>/``), para não criar uma série por página."""
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'nao_resolvida'
+    return '/' + match.route
+
+
+# ========================
+# Middleware e endpoint
+# ========================
+class RequestMetricsMiddleware:
+    """Deve vir logo após o middleware de arquivos estáticos em ``MIDDLEWARE``."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        install_sql_timer()
+        install_template_timer()
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timing = RequestTiming()
+        token = _current.set(timing)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        total = time.perf_counter() - start
+
+        registry.record(route_name(request), request.method, response.status_code, total, timing)
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_staff:
+            self.add_server_timing(response, timing, total)
+        return response
+
+    async def __acall__(self, request):
+        timing = RequestTiming()
+        token = _current.set(timing)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        total = time.perf_counter() - start
+
+        registry.record(route_name(request), request.method, response.status_code, total, timing)
+        user = await request.auser() if hasattr(request, 'auser') else None
+        if user is not None and user.is_staff:
+            self.add_server_timing(response, timing, total)
+        return response
+
+    def add_server_timing(self, response, timing, total):
+        view_time = max(total - timing.template_time - (timing.sql_time - timing.sql_time_in_templates), 0)
+        response['Server-Timing'] = ', '.join((
+            f'db;dur={timing.sql_time * 1000:.1f};desc="SQL ({timing.sql_count} consultas)"',
+            f'tpl;dur={timing.template_time * 1000:.1f};desc="Templates"',
+            f'view;dur={view_time * 1000:.1f};desc="View e middlewares"',
+            f'total;dur={total * 1000:.1f}',
+        ))
+
+
+def metrics_view(request):
+    """Métricas no formato do Prometheus: exige ``Authorization: Bearer <METRICS_TOKEN>`` ou login da equipe."""
+    if not settings.METRICS_ENABLED:
+        raise Http404
+    authorization = request.headers.get('Authorization', '')
+    token_ok = bool(settings.METRICS_TOKEN) and constant_time_compare(
+        authorization, f'Bearer {settings.METRICS_TOKEN}'
+    )
+    if not token_ok and not request.user.is_staff:
+        return HttpResponse('Não autorizado\n', status=401, content_type='text/plain; charset=utf-8')
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,46 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+
+class AnonymousReadSessionMiddleware:
+    """Não grava sessão em leituras anônimas.
+
+    Em GET/HEAD de visitantes sem cookie de sessão, descarta qualquer
+    alteração feita na sessão durante a requisição, para que robôs e
+    visitantes que só leem o site nunca criem sessões nem recebam cookie.
+    Os fluxos que precisam da sessão já no GET (ex.: o link de redefinição de
+    senha guarda o token nela) ficam em ``SESSION_ANONYMOUS_GET_PATHS``.
+    Deve vir logo após ``SessionMiddleware`` em ``MIDDLEWARE``.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.get_response(request)
+        if self._is_anonymous_read(request):
+            user = getattr(request, 'user', None)
+            if user is None or not user.is_authenticated:
+                request.session.modified = False
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        if self._is_anonymous_read(request):
+            user = await request.auser() if hasattr(request, 'auser') else None
+            if user is None or not user.is_authenticated:
+                request.session.modified = False
+        return response
+
+    def _is_anonymous_read(self, request):
+        return (
+            request.method in ('GET', 'HEAD')
+            and settings.SESSION_COOKIE_NAME not in request.COOKIES
+            and not request.path.startswith(settings.SESSION_ANONYMOUS_GET_PATHS)
+        )
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.5 on 2026-10-19 11:18
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_remove_blogpost_read_time'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrendingItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('post', 'Post'), ('event', 'Evento')], max_length=10, verbose_name='Tipo')),
+                ('rank', models.PositiveIntegerField(verbose_name='Posição')),
+                ('score', models.FloatField(verbose_name='Pontuação')),
+                ('computed_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Calculado em')),
+                ('event', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.event', verbose_name='Evento')),
+                ('post', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.blogpost', verbose_name='Post')),
+            ],
+            options={
+                'verbose_name': 'Item em alta',
+                'verbose_name_plural': 'Itens em alta',
+                'ordering': ['kind', 'rank'],
+                'constraints': [models.UniqueConstraint(fields=('kind', 'rank'), name='trending_kind_rank_uniq')],
+            },
+        ),
+    ]
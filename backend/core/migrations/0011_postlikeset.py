@@ -0,0 +1,26 @@
+# Generated by Django 5.2.5 on 2026-10-19 11:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_trendingitem'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostLikeSet',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='like_set', serialize=False, to='core.blogpost', verbose_name='Post')),
+                ('members', models.BinaryField(default=b'', verbose_name='Membros')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Atualizado em')),
+            ],
+            options={
+                'verbose_name': 'Curtidas do Post',
+                'verbose_name_plural': 'Curtidas dos Posts',
+            },
+        ),
+    ]
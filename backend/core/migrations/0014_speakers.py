@@ -0,0 +1,82 @@
+# Generated by Django 5.2.5 on 2026-10-19 11:33
+
+import django.db.models.deletion
+import django.db.models.functions.text
+from django.db import migrations, models
+from django.utils.text import slugify
+
+
+def split_speakers(apps, schema_editor):
+    """Converte o texto separado por vírgulas de cada evento em Speaker/EventSpeaker."""
+    Event = apps.get_model('core', 'Event')
+    Speaker = apps.get_model('core', 'Speaker')
+    EventSpeaker = apps.get_model('core', 'EventSpeaker')
+
+    speakers = {}
+    links = []
+    for event_id, text in Event.objects.exclude(speakers='').values_list('id', 'speakers').iterator():
+        seen = set()
+        for name in (text or '').split(','):
+            name = name.strip()
+            slug = slugify(name)[:200]
+            if not slug or slug in seen:
+                continue
+            seen.add(slug)
+            if slug not in speakers:
+                speakers[slug] = Speaker.objects.create(name=name, slug=slug)
+            links.append(EventSpeaker(event_id=event_id, speaker=speakers[slug], position=len(seen) - 1))
+    EventSpeaker.objects.bulk_create(links, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_user_login_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Speaker',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=200, verbose_name='Nome')),
+                ('slug', models.SlugField(max_length=200, unique=True, verbose_name='URL')),
+                ('bio', models.TextField(blank=True, verbose_name='Biografia')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Criado em')),
+            ],
+            options={
+                'verbose_name': 'Palestrante',
+                'verbose_name_plural': 'Palestrantes',
+                'ordering': ['name'],
+                'indexes': [models.Index(django.db.models.functions.text.Lower('name'), name='speaker_name_lower_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='EventSpeaker',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveSmallIntegerField(default=0, verbose_name='Ordem')),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='speaker_links', to='core.event')),
+                ('speaker', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='event_links', to='core.speaker')),
+            ],
+            options={
+                'verbose_name': 'Palestrante do evento',
+                'verbose_name_plural': 'Palestrantes do evento',
+                'ordering': ['position'],
+            },
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='speaker_profiles',
+            field=models.ManyToManyField(blank=True, related_name='events', through='core.EventSpeaker', to='core.speaker', verbose_name='Palestrantes cadastrados'),
+        ),
+        migrations.AddIndex(
+            model_name='eventspeaker',
+            index=models.Index(fields=['speaker', 'event'], name='event_speaker_lookup_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='eventspeaker',
+            constraint=models.UniqueConstraint(fields=('event', 'speaker'), name='event_speaker_unique'),
+        ),
+        migrations.RunPython(split_speakers, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.5 on 2026-10-19 11:35
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_tag_counts(apps, schema_editor):
+    Tag = apps.get_model('core', 'Tag')
+
+    def count_for(model_name):
+        through = apps.get_model('core', model_name).tags.through
+        rows = through.objects.filter(tag_id=OuterRef('pk')).order_by().values('tag_id')
+        return Coalesce(Subquery(rows.annotate(n=Count('pk')).values('n')), 0)
+
+    Tag.objects.update(
+        post_count=count_for('BlogPost'),
+        event_count=count_for('Event'),
+        project_count=count_for('Project'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_speakers'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tag',
+            name='event_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Eventos'),
+        ),
+        migrations.AddField(
+            model_name='tag',
+            name='post_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Posts'),
+        ),
+        migrations.AddField(
+            model_name='tag',
+            name='project_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Projetos'),
+        ),
+        migrations.RunPython(fill_tag_counts, migrations.RunPython.noop),
+    ]
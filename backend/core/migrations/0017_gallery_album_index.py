@@ -0,0 +1,17 @@
+# Generated by Django 5.2.5 on 2026-10-19 11:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_gallery_fingerprints'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='galleryimage',
+            index=models.Index(fields=['event', 'published', '-uploaded_at', '-id'], name='gallery_event_album_idx'),
+        ),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 5.2.5 on 2026-10-19 11:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_gallery_album_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogpost',
+            name='image_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='Altura'),
+        ),
+        migrations.AddField(
+            model_name='blogpost',
+            name='image_placeholder',
+            field=models.TextField(blank=True, editable=False, verbose_name='Placeholder'),
+        ),
+        migrations.AddField(
+            model_name='blogpost',
+            name='image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='Largura'),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='image_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='Altura'),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='image_placeholder',
+            field=models.TextField(blank=True, editable=False, verbose_name='Placeholder'),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='Largura'),
+        ),
+        migrations.AddField(
+            model_name='galleryimage',
+            name='image_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='Altura'),
+        ),
+        migrations.AddField(
+            model_name='galleryimage',
+            name='image_placeholder',
+            field=models.TextField(blank=True, editable=False, verbose_name='Placeholder'),
+        ),
+        migrations.AddField(
+            model_name='galleryimage',
+            name='image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='Largura'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='image_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='Altura'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='image_placeholder',
+            field=models.TextField(blank=True, editable=False, verbose_name='Placeholder'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='Largura'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.5 on 2026-10-19 11:56
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0019_admin_listing_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RequestProfile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('method', models.CharField(max_length=10, verbose_name='Método')),
+                ('path', models.CharField(max_length=500, verbose_name='Caminho')),
+                ('status_code', models.PositiveSmallIntegerField(verbose_name='Status')),
+                ('mode', models.CharField(choices=[('sampling', 'Amostragem (flamegraph)'), ('cprofile', 'Determinístico (cProfile)')], max_length=10, verbose_name='Modo')),
+                ('duration_ms', models.FloatField(verbose_name='Duração (ms)')),
+                ('samples', models.PositiveIntegerField(default=0, verbose_name='Amostras')),
+                ('data', models.BinaryField(verbose_name='Dados')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Criado em')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='request_profiles', to=settings.AUTH_USER_MODEL, verbose_name='Solicitado por')),
+            ],
+            options={
+                'verbose_name': 'Perfil de Requisição',
+                'verbose_name_plural': 'Perfis de Requisição',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
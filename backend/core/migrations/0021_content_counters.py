@@ -0,0 +1,58 @@
+# Generated by Django 5.2.5 on 2026-10-19 12:03
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+# Conteúdo contado: posts publicados, próximos eventos e projetos ativos
+COUNTED = (
+    ('post_count', 'BlogPost', 'blogpost', {'status': 'published'}),
+    ('event_count', 'Event', 'event', {'status': 'upcoming'}),
+    ('project_count', 'Project', 'project', {'status': True}),
+)
+
+
+def fill_counts(apps, schema_editor):
+    Category = apps.get_model('core', 'Category')
+    Tag = apps.get_model('core', 'Tag')
+
+    def count(rows, link):
+        rows = rows.filter(**{link: OuterRef('pk')}).order_by().values(link)
+        return Coalesce(Subquery(rows.annotate(n=Count('pk')).values('n')), 0)
+
+    category_counts, tag_counts = {}, {}
+    for field, model_name, name, filters in COUNTED:
+        model = apps.get_model('core', model_name)
+        category_counts[field] = count(model.objects.filter(**filters), 'category')
+        # As tags passam a contar só o conteúdo visível, como as categorias
+        through = model.tags.through.objects.filter(**{f'{name}__{key}': value for key, value in filters.items()})
+        tag_counts[field] = count(through, 'tag')
+    Category.objects.update(**category_counts)
+    Tag.objects.update(**tag_counts)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0020_request_profile'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='event_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Eventos'),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='post_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Posts'),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='project_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Projetos'),
+        ),
+        migrations.RunPython(fill_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-19 12:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0021_content_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='postlikeset',
+            name='applied_seq',
+            field=models.PositiveBigIntegerField(default=0, editable=False, verbose_name='Última operação aplicada'),
+        ),
+    ]
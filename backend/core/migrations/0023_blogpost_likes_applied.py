@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-19 12:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0022_postlikeset_applied_seq'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogpost',
+            name='likes_applied',
+            field=models.BigIntegerField(default=0, editable=False, verbose_name='Curtidas aplicadas'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+from django.db import migrations
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+# event_count passa a contar todos os eventos não cancelados, como a página da tag
+LISTED_STATUSES = ('upcoming', 'ongoing', 'completed')
+
+
+def fill_event_counts(apps, schema_editor):
+    Category = apps.get_model('core', 'Category')
+    Tag = apps.get_model('core', 'Tag')
+    Event = apps.get_model('core', 'Event')
+
+    def count(rows, link):
+        rows = rows.filter(**{link: OuterRef('pk')}).order_by().values(link)
+        return Coalesce(Subquery(rows.annotate(n=Count('pk')).values('n')), 0)
+
+    Category.objects.update(event_count=count(Event.objects.filter(status__in=LISTED_STATUSES), 'category'))
+    through = Event.tags.through.objects.filter(event__status__in=LISTED_STATUSES)
+    Tag.objects.update(event_count=count(through, 'tag'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0023_blogpost_likes_applied'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_event_counts, migrations.RunPython.noop),
+    ]
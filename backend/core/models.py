@@ -3,7 +3,11 @@ from django.contrib.auth.models import AbstractUser
 from django.urls import reverse
 from django.utils.text import slugify
 from django.utils import timezone
+from django.db.models import F
+from django.db.models.functions import Coalesce, Lower
 import itertools
+from django.conf import settings
+from . import imagehash, imagemeta
 # Importação para usar a função de tradução (opcional, mas boa prática)
 from django.utils.translation import gettext_lazy as _ 
 
@@ -27,6 +31,11 @@ class User(AbstractUser):
     class Meta:
         verbose_name = _('Usuário')
         verbose_name_plural = _('Usuários')
+        indexes = [
+            # Usados pelo login por username ou email (core.backends.EmailOrUsernameBackend)
+            models.Index(Lower('username'), name='user_username_lower_idx'),
+            models.Index(Lower('email'), name='user_email_lower_idx'),
+        ]
     
     def get_full_name(self):
         return f"{self.first_name} {self.last_name}".strip()
@@ -36,7 +45,127 @@ class User(AbstractUser):
 
 
 
-class Category(models.Model):
+class ImageMetadataMixin(models.Model):
+    """Dimensões e placeholder do campo ``image``, extraídos no upload (core.imagemeta).
+
+    Os templates usam esses campos para emitir ``width``/``height`` e o fundo
+    borrado sem abrir o arquivo a cada requisição. Registros antigos são
+    preenchidos pelo comando ``image_metadata``.
+    """
+    image_width = models.PositiveIntegerField(null=True, blank=True, editable=False, verbose_name=_("Largura"))
+    image_height = models.PositiveIntegerField(null=True, blank=True, editable=False, verbose_name=_("Altura"))
+    image_placeholder = models.TextField(blank=True, editable=False, verbose_name=_("Placeholder"))
+
+    # Nome do arquivo gravado no banco (None: registro novo ou campo adiado)
+    _stored_image_name = None
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if 'image' in instance.__dict__:
+            instance._stored_image_name = instance.image.name
+        return instance
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'image' in update_fields:
+            self.refresh_image_metadata()
+        super().save(*args, **kwargs)
+        self._stored_image_name = self.image.name
+
+    def image_changed(self):
+        """Arquivo novo ou diferente do que está gravado no banco."""
+        return not self.image._committed or self.image.name != self._stored_image_name
+
+    def refresh_image_metadata(self, force=False):
+        if not self.image:
+            self.image_width = self.image_height = None
+            self.image_placeholder = ''
+            return
+        # Só arquivo novo ou trocado; registros antigos sem metadados ficam para o comando
+        if not self.image_changed() and not force:
+            return
+        try:
+            if self.image._committed:
+                with self.image.open('rb') as file:
+                    metadata = imagemeta.extract(file)
+            else:
+                metadata = imagemeta.extract(self.image)
+        except OSError:
+            self.image_width = self.image_height = None
+            self.image_placeholder = ''
+            return
+        self.set_image_metadata(metadata)
+
+    def set_image_metadata(self, metadata):
+        self.image_width = metadata['width']
+        self.image_height = metadata['height']
+        self.image_placeholder = metadata['placeholder']
+
+
+class ContentCountersMixin(models.Model):
+    """Contadores desnormalizados de posts publicados, eventos não cancelados e projetos ativos.
+
+    Mantidos pelos sinais de core.signals (save, delete, mudança de status ou
+    de categoria e alteração das tags); ``python manage.py repair_counters``
+    recalcula tudo em lote. Listagens e ordenações por popularidade leem só
+    as colunas, sem COUNT sobre as tabelas de conteúdo.
+    """
+    post_count = models.PositiveIntegerField(default=0, editable=False, verbose_name=_('Posts'))
+    event_count = models.PositiveIntegerField(default=0, editable=False, verbose_name=_('Eventos'))
+    project_count = models.PositiveIntegerField(default=0, editable=False, verbose_name=_('Projetos'))
+
+    class Meta:
+        abstract = True
+
+    @property
+    def usage_count(self):
+        return self.post_count + self.event_count + self.project_count
+
+    @staticmethod
+    def counted_content():
+        """(contador, modelo, filtro) do conteúdo visível contado em cada coluna.
+
+        Os eventos seguem o mesmo critério da página da tag, do sitemap e da
+        busca: todos menos os cancelados (próximos, em andamento e finalizados).
+        """
+        return (
+            ('post_count', BlogPost, {'status': 'published'}),
+            ('event_count', Event, {'status__in': Event.LISTED_STATUSES}),
+            ('project_count', Project, {'status': True}),
+        )
+
+    @classmethod
+    def content_rows(cls, model, filters):
+        """Linhas de ``model`` que contam para esta tabela e o campo que aponta para ela."""
+        raise NotImplementedError
+
+    @classmethod
+    def count_expressions(cls):
+        """{contador: subconsulta com o valor correto}, para ``update()`` ou ``annotate()``."""
+        expressions = {}
+        for field, model, filters in cls.counted_content():
+            rows, link = cls.content_rows(model, filters)
+            expressions[field] = Coalesce(
+                models.Subquery(
+                    rows.filter(**{link: models.OuterRef('pk')}).order_by()
+                    .values(link).annotate(n=models.Count('pk')).values('n')
+                ),
+                0,
+            )
+        return expressions
+
+    @classmethod
+    def refresh_counts(cls, ids=None):
+        """Recalcula os contadores dos registros indicados (ou de todos) em um único UPDATE."""
+        queryset = cls.objects.all() if ids is None else cls.objects.filter(pk__in=ids)
+        return queryset.update(**cls.count_expressions())
+
+
+class Category(ContentCountersMixin):
     name = models.CharField(max_length=100, verbose_name=_("Nome"))
     slug = models.SlugField(unique=True, blank=True, null=True, verbose_name=_("URL"))
     created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Criado em"))  
@@ -60,8 +189,13 @@ class Category(models.Model):
             self.slug = '%s-%d' % (orig_slug, x)
             
         super().save(*args, **kwargs)
+
+    @classmethod
+    def content_rows(cls, model, filters):
+        return model.objects.filter(**filters), 'category'
+
     
-class Tag(models.Model):
+class Tag(ContentCountersMixin):
     """Tags for blog posts and events"""
     name = models.CharField(max_length=50, unique=True, verbose_name=_('Nome'))
     slug = models.SlugField(unique=True, verbose_name=_('URL'))
@@ -80,8 +214,33 @@ class Tag(models.Model):
             self.slug = slugify(self.name)
         super().save(*args, **kwargs)
 
-
-class BlogPost(models.Model):
+    def get_absolute_url(self):
+        return reverse('tag_detail', kwargs={'slug': self.slug})
+
+    @classmethod
+    def content_rows(cls, model, filters):
+        # Conta pela tabela de ligação (uma linha por objeto e tag)
+        name = model._meta.model_name
+        rows = model.tags.through.objects.filter(**{f'{name}__{key}': value for key, value in filters.items()})
+        return rows, 'tag'
+
+    @classmethod
+    def cloud(cls, limit=40):
+        """Tags mais usadas com um peso de 1 a 5, lidas só da própria tabela de tags."""
+        tags = list(
+            cls.objects.annotate(total=F('post_count') + F('event_count') + F('project_count'))
+            .filter(total__gt=0)
+            .order_by('-total', 'name')[:limit]
+        )
+        if tags:
+            low, high = tags[-1].total, tags[0].total
+            for tag in tags:
+                tag.weight = 1 + round(4 * (tag.total - low) / (high - low)) if high > low else 3
+            tags.sort(key=lambda tag: tag.name.lower())
+        return tags
+
+
+class BlogPost(ImageMetadataMixin):
     """Blog post model"""
     
     STATUS_CHOICES = [
@@ -110,6 +269,9 @@ class BlogPost(models.Model):
     image = models.ImageField(upload_to='blog_images/', blank=True, null=True, verbose_name=_('Imagem'))
     views = models.PositiveIntegerField(default=0, verbose_name=_('Visualizações'))
     likes = models.PositiveIntegerField(default=0, verbose_name=_('Curtidas'))
+    # Soma das operações do diário de curtidas (core.likes) já aplicadas a ``likes``;
+    # gravada no mesmo UPDATE, para o saldo pendente nunca ser contado duas vezes
+    likes_applied = models.BigIntegerField(default=0, editable=False, verbose_name=_('Curtidas aplicadas'))
     featured = models.BooleanField(default=False, verbose_name=_('Destaque'))
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='published', verbose_name=_('Status'))
     created_at = models.DateTimeField(auto_now_add=True, verbose_name=_('Criado em'))
@@ -119,6 +281,10 @@ class BlogPost(models.Model):
         verbose_name = _('Post do Blog')
         verbose_name_plural = _('Posts do Blog')
         ordering = ['-published_date']
+        indexes = [
+            # Ordem da listagem no /django-admin/ (core.admin.BlogPostAdmin)
+            models.Index(fields=['-published_date', '-id'], name='post_published_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -135,13 +301,51 @@ class BlogPost(models.Model):
         return list(self.tags.values_list('name', flat=True))
 
 
-class Event(models.Model):
+class EventQuerySet(models.QuerySet):
+    """Filtros de ciclo de vida derivados de date/start_time/end_time.
+
+    Usam apenas comparações de intervalo sobre o índice (date, start_time),
+    então as listagens nunca precisam filtrar eventos em Python.
+    """
+
+    def _now(self, now=None):
+        now = timezone.localtime(now)
+        return now.date(), now.time()
+
+    def upcoming(self, now=None):
+        today, current = self._now(now)
+        return self.exclude(status='cancelled').filter(date__gte=today).exclude(
+            date=today, start_time__lte=current
+        )
+
+    def ongoing(self, now=None):
+        today, current = self._now(now)
+        return self.exclude(status='cancelled').filter(
+            date=today, start_time__lte=current, end_time__gt=current
+        )
+
+    def finished(self, now=None):
+        today, current = self._now(now)
+        return self.exclude(status='cancelled').filter(date__lte=today).exclude(
+            date=today, end_time__gt=current
+        )
+
+    def with_speakers(self):
+        """Carrega os palestrantes (na ordem cadastrada) em uma única consulta extra."""
+        return self.prefetch_related(
+            models.Prefetch('speaker_links', queryset=EventSpeaker.objects.select_related('speaker'))
+        )
+
+
+class Event(ImageMetadataMixin):
     STATUS_CHOICES = [
         ('upcoming', _('Próximo')),
         ('ongoing', _('Em andamento')),
         ('completed', _('Finalizado')),
         ('cancelled', _('Cancelado')),
     ]
+    # Eventos que aparecem no site (listas, tags, sitemap, busca)
+    LISTED_STATUSES = ('upcoming', 'ongoing', 'completed')
 
     TYPE_CHOICES = [
         ('presencial', _('Presencial')),
@@ -180,6 +384,13 @@ class Event(models.Model):
         help_text=_("Lista de palestrantes separados por vírgula"),
         verbose_name=_('Palestrantes')
     )
+    speaker_profiles = models.ManyToManyField(
+        'Speaker',
+        through='EventSpeaker',
+        related_name='events',
+        blank=True,
+        verbose_name=_('Palestrantes cadastrados'),
+    )
     tags = models.ManyToManyField('Tag', blank=True, verbose_name=_('Tags'))
     image = models.ImageField(
         upload_to='event_images/',
@@ -200,10 +411,16 @@ class Event(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, verbose_name=_('Criado em'))
     updated_at = models.DateTimeField(auto_now=True, verbose_name=_('Atualizado em'))
 
+    objects = EventQuerySet.as_manager()
+
     class Meta:
         verbose_name = _('Evento')
         verbose_name_plural = _('Eventos')
         ordering = ['date', 'start_time']
+        indexes = [
+            models.Index(fields=['date', 'start_time'], name='event_date_start_idx'),
+            models.Index(fields=['status', 'date'], name='event_status_date_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -212,14 +429,45 @@ class Event(models.Model):
         if not self.slug:
             self.slug = slugify(self.title)
         super().save(*args, **kwargs)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'speakers' in update_fields:
+            self.sync_speakers()
 
     def get_absolute_url(self):
         return reverse('event_detail', kwargs={'slug': self.slug})
 
+    def get_speaker_names(self):
+        """Nomes digitados no campo de texto ``speakers``, sem repetições."""
+        names = {}
+        for name in (self.speakers or '').split(','):
+            name = name.strip()
+            slug = slugify(name)[:200]
+            if slug:
+                names.setdefault(slug, name)
+        return names
+
+    def sync_speakers(self):
+        """Espelha o campo ``speakers`` nas tabelas Speaker/EventSpeaker."""
+        names = self.get_speaker_names()
+        current = list(self.speaker_links.values_list('speaker__slug', flat=True))
+        if current == list(names):
+            return
+
+        existing = {s.slug: s for s in Speaker.objects.filter(slug__in=names)}
+        missing = [Speaker(name=name, slug=slug) for slug, name in names.items() if slug not in existing]
+        if missing:
+            Speaker.objects.bulk_create(missing, ignore_conflicts=True)
+            existing = {s.slug: s for s in Speaker.objects.filter(slug__in=names)}
+
+        self.speaker_links.all().delete()
+        EventSpeaker.objects.bulk_create([
+            EventSpeaker(event=self, speaker=existing[slug], position=position)
+            for position, slug in enumerate(names)
+        ])
+        getattr(self, '_prefetched_objects_cache', {}).pop('speaker_links', None)
+
     def get_speakers_list(self):
-        if self.speakers:
-            return [speaker.strip() for speaker in self.speakers.split(',') if speaker.strip()]
-        return []
+        return [link.speaker for link in self.speaker_links.all()]
 
     def is_full(self):
         return self.registered >= self.capacity
@@ -227,6 +475,55 @@ class Event(models.Model):
     def spots_remaining(self):
         return max(0, self.capacity - self.registered)
 
+class Speaker(models.Model):
+    """Palestrantes, com página própria listando seus eventos"""
+    name = models.CharField(max_length=200, verbose_name=_('Nome'))
+    slug = models.SlugField(max_length=200, unique=True, verbose_name=_('URL'))
+    bio = models.TextField(blank=True, verbose_name=_('Biografia'))
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name=_('Criado em'))
+
+    class Meta:
+        verbose_name = _('Palestrante')
+        verbose_name_plural = _('Palestrantes')
+        ordering = ['name']
+        indexes = [
+            models.Index(Lower('name'), name='speaker_name_lower_idx'),
+        ]
+
+    def __str__(self):
+        return self.name
+
+    def save(self, *args, **kwargs):
+        if not self.slug:
+            self.slug = slugify(self.name)[:200]
+        super().save(*args, **kwargs)
+
+    def get_absolute_url(self):
+        return reverse('speaker_detail', kwargs={'slug': self.slug})
+
+
+class EventSpeaker(models.Model):
+    """Ligação evento ↔ palestrante, preservando a ordem digitada no evento"""
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='speaker_links')
+    speaker = models.ForeignKey(Speaker, on_delete=models.CASCADE, related_name='event_links')
+    position = models.PositiveSmallIntegerField(default=0, verbose_name=_('Ordem'))
+
+    class Meta:
+        verbose_name = _('Palestrante do evento')
+        verbose_name_plural = _('Palestrantes do evento')
+        ordering = ['position']
+        constraints = [
+            models.UniqueConstraint(fields=['event', 'speaker'], name='event_speaker_unique'),
+        ]
+        indexes = [
+            # Página do palestrante: eventos de um palestrante sem varrer a tabela
+            models.Index(fields=['speaker', 'event'], name='event_speaker_lookup_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.speaker} — {self.event}'
+
+
 class ContactMessage(models.Model):
     """Contact form messages"""
     name = models.CharField(max_length=100, verbose_name=_('Nome'))
@@ -240,6 +537,9 @@ class ContactMessage(models.Model):
         verbose_name = _('Mensagem de Contato')
         verbose_name_plural = _('Mensagens de Contato')
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='contact_created_idx'),
+        ]
 
     def __str__(self):
         # Apenas mostra nome e assunto; não mostra status
@@ -252,7 +552,7 @@ class GalleryGroup(models.Model):
     def __str__(self):
         return self.name
 
-class GalleryImage(models.Model):
+class GalleryImage(ImageMetadataMixin):
     title = models.CharField(max_length=200, verbose_name=_("Título da Imagem"))
     description = models.TextField(blank=True, verbose_name=_("Descrição"))
     image = models.ImageField(upload_to='gallery/', verbose_name=_("Arquivo da Imagem"))
@@ -266,15 +566,101 @@ class GalleryImage(models.Model):
     published = models.BooleanField(default=True, verbose_name=_("Publicado"))
     uploaded_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Data de Upload"))
 
+    # Impressões digitais para detectar uploads repetidos (core.imagehash)
+    content_hash = models.CharField(max_length=64, blank=True, db_index=True, editable=False)
+    phash = models.BigIntegerField(null=True, blank=True, editable=False)
+    phash_band0 = models.PositiveIntegerField(null=True, blank=True, db_index=True, editable=False)
+    phash_band1 = models.PositiveIntegerField(null=True, blank=True, db_index=True, editable=False)
+    phash_band2 = models.PositiveIntegerField(null=True, blank=True, db_index=True, editable=False)
+    phash_band3 = models.PositiveIntegerField(null=True, blank=True, db_index=True, editable=False)
+    near_duplicate_of = models.ForeignKey(
+        'self',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='near_duplicates',
+        verbose_name=_("Possível duplicata de"),
+    )
+
     class Meta:
         verbose_name = _("Imagem da Galeria")
         verbose_name_plural = _("Imagens da Galeria")
         ordering = ['-uploaded_at']
+        indexes = [
+            # Álbum do evento paginado por cursor (uploaded_at, id) — ver GalleryByEventView
+            models.Index(
+                fields=['event', 'published', '-uploaded_at', '-id'], name='gallery_event_album_idx',
+            ),
+            # Listagem geral no /django-admin/ (core.admin.GalleryImageAdmin)
+            models.Index(fields=['-uploaded_at', '-id'], name='gallery_uploaded_idx'),
+        ]
+
+    @classmethod
+    def album_page(cls, event, cursor=None, size=None):
+        """Uma página do álbum do evento e o cursor da próxima (ou None).
+
+        Paginação por cursor (keyset): a página N custa o mesmo que a primeira,
+        sem OFFSET nem COUNT.
+        """
+        size = size or settings.GALLERY_ALBUM_PAGE_SIZE
+        images = cls.objects.filter(event=event, published=True)
+        if cursor is not None:
+            uploaded_at, pk = cursor
+            images = images.filter(
+                models.Q(uploaded_at__lt=uploaded_at) | models.Q(uploaded_at=uploaded_at, pk__lt=pk)
+            )
+        page = list(images.order_by('-uploaded_at', '-pk')[:size + 1])
+        next_cursor = None
+        if len(page) > size:
+            page = page[:size]
+            next_cursor = (page[-1].uploaded_at, page[-1].pk)
+        return page, next_cursor
 
     def __str__(self):
         return self.title
 
-class Project(models.Model):
+    # Nome do arquivo já medido por set_fingerprint (o GalleryImageForm mede o upload no clean)
+    _fingerprint_name = None
+
+    def save(self, *args, **kwargs):
+        # Uploads e trocas de arquivo feitos fora do GalleryImageForm (ex.: /django-admin/) também recebem o hash
+        stale = not self.content_hash or (self.image_changed() and self.image.name != self._fingerprint_name)
+        if self.image and stale:
+            try:
+                self.set_fingerprint(self.image)
+            except OSError:
+                # Melhor sem hash do que com o do arquivo anterior
+                self.content_hash = ''
+                self.phash = self.phash_band0 = self.phash_band1 = self.phash_band2 = self.phash_band3 = None
+        super().save(*args, **kwargs)
+        self._fingerprint_name = None
+
+    def set_fingerprint(self, file):
+        self._fingerprint_name = file.name
+        self.content_hash = imagehash.content_hash(file)
+        value = imagehash.perceptual_hash(file)
+        self.phash = imagehash.to_signed(value)
+        self.phash_band0, self.phash_band1, self.phash_band2, self.phash_band3 = imagehash.hash_bands(value)
+
+    @classmethod
+    def find_similar(cls, phash, max_distance=None, exclude_pk=None):
+        """Imagens com pHash a até ``max_distance`` bits, buscadas pelas faixas indexadas."""
+        if max_distance is None:
+            max_distance = settings.GALLERY_NEAR_DUPLICATE_DISTANCE
+        bands = imagehash.hash_bands(phash)
+        candidates = cls.objects.filter(
+            models.Q(phash_band0=bands[0]) | models.Q(phash_band1=bands[1])
+            | models.Q(phash_band2=bands[2]) | models.Q(phash_band3=bands[3])
+        ).exclude(pk=exclude_pk)
+        similar = []
+        for image in candidates:
+            distance = imagehash.hamming(image.phash, phash)
+            if distance <= max_distance:
+                image.distance = distance
+                similar.append(image)
+        return sorted(similar, key=lambda image: (image.distance, image.pk))
+
+class Project(ImageMetadataMixin):
 
     title = models.CharField( max_length=200, verbose_name=_("Título"))
     description = models.TextField(verbose_name=_("Descrição"))
@@ -320,6 +706,12 @@ class Project(models.Model):
         verbose_name=_("Atualizado em")
     )
 
+    class Meta:
+        indexes = [
+            # Ordem da listagem no /django-admin/ (core.admin.ProjectAdmin)
+            models.Index(fields=['-created_at', '-id'], name='project_created_idx'),
+        ]
+
     def save(self, *args, **kwargs):
         """Gera slug único automaticamente para evitar conflitos."""
         if not self.slug:
@@ -332,5 +724,128 @@ class Project(models.Model):
             self.slug = slug
         super().save(*args, **kwargs)
 
+    def get_absolute_url(self):
+        return reverse('project_detail', kwargs={'slug': self.slug})
+
+    def __str__(self):
+        return self.title
+
+class TrendingItem(models.Model):
+    """Ranking pré-calculado dos conteúdos "em alta".
+
+    A tabela é reconstruída periodicamente pelo comando ``update_trending``;
+    as páginas só leem o topo do ranking pelo índice (kind, rank).
+    """
+    KIND_CHOICES = [
+        ('post', _('Post')),
+        ('event', _('Evento')),
+    ]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES, verbose_name=_('Tipo'))
+    rank = models.PositiveIntegerField(verbose_name=_('Posição'))
+    score = models.FloatField(verbose_name=_('Pontuação'))
+    post = models.ForeignKey(
+        'BlogPost',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name=_('Post')
+    )
+    event = models.ForeignKey(
+        'Event',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name=_('Evento')
+    )
+    computed_at = models.DateTimeField(default=timezone.now, verbose_name=_('Calculado em'))
+
+    class Meta:
+        verbose_name = _('Item em alta')
+        verbose_name_plural = _('Itens em alta')
+        ordering = ['kind', 'rank']
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'rank'], name='trending_kind_rank_uniq'),
+        ]
+
     def __str__(self):
-        return self.title
\ No newline at end of file
+        return f"{self.kind} #{self.rank}"
+
+    @classmethod
+    def top(cls, kind, limit=10):
+        """Retorna os objetos do topo do ranking em uma única consulta."""
+        if kind == 'post':
+            related, visible = 'post', {'post__status': 'published'}
+        else:
+            related, visible = 'event', {'event__status__in': ['upcoming', 'ongoing']}
+        # O filtro de visibilidade descarta itens que mudaram desde o último cálculo
+        items = cls.objects.filter(kind=kind, **visible).select_related(related).order_by('rank')[:limit]
+        return [getattr(item, related) for item in items]
+
+
+class PostLikeSet(models.Model):
+    """Conjunto compacto de quem curtiu um post.
+
+    ``members`` guarda as impressões digitais (64 bits) dos usuários/sessões
+    em um array ordenado, gravado em lote pelo módulo ``core.likes``.
+    """
+    post = models.OneToOneField(
+        'BlogPost',
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='like_set',
+        verbose_name=_('Post')
+    )
+    members = models.BinaryField(default=b'', verbose_name=_('Membros'))
+    # Última operação do diário de curtidas (core.likes) já aplicada: torna a gravação idempotente
+    applied_seq = models.PositiveBigIntegerField(default=0, editable=False, verbose_name=_('Última operação aplicada'))
+    updated_at = models.DateTimeField(auto_now=True, verbose_name=_('Atualizado em'))
+
+    class Meta:
+        verbose_name = _('Curtidas do Post')
+        verbose_name_plural = _('Curtidas dos Posts')
+
+    def __str__(self):
+        return f"Curtidas de {self.post_id}"
+
+
+class RequestProfile(models.Model):
+    """Perfil de uma requisição pedido pela equipe (core.profiling)."""
+
+    MODE_CHOICES = [
+        ('sampling', _('Amostragem (flamegraph)')),
+        ('cprofile', _('Determinístico (cProfile)')),
+    ]
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='request_profiles',
+        verbose_name=_('Solicitado por'),
+    )
+    method = models.CharField(max_length=10, verbose_name=_('Método'))
+    path = models.CharField(max_length=500, verbose_name=_('Caminho'))
+    status_code = models.PositiveSmallIntegerField(verbose_name=_('Status'))
+    mode = models.CharField(max_length=10, choices=MODE_CHOICES, verbose_name=_('Modo'))
+    duration_ms = models.FloatField(verbose_name=_('Duração (ms)'))
+    samples = models.PositiveIntegerField(default=0, verbose_name=_('Amostras'))
+    # Pilhas "dobradas" (flamegraph.pl / speedscope) ou estatísticas do pstats
+    data = models.BinaryField(verbose_name=_('Dados'))
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name=_('Criado em'))
+
+    class Meta:
+        verbose_name = _('Perfil de Requisição')
+        verbose_name_plural = _('Perfis de Requisição')
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.method} {self.path} ({self.duration_ms:.0f} ms)"
+
+    @property
+    def filename(self):
+        extension = 'folded' if self.mode == 'sampling' else 'prof'
+        return f"perfil-{self.pk}.{extension}"
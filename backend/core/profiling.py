@@ -0,0 +1,202 @@
+"""Profiling sob demanda de uma única requisição, para a equipe.
+
+A requisição é perfilada quando traz um token assinado de um usuário da
+equipe, no parâmetro ``?_profile=<token>`` ou no cabeçalho
+``X-Profile-Token``. O token é exibido em /django-admin/ → Perfis de
+Requisição e vale ``PROFILER_TOKEN_MAX_AGE`` segundos. Com o token, dá para
+perfilar também pelo ``curl``, como visitante anônimo.
+
+Modos (``?_profile_mode=``):
+
+* ``sampling`` (padrão): uma thread amostra a pilha da requisição a cada
+  ``PROFILER_INTERVAL`` segundos e grava as pilhas "dobradas", o formato
+  lido por flamegraph.pl e pelo speedscope.
+* ``cprofile``: perfil determinístico (mais lento), em formato pstats, para
+  o snakeviz ou ``python -m pstats``.
+
+O perfil é salvo em ``RequestProfile`` e baixado pelo admin. Requisições sem
+o parâmetro/cabeçalho só pagam uma busca em dicionário.
+
+Em ASGI os dois modos observam só a thread do event loop: o código síncrono
+chamado via ``sync_to_async`` aparece como espera.
+"""
+import cProfile
+import marshal
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import signing
+
+
+QUERY_PARAM = '_profile'
+MODE_PARAM = '_profile_mode'
+HEADER = 'HTTP_X_PROFILE_TOKEN'
+
+_signer = signing.TimestampSigner(salt='core.profiling')
+_PROJECT_DIR = str(settings.BASE_DIR)
+
+
+def make_token(user):
+    return _signer.sign(str(user.pk))
+
+
+def token_user(token):
+    """Usuário da equipe dono do token, ou None se inválido/expirado."""
+    try:
+        user_id = _signer.unsign(token, max_age=settings.PROFILER_TOKEN_MAX_AGE)
+    except signing.BadSignature:
+        return None
+    return get_user_model().objects.filter(pk=user_id, is_staff=True, is_active=True).first()
+
+
+def _frame_label(code):
+    filename = code.co_filename
+    if filename.startswith(_PROJECT_DIR):
+        filename = os.path.relpath(filename, _PROJECT_DIR)
+    else:
+        filename = os.path.basename(filename)
+    return f'{code.co_name} ({filename}:{code.co_firstlineno})'
+
+
+class StackSampler(threading.Thread):
+    """Amostra a pilha de outra thread; o resultado é um Counter de pilhas dobradas."""
+
+    def __init__(self, thread_id, root_code, interval):
+        super().__init__(name='request-profiler', daemon=True)
+        self.thread_id = thread_id
+        self.root_code = root_code
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._done = threading.Event()
+
+    def run(self):
+        while not self._done.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            labels = []
+            # Da função em execução até o middleware de profiling (exclusive)
+            while frame is not None and frame.f_code is not self.root_code:
+                labels.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            # frame None: a thread estava fora da requisição (ex.: event loop atendendo outra)
+            if labels and frame is not None:
+                self.stacks[';'.join(reversed(labels))] += 1
+                self.samples += 1
+
+    def stop(self):
+        self._done.set()
+        self.join()
+
+    def folded(self):
+        return ''.join(f'{stack} {count}\n' for stack, count in self.stacks.most_common()).encode()
+
+
+def _strip_profile_params(request):
+    """Remove o token da query string: não vai para links, chaves de cache nem para o perfil salvo."""
+    query = request.GET.copy()
+    query.pop(QUERY_PARAM, None)
+    query.pop(MODE_PARAM, None)
+    query._mutable = False
+    request.GET = query
+    request.META['QUERY_STRING'] = query.urlencode()
+
+
+class RequestProfilerMiddleware:
+    """Deve ser o primeiro de ``MIDDLEWARE``, para o perfil cobrir toda a pilha."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = request.META.get(HEADER) or request.GET.get(QUERY_PARAM)
+        if not token:
+            return self.get_response(request)
+        user = token_user(token)
+        if user is None:
+            return self.get_response(request)
+        mode = 'cprofile' if request.GET.get(MODE_PARAM) == 'cprofile' else 'sampling'
+        _strip_profile_params(request)
+        return self._profile(request, user, mode)
+
+    async def __acall__(self, request):
+        token = request.META.get(HEADER) or request.GET.get(QUERY_PARAM)
+        if not token:
+            return await self.get_response(request)
+        user = await sync_to_async(token_user)(token)
+        if user is None:
+            return await self.get_response(request)
+        mode = 'cprofile' if request.GET.get(MODE_PARAM) == 'cprofile' else 'sampling'
+        _strip_profile_params(request)
+        return await self._aprofile(request, user, mode)
+
+    def _profile(self, request, user, mode):
+        start = time.perf_counter()
+        if mode == 'cprofile':
+            profiler = cProfile.Profile()
+            response = profiler.runcall(self.get_response, request)
+            profiler.create_stats()
+            data, samples = marshal.dumps(profiler.stats), 0
+        else:
+            sampler = StackSampler(threading.get_ident(), self._profile.__code__, settings.PROFILER_INTERVAL)
+            sampler.start()
+            try:
+                response = self.get_response(request)
+            finally:
+                sampler.stop()
+            data, samples = sampler.folded(), sampler.samples
+        duration_ms = (time.perf_counter() - start) * 1000
+        return self._save(request, user, mode, response, data, samples, duration_ms)
+
+    async def _aprofile(self, request, user, mode):
+        start = time.perf_counter()
+        if mode == 'cprofile':
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                response = await self.get_response(request)
+            finally:
+                profiler.disable()
+            profiler.create_stats()
+            data, samples = marshal.dumps(profiler.stats), 0
+        else:
+            sampler = StackSampler(threading.get_ident(), self._aprofile.__code__, settings.PROFILER_INTERVAL)
+            sampler.start()
+            try:
+                response = await self.get_response(request)
+            finally:
+                await sync_to_async(sampler.stop, thread_sensitive=False)()
+            data, samples = sampler.folded(), sampler.samples
+        duration_ms = (time.perf_counter() - start) * 1000
+        return await sync_to_async(self._save)(request, user, mode, response, data, samples, duration_ms)
+
+    def _save(self, request, user, mode, response, data, samples, duration_ms):
+        from .models import RequestProfile
+
+        profile = RequestProfile.objects.create(
+            user=user,
+            method=request.method,
+            path=request.get_full_path()[:500],
+            status_code=response.status_code,
+            mode=mode,
+            duration_ms=duration_ms,
+            samples=samples,
+            data=data,
+        )
+        # Mantém só os perfis mais recentes
+        stale = RequestProfile.objects.values_list('pk', flat=True)[settings.PROFILER_KEEP:]
+        RequestProfile.objects.filter(pk__in=list(stale)).delete()
+
+        response['X-Profile-Id'] = str(profile.pk)
+        return response
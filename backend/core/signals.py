@@ -0,0 +1,110 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from .content_cache import bump_content_version
+from .models import BlogPost, Category, Event, EventSpeaker, GalleryImage, Project, Speaker, Tag
+
+
+# Inclui os modelos cujos nomes aparecem nas páginas, feeds, facetas e busca de outros
+CONTENT_MODELS = (BlogPost, Event, GalleryImage, Project, Tag, Category, Speaker, EventSpeaker)
+TAGGED_MODELS = (BlogPost, Event, Project)
+TAG_THROUGH_MODELS = tuple(model.tags.through for model in TAGGED_MODELS)
+# Campos que decidem se um objeto entra nos contadores de Category e Tag
+COUNTED_FIELDS = {'status', 'category', 'category_id'}
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def invalidate_content_cache(sender, **kwargs):
+    """Invalida os caches de conteúdo quando algo publicado muda."""
+    if sender in CONTENT_MODELS:
+        if kwargs.get('update_fields') == frozenset({'views'}):
+            # O contador de visualizações não altera o conteúdo exibido nas listagens
+            return
+        # Só depois do COMMIT: antes dele, quem reconstruísse um cache leria as linhas
+        # antigas e as guardaria sob a versão nova
+        transaction.on_commit(bump_content_version)
+
+
+@receiver(m2m_changed)
+def invalidate_content_cache_on_tags(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear') and sender in TAG_THROUGH_MODELS:
+        transaction.on_commit(bump_content_version)
+
+
+# ========================
+# Contadores de Category e Tag (core.models.ContentCountersMixin)
+# ========================
+@receiver(pre_save)
+def remember_counted_state(sender, instance, update_fields=None, raw=False, **kwargs):
+    if sender not in TAGGED_MODELS or raw:
+        return
+    if update_fields is not None and not COUNTED_FIELDS & set(update_fields):
+        # ex.: save(update_fields=['views']) não muda nenhum contador
+        return
+    previous = None
+    if instance.pk is not None:
+        previous = sender.objects.filter(pk=instance.pk).values_list('status', 'category_id').first()
+    instance._counted_state = previous
+
+
+@receiver(post_save)
+def update_counts_on_save(sender, instance, **kwargs):
+    """Publicar, despublicar, cancelar ou trocar a categoria atualiza os contadores afetados."""
+    if sender not in TAGGED_MODELS or '_counted_state' not in instance.__dict__:
+        return
+    previous = instance.__dict__.pop('_counted_state')
+    if previous == (instance.status, instance.category_id):
+        return
+    old_status, old_category_id = previous or (None, None)
+    category_ids = {old_category_id, instance.category_id} - {None}
+    if category_ids:
+        Category.refresh_counts(category_ids)
+    if previous is not None and old_status != instance.status:
+        # Um objeto novo ainda não tem tags; elas chegam pelo m2m_changed
+        tag_ids = set(instance.tags.values_list('pk', flat=True))
+        if tag_ids:
+            Tag.refresh_counts(tag_ids)
+
+
+@receiver(post_delete)
+def update_category_counts_on_delete(sender, instance, **kwargs):
+    if sender in TAGGED_MODELS and instance.category_id is not None:
+        Category.refresh_counts({instance.category_id})
+
+
+@receiver(m2m_changed)
+def update_tag_counts(sender, instance, action, reverse, pk_set, **kwargs):
+    """Mantém os contadores das tags ao alterar as tags de um objeto."""
+    if sender not in TAG_THROUGH_MODELS:
+        return
+    if reverse:
+        # tag.blogpost_set.add(...) etc.: só a própria tag muda
+        tag_ids = {instance.pk}
+    elif action == 'pre_clear':
+        # Depois do clear() não há mais como saber quais tags o objeto tinha
+        instance._cleared_tag_ids = set(instance.tags.values_list('pk', flat=True))
+        return
+    elif action == 'post_clear':
+        tag_ids = instance.__dict__.pop('_cleared_tag_ids', set())
+    else:
+        tag_ids = pk_set
+
+    if action in ('post_add', 'post_remove', 'post_clear') and tag_ids:
+        Tag.refresh_counts(tag_ids)
+
+
+@receiver(pre_delete)
+def remember_deleted_tags(sender, instance, **kwargs):
+    # A exclusão em cascata da tabela de ligação não dispara m2m_changed
+    if sender in TAGGED_MODELS:
+        instance._deleted_tag_ids = set(instance.tags.values_list('pk', flat=True))
+
+
+@receiver(post_delete)
+def update_tag_counts_on_delete(sender, instance, **kwargs):
+    if sender in TAGGED_MODELS:
+        tag_ids = instance.__dict__.pop('_deleted_tag_ids', None)
+        if tag_ids:
+            Tag.refresh_counts(tag_ids)
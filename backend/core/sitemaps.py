@@ -0,0 +1,100 @@
+"""Sitemaps do site público.
+
+Cada seção lê só ``values()`` (slug e updated_at), sem instanciar modelos.
+O framework do Django já divide cada seção em páginas de 50.000 URLs
+(``?p=2``...), referenciadas pelo índice ``/sitemap.xml``.
+"""
+from django.contrib.sitemaps import Sitemap
+from django.db.models import Q
+from django.urls import reverse
+
+from .models import BlogPost, Event, Project, Speaker, Tag
+
+
+class StaticViewSitemap(Sitemap):
+    changefreq = 'weekly'
+    priority = 0.8
+
+    def items(self):
+        return [
+            'home', 'sobre', 'blog', 'eventos', 'calendario_eventos',
+            'project_list', 'galeria', 'speaker_list', 'tag_cloud', 'contato',
+        ]
+
+    def location(self, item):
+        return reverse(item)
+
+
+class ValuesSitemap(Sitemap):
+    """Sitemap de um modelo com slug, lido via ``values()``.
+
+    As subclasses definem ``url_name`` e ``get_queryset()``.
+    """
+    lastmod_field = 'updated_at'
+
+    def items(self):
+        fields = ['slug'] + ([self.lastmod_field] if self.lastmod_field else [])
+        return self.get_queryset().order_by('pk').values(*fields)
+
+    def location(self, item):
+        return reverse(self.url_name, kwargs={'slug': item['slug']})
+
+    def lastmod(self, item):
+        return item[self.lastmod_field] if self.lastmod_field else None
+
+
+class BlogPostSitemap(ValuesSitemap):
+    changefreq = 'monthly'
+    priority = 0.7
+    url_name = 'blog_detail'
+
+    def get_queryset(self):
+        return BlogPost.objects.filter(status='published')
+
+
+class EventSitemap(ValuesSitemap):
+    changefreq = 'weekly'
+    priority = 0.7
+    url_name = 'event_detail'
+
+    def get_queryset(self):
+        return Event.objects.exclude(status='cancelled')
+
+
+class ProjectSitemap(ValuesSitemap):
+    changefreq = 'monthly'
+    priority = 0.6
+    url_name = 'project_detail'
+
+    def get_queryset(self):
+        return Project.objects.filter(status=True)
+
+
+class SpeakerSitemap(ValuesSitemap):
+    changefreq = 'monthly'
+    priority = 0.4
+    url_name = 'speaker_detail'
+    lastmod_field = None
+
+    def get_queryset(self):
+        return Speaker.objects.all()
+
+
+class TagSitemap(ValuesSitemap):
+    changefreq = 'weekly'
+    priority = 0.4
+    url_name = 'tag_detail'
+    lastmod_field = None
+
+    def get_queryset(self):
+        return Tag.objects.filter(Q(post_count__gt=0) | Q(event_count__gt=0) | Q(project_count__gt=0))
+
+
+sitemaps = {
+    'paginas': StaticViewSitemap,
+    'blog': BlogPostSitemap,
+    'eventos': EventSitemap,
+    'projetos': ProjectSitemap,
+    'palestrantes': SpeakerSitemap,
+    'tags': TagSitemap,
+}
@@ -0,0 +1,163 @@
+"""Log de consultas lentas com o plano de execução.
+
+Toda conexão recebe um ``execute_wrapper`` (sinal ``connection_created``).
+Consultas acima de ``SLOW_QUERY_MS`` são gravadas, uma por linha em JSON, no
+logger ``neabi.slow_queries`` (arquivo rotativo ``SLOW_QUERY_LOG_FILE``) com:
+
+* o SQL (com ``%s`` no lugar dos parâmetros, que não são gravados);
+* o plano: ``EXPLAIN QUERY PLAN`` no SQLite; no PostgreSQL ``EXPLAIN``, ou
+  ``EXPLAIN ANALYZE`` em uma amostra das consultas (a consulta roda de novo);
+* a view e a URL de origem (``SlowQueryContextMiddleware``);
+* as últimas chamadas do código do projeto que levaram à consulta.
+
+O comando ``slow_queries`` resume o arquivo pelos SQLs de maior tempo total.
+"""
+import contextvars
+import json
+import logging
+import os
+import random
+import time
+import traceback
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.utils import timezone
+
+
+logger = logging.getLogger('neabi.slow_queries')
+
+STACK_DEPTH = 6
+EXPLAINABLE = ('SELECT', 'WITH')
+
+_request_context = contextvars.ContextVar('slow_query_request', default=None)
+_explaining = contextvars.ContextVar('slow_query_explaining', default=False)
+
+_PROJECT_DIR = str(settings.BASE_DIR)
+# Instrumentação (execute_wrappers) e middlewares do projeto estão em toda
+# pilha e esconderiam o código que de fato fez a consulta
+_SKIP_FILES = {
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), name)
+    for name in ('slowlog.py', 'metrics.py', 'profiling.py', 'db_router.py', 'middleware.py')
+}
+
+
+def _stack_summary():
+    frames = []
+    for frame in traceback.extract_stack()[:-1]:
+        filename = os.path.abspath(frame.filename)
+        if not filename.startswith(_PROJECT_DIR) or filename in _SKIP_FILES or 'site-packages' in filename:
+            continue
+        frames.append(f'{os.path.relpath(filename, _PROJECT_DIR)}:{frame.lineno} {frame.name}')
+    return frames[-STACK_DEPTH:]
+
+
+def _explain(connection, sql, params):
+    """Plano da consulta em texto, ou None quando não dá para obtê-lo."""
+    if not sql.lstrip().upper().startswith(EXPLAINABLE):
+        return None
+    if connection.vendor == 'sqlite':
+        prefix = 'EXPLAIN QUERY PLAN '
+    elif connection.vendor == 'postgresql':
+        analyze = random.random() < settings.SLOW_QUERY_EXPLAIN_ANALYZE_RATE
+        prefix = 'EXPLAIN (ANALYZE, BUFFERS) ' if analyze else 'EXPLAIN '
+    else:
+        prefix = 'EXPLAIN '
+
+    token = _explaining.set(True)
+    try:
+        # Savepoint: no PostgreSQL um EXPLAIN que falha abortaria a transação da requisição
+        with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+            cursor.execute(prefix + sql, params)
+            rows = cursor.fetchall()
+    except Exception as exc:  # o log nunca pode derrubar a requisição
+        return f'(EXPLAIN falhou: {exc})'
+    finally:
+        _explaining.reset(token)
+
+    if connection.vendor == 'sqlite':
+        # (id, parent, notused, detail)
+        return '\n'.join(row[-1] for row in rows)
+    return '\n'.join(str(row[0]) for row in rows)
+
+
+class SlowQueryLogger:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        result = execute(sql, params, many, context)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if elapsed_ms >= settings.SLOW_QUERY_MS and not _explaining.get():
+            self.log(sql, params, many, elapsed_ms)
+        return result
+
+    def log(self, sql, params, many, elapsed_ms):
+        entry = {
+            'ts': timezone.now().isoformat(),
+            'ms': round(elapsed_ms, 2),
+            'db': self.connection.alias,
+            'sql': sql,
+            'many': many,
+            'plan': None if many else _explain(self.connection, sql, params),
+            'stack': _stack_summary(),
+        }
+        entry.update(_request_context.get() or {})
+        logger.warning(json.dumps(entry, ensure_ascii=False))
+
+
+def install(sender, connection, **kwargs):
+    # connection_created dispara de novo a cada reconexão do mesmo DatabaseWrapper
+    if not any(isinstance(wrapper, SlowQueryLogger) for wrapper in connection.execute_wrappers):
+        connection.execute_wrappers.append(SlowQueryLogger(connection))
+
+
+def setup():
+    """Chamado em CoreConfig.ready()."""
+    if not settings.SLOW_QUERY_MS:
+        return
+    os.makedirs(os.path.dirname(settings.SLOW_QUERY_LOG_FILE), exist_ok=True)
+    connection_created.connect(install, dispatch_uid='core.slowlog.install')
+
+
+class SlowQueryContextMiddleware:
+    """Anota a view e a URL nas consultas lentas da requisição."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.SLOW_QUERY_MS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = _request_context.set(self._context(request))
+        try:
+            return self.get_response(request)
+        finally:
+            _request_context.reset(token)
+
+    async def __acall__(self, request):
+        # O ContextVar acompanha as consultas feitas via sync_to_async
+        token = _request_context.set(self._context(request))
+        try:
+            return await self.get_response(request)
+        finally:
+            _request_context.reset(token)
+
+    def _context(self, request):
+        return {'method': request.method, 'path': request.path, 'view': None}
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        context = _request_context.get()
+        if context is not None:
+            context['view'] = request.resolver_match.view_name
@@ -0,0 +1,66 @@
+"""Armazenamento de mídia endereçado pelo conteúdo.
+
+Cada upload é gravado como ``blobs/ab/cd/<sha256>.<ext>``: o nome é o
+SHA-256 dos bytes, então o mesmo arquivo enviado duas vezes (em posts,
+eventos, projetos ou na galeria) ocupa um único blob. Os dois níveis de
+subpastas (65.536 diretórios) mantêm cada diretório pequeno mesmo com
+milhões de arquivos.
+
+Como um blob pode ser compartilhado por vários registros, nada é apagado
+ao excluir ou trocar uma imagem: o comando ``collect_media`` remove, de
+tempos em tempos, os arquivos que nenhum registro referencia.
+
+Arquivos enviados antes da troca de storage continuam com o nome antigo e
+funcionam normalmente.
+"""
+import hashlib
+import os
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+
+
+BLOB_PREFIX = 'blobs'
+
+
+def content_name(content, name):
+    """Nome do blob para ``content``; a extensão vem do nome original."""
+    digest = hashlib.sha256()
+    if hasattr(content, 'seek'):
+        content.seek(0)
+    for chunk in content.chunks():
+        digest.update(chunk)
+    if hasattr(content, 'seek'):
+        content.seek(0)
+    hexdigest = digest.hexdigest()
+    extension = os.path.splitext(name)[1].lower()
+    return f'{BLOB_PREFIX}/{hexdigest[:2]}/{hexdigest[2:4]}/{hexdigest}{extension}'
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    def __init__(self, *args, allow_overwrite=True, **kwargs):
+        # Dois uploads idênticos em paralelo gravam o mesmo blob: sobrescrever é seguro
+        super().__init__(*args, allow_overwrite=allow_overwrite, **kwargs)
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+        name = content_name(content, name)
+        # Mesmo conteúdo já gravado: só reaproveita o nome. Renovar a data de
+        # modificação impede que o collect_media apague um blob órfão que
+        # acabou de voltar a ser usado (ele ignora arquivos recentes).
+        if self.exists(name):
+            try:
+                os.utime(self.path(name))
+                return name
+            except FileNotFoundError:
+                # Apagado pelo collect_media entre as duas chamadas: grava de novo
+                pass
+        return super().save(name, content, max_length=max_length)
+
+    def get_available_name(self, name, max_length=None):
+        # O nome é o próprio conteúdo: nunca ganha sufixo (foto_aB3xYz1.jpg), nem
+        # quando dois uploads idênticos chegam juntos
+        return name
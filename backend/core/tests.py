@@ -0,0 +1,576 @@
+import json
+import os
+import runpy
+import shutil
+import tempfile
+from datetime import timedelta
+from io import BytesIO, StringIO
+from unittest import mock
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.contrib.auth.tokens import default_token_generator
+from django.core.cache import cache, caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import AsyncClient, SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+
+from . import content_cache, db_router, imagehash, imagemeta, likes, metrics, slowlog, warmup
+from .db_router import ReplicaRoutingMiddleware
+from .profiling import RequestProfilerMiddleware
+from .slowlog import SlowQueryContextMiddleware
+from .storage import ContentAddressedStorage
+from .models import BlogPost, Category, Event, EventSpeaker, GalleryImage, PostLikeSet, Speaker, Tag, User
+
+
+class LikesTests(TestCase):
+    def setUp(self):
+        caches['likes'].clear()
+        # Sem gravação automática: cada teste chama flush_pending_likes()
+        caches['likes'].add(likes.FLUSH_KEY, 1, timeout=None)
+        category = Category.objects.create(name='Geral')
+        self.post = BlogPost.objects.create(
+            title='Post', slug='post', excerpt='-', content='-', category=category, likes=10,
+        )
+
+    def reload(self):
+        return BlogPost.objects.get(pk=self.post.pk)
+
+    def test_like_adds_to_existing_count(self):
+        liked, count = likes.toggle_like(self.post, 1)
+        self.assertTrue(liked)
+        self.assertEqual(count, 11)
+        likes.flush_pending_likes()
+        self.assertEqual(self.reload().likes, 11)
+        self.assertEqual(likes.get_like_count(self.reload()), 11)
+
+    def test_toggle_twice_unlikes(self):
+        likes.toggle_like(self.post, 1)
+        liked, count = likes.toggle_like(self.post, 1)
+        self.assertFalse(liked)
+        self.assertEqual(count, 10)
+        likes.flush_pending_likes()
+        self.assertEqual(self.reload().likes, 10)
+
+    def test_flush_keeps_admin_edits(self):
+        likes.toggle_like(self.post, 1)
+        likes.toggle_like(self.post, 2)
+        BlogPost.objects.filter(pk=self.post.pk).update(likes=100)
+        likes.flush_pending_likes()
+        self.assertEqual(self.reload().likes, 102)
+
+    def test_membership_survives_cache_loss(self):
+        likes.toggle_like(self.post, 1)
+        likes.flush_pending_likes()
+        caches['likes'].clear()
+        post = self.reload()
+        self.assertTrue(likes.has_liked(post, 1))
+        liked, count = likes.toggle_like(post, 1)
+        self.assertFalse(liked)
+        self.assertEqual(count, 10)
+        likes.flush_pending_likes()
+        self.assertEqual(self.reload().likes, 10)
+
+    def test_repeated_like_after_lost_state_counts_once(self):
+        likes.toggle_like(self.post, 1)
+        # Estado da pessoa descartado antes da gravação: o segundo "curtir" é duplicado
+        caches['likes'].delete(likes._state_key(self.post.pk, 1))
+        likes.toggle_like(self.post, 1)
+        likes.flush_pending_likes()
+        self.assertEqual(self.reload().likes, 11)
+        self.assertEqual(likes.get_like_count(self.reload()), 11)
+
+    def test_flush_is_idempotent(self):
+        likes.toggle_like(self.post, 1)
+        likes.flush_pending_likes()
+        self.assertEqual(PostLikeSet.objects.get(post=self.post).applied_seq, 1)
+        # Gravação repetida (ex.: o worker morreu antes de limpar o diário)
+        likes._mark_dirty(self.post.pk)
+        self.assertEqual(likes.flush_pending_likes(), 0)
+        self.assertEqual(self.reload().likes, 11)
+
+    def test_crash_after_flush_commit_does_not_inflate_count(self):
+        likes.toggle_like(self.post, 1)
+        # O worker morre logo depois do COMMIT: a limpeza do cache não acontece
+        with mock.patch.object(caches['likes'], 'delete_many', side_effect=SystemExit):
+            with self.assertRaises(SystemExit):
+                likes.flush_pending_likes()
+        self.assertEqual(self.reload().likes, 11)
+        self.assertEqual(likes.get_like_count(self.reload()), 11)
+        likes._mark_dirty(self.post.pk)
+        likes.flush_pending_likes()
+        self.assertEqual(likes.get_like_count(self.reload()), 11)
+
+    def test_lock_is_not_released_by_another_owner(self):
+        cache = caches['likes']
+        cache.set('lock:x', 'outro', timeout=60)
+        with mock.patch.object(likes, 'LOCK_TIMEOUT', 0.01):
+            with likes._lock('x'):
+                pass
+        self.assertEqual(cache.get('lock:x'), 'outro')
+
+
+# Páginas renderizadas nos testes não dependem do manifest do collectstatic
+PAGE_STORAGES = dict(settings.STORAGES, staticfiles={'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'})
+
+
+@override_settings(STORAGES=PAGE_STORAGES)
+class AnonymousSessionTests(TestCase):
+    def test_password_reset_link_keeps_session(self):
+        user = User.objects.create_user('pessoa', 'pessoa@example.com', 'senha-antiga-123')
+        uid = urlsafe_base64_encode(force_bytes(user.pk))
+        token = default_token_generator.make_token(user)
+        response = self.client.get(f'/reset/{uid}/{token}/', follow=True)
+        self.assertTrue(response.context['validlink'])
+
+    def test_anonymous_read_sets_no_session_cookie(self):
+        response = self.client.get('/blog/')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn(settings.SESSION_COOKIE_NAME, response.cookies)
+
+
+@override_settings(STORAGES=PAGE_STORAGES)
+class ConditionalDetailTests(TestCase):
+    def test_pending_message_bypasses_not_modified(self):
+        event = Event.objects.create(
+            title='Roda de conversa', slug='roda', description='-', date=timezone.localdate() + timedelta(days=7),
+            start_time='19:00', end_time='21:00', location='Campus', capacity=10, organizer='NEABI',
+            registration_required=False,
+        )
+        etag = self.client.get(f'/eventos/{event.slug}/')['ETag']
+        response = self.client.get(f'/eventos/{event.slug}/register/', HTTP_IF_NONE_MATCH=etag, follow=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Este evento não requer inscrição.')
+        # Mensagem exibida: a página volta a responder 304
+        self.assertEqual(self.client.get(f'/eventos/{event.slug}/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_renamed_speaker_changes_the_event_etag(self):
+        event = Event.objects.create(
+            title='Palestra', slug='palestra', description='-', date=timezone.localdate() + timedelta(days=7),
+            start_time='19:00', end_time='21:00', location='Campus', capacity=10, organizer='NEABI',
+        )
+        speaker = Speaker.objects.create(name='Ana', slug='ana')
+        EventSpeaker.objects.create(event=event, speaker=speaker)
+        etag = self.client.get(f'/eventos/{event.slug}/')['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            speaker.name = 'Ana Maria'
+            speaker.save()
+        response = self.client.get(f'/eventos/{event.slug}/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Ana Maria')
+
+    def test_flushed_like_changes_the_etag(self):
+        caches['likes'].clear()
+        caches['likes'].add(likes.FLUSH_KEY, 1, timeout=None)
+        category = Category.objects.create(name='Geral')
+        author = User.objects.create_user('autora', 'autora@example.com', 'senha-123-abc')
+        post = BlogPost.objects.create(
+            title='Post', slug='post', excerpt='-', content='-', category=category, author=author, likes=10,
+        )
+        etag = self.client.get('/blog/post/')['ETag']
+        likes.toggle_like(post, 1)
+        likes.flush_pending_likes()
+        response = self.client.get('/blog/post/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['like_count'], 11)
+
+
+@override_settings(METRICS_ENABLED=True, SLOW_QUERY_MS=1000, DATABASE_REPLICAS=['default'])
+class AsyncMiddlewareTests(TestCase):
+    MIDDLEWARE = (
+        metrics.RequestMetricsMiddleware,
+        SlowQueryContextMiddleware,
+        ReplicaRoutingMiddleware,
+        RequestProfilerMiddleware,
+    )
+
+    def test_async_chain_stays_async(self):
+        async def get_response(request):
+            return None
+
+        for middleware in self.MIDDLEWARE:
+            with self.subTest(middleware=middleware.__name__):
+                self.assertTrue(middleware.sync_capable and middleware.async_capable)
+                self.assertTrue(iscoroutinefunction(middleware(get_response)))
+                self.assertFalse(iscoroutinefunction(middleware(lambda request: None)))
+
+    def test_full_asgi_stack_is_never_adapted_to_sync(self):
+        from django.core.handlers.asgi import ASGIHandler
+        from django.core.handlers.base import BaseHandler
+
+        # MIDDLEWARE como o settings monta quando carregado pelo asgi.py
+        with mock.patch.dict(os.environ, {'NEABI_ASGI': '1'}):
+            asgi_settings = runpy.run_module('neabi_django.settings')
+        adapted = []
+        adapt = BaseHandler.adapt_method_mode
+
+        def record(handler, is_async, method, method_is_async=None, debug=False, name=None):
+            if method_is_async is None:
+                method_is_async = iscoroutinefunction(method)
+            if name and is_async != method_is_async:
+                adapted.append(name)
+            return adapt(handler, is_async, method, method_is_async, debug, name)
+
+        with override_settings(MIDDLEWARE=asgi_settings['MIDDLEWARE']), \
+                mock.patch.object(BaseHandler, 'adapt_method_mode', record):
+            ASGIHandler()
+        self.assertEqual(adapted, [])
+
+    async def test_async_view_queries_are_measured(self):
+        metrics.registry.queries.pop('/api/eventos/', None)
+        with self.modify_settings(MIDDLEWARE={'remove': 'core.db_router.ReplicaRoutingMiddleware'}):
+            response = await AsyncClient().get('/api/eventos/')
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(metrics.registry.queries['/api/eventos/'], 0)
+
+
+class ContentCacheTests(TestCase):
+    def test_unused_query_params_share_the_cache_entry(self):
+        cache.clear()
+        with mock.patch.object(cache, 'set', wraps=cache.set) as cache_set:
+            for url in ('/sitemap-blog.xml?utm=1', '/sitemap-blog.xml?utm=2', '/sitemap-blog.xml?p=1'):
+                self.assertEqual(self.client.get(url).status_code, 200)
+        keys = {call.args[0] for call in cache_set.call_args_list if call.args[0].startswith('view:sitemap:')}
+        self.assertEqual(len(keys), 2)
+
+
+def make_upload(name, color):
+    from PIL import Image
+
+    buffer = BytesIO()
+    Image.new('RGB', (32, 24), color).save(buffer, 'PNG')
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/png')
+
+
+class TempMediaTestCase(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+
+
+class GalleryFingerprintTests(TempMediaTestCase):
+
+    def test_replaced_file_gets_new_fingerprint(self):
+        image = GalleryImage.objects.create(title='Foto', image=make_upload('a.png', 'red'))
+        old_hash = image.content_hash
+        self.assertTrue(old_hash)
+
+        image = GalleryImage.objects.get(pk=image.pk)
+        image.image = make_upload('b.png', 'blue')
+        image.save()
+        self.assertNotEqual(GalleryImage.objects.get(pk=image.pk).content_hash, old_hash)
+
+    def test_unchanged_file_is_not_hashed_again(self):
+        image = GalleryImage.objects.create(title='Foto', image=make_upload('a.png', 'red'))
+        image = GalleryImage.objects.get(pk=image.pk)
+        image.title = 'Outra'
+        with mock.patch.object(imagehash, 'content_hash') as content_hash:
+            image.save()
+        content_hash.assert_not_called()
+
+
+class ImageMetadataTests(TempMediaTestCase):
+    def setUp(self):
+        super().setUp()
+        image = GalleryImage.objects.create(title='Foto', image=make_upload('a.png', 'red'))
+        GalleryImage.objects.filter(pk=image.pk).update(image_width=None, image_height=None, image_placeholder='')
+        self.image = GalleryImage.objects.get(pk=image.pk)
+
+    def test_save_without_metadata_does_not_open_file(self):
+        self.image.title = 'Outra'
+        with mock.patch.object(imagemeta, 'extract') as extract:
+            self.image.save()
+        extract.assert_not_called()
+
+    def test_command_fills_missing_metadata(self):
+        call_command('image_metadata', model=['galeria'], workers=1, stdout=StringIO(), stderr=StringIO())
+        self.image.refresh_from_db()
+        self.assertEqual((self.image.image_width, self.image.image_height), (32, 24))
+        self.assertTrue(self.image.image_placeholder.startswith('data:image/webp'))
+
+
+class ContentAddressedStorageTests(TempMediaTestCase):
+    def test_identical_uploads_share_one_blob(self):
+        storage = ContentAddressedStorage()
+        first = storage.save('a.png', make_upload('a.png', 'red'))
+        second = storage.save('b.png', make_upload('b.png', 'red'))
+        self.assertEqual(first, second)
+        self.assertTrue(first.startswith('blobs/'))
+
+    def test_race_past_exists_keeps_content_name(self):
+        storage = ContentAddressedStorage()
+        name = storage.save('a.png', make_upload('a.png', 'red'))
+        # O outro upload idêntico terminou entre exists() e a gravação
+        with mock.patch.object(storage, 'exists', return_value=False):
+            self.assertEqual(storage.save('b.png', make_upload('b.png', 'red')), name)
+        self.assertEqual(os.listdir(os.path.dirname(storage.path(name))), [os.path.basename(name)])
+
+
+class CollectMediaTests(TempMediaTestCase):
+    def setUp(self):
+        super().setUp()
+        self.kept = GalleryImage.objects.create(title='Foto', image=make_upload('a.png', 'red')).image.name
+        self.orphan = self.write_file('blobs/00/00/orfao.png', age_hours=48)
+
+    def write_file(self, name, age_hours):
+        path = os.path.join(settings.MEDIA_ROOT, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(b'x')
+        mtime = timezone.now().timestamp() - age_hours * 3600
+        os.utime(path, (mtime, mtime))
+        return path
+
+    def collect(self, **options):
+        call_command('collect_media', stdout=StringIO(), **options)
+
+    def test_old_orphan_is_deleted_and_referenced_blob_kept(self):
+        path = os.path.join(settings.MEDIA_ROOT, self.kept)
+        os.utime(path, (0, 0))
+        self.collect()
+        self.assertFalse(os.path.exists(self.orphan))
+        self.assertTrue(os.path.exists(path))
+
+    def test_legacy_upload_to_path_is_kept(self):
+        path = self.write_file('gallery/antiga.png', age_hours=48)
+        image = GalleryImage.objects.create(title='Antiga', image=make_upload('b.png', 'blue'))
+        GalleryImage.objects.filter(pk=image.pk).update(image='gallery/antiga.png')
+        self.collect()
+        self.assertTrue(os.path.exists(path))
+
+    def test_recent_file_is_protected_by_min_age(self):
+        recent = self.write_file('blobs/00/00/recente.png', age_hours=1)
+        self.collect(min_age=2)
+        self.assertTrue(os.path.exists(recent))
+        self.assertFalse(os.path.exists(self.orphan))
+
+    def test_dry_run_deletes_nothing(self):
+        self.collect(dry_run=True)
+        self.assertTrue(os.path.exists(self.orphan))
+
+    def test_blob_reused_during_sweep_is_kept(self):
+        rename = os.rename
+
+        def reuse_then_rename(src, dst):
+            # Upload idêntico renova a data entre o stat da varredura e a remoção
+            os.utime(src)
+            rename(src, dst)
+
+        with mock.patch('os.rename', side_effect=reuse_then_rename):
+            self.collect()
+        self.assertTrue(os.path.exists(self.orphan))
+        self.assertEqual(os.listdir(os.path.dirname(self.orphan)), ['orfao.png'])
+
+
+class WarmupTests(SimpleTestCase):
+    def test_templates_include_app_directories(self):
+        from django.template import engines
+
+        with mock.patch.object(engines['django'], 'get_template') as get_template:
+            warmup._templates()
+        names = {call.args[0] for call in get_template.call_args_list}
+        self.assertIn('admin/base.html', names)
+        self.assertIn('bootstrap5/field.html', names)
+
+    def test_skipped_steps_do_not_run(self):
+        database = mock.Mock(return_value='')
+        with mock.patch.object(warmup, 'STEPS', [('banco', database)]):
+            self.assertEqual(warmup.warm_up(skip=('banco',)), [])
+        database.assert_not_called()
+
+
+class GalleryAlbumJsonTests(TestCase):
+    def test_unknown_event_returns_json_404(self):
+        response = self.client.get('/api/galeria/evento/999/')
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json(), {'error': 'evento não encontrado'})
+
+
+@override_settings(SLOW_QUERY_MS=0)
+class SlowQueryLogTests(TestCase):
+    def test_stack_points_at_the_caller_not_the_instrumentation(self):
+        timing_token = metrics._current.set(metrics.RequestTiming())
+        self.addCleanup(metrics._current.reset, timing_token)
+        with mock.patch.object(slowlog.logger, 'warning') as warning:
+            with connection.execute_wrapper(metrics._timed_execute), \
+                    connection.execute_wrapper(slowlog.SlowQueryLogger(connection)):
+                list(Category.objects.all())
+        entry = json.loads(warning.call_args.args[0])
+        self.assertTrue(entry['stack'][-1].startswith('core/tests.py:'))
+        self.assertFalse([frame for frame in entry['stack'] if frame.startswith('core/metrics.py')])
+
+    def test_failed_explain_keeps_the_transaction_usable(self):
+        with transaction.atomic():
+            plan = slowlog._explain(connection, 'SELECT * FROM tabela_inexistente', None)
+            self.assertTrue(plan.startswith('(EXPLAIN falhou'))
+            self.assertEqual(Category.objects.count(), 0)
+
+
+class ReplicaRoutingTests(SimpleTestCase):
+    @override_settings(DATABASE_REPLICAS=['replica'])
+    def test_use_primary_overrides_replica_reads(self):
+        router = db_router.PrimaryReplicaRouter()
+        token = db_router._replica_reads.set(True)
+        self.addCleanup(db_router._replica_reads.reset, token)
+        self.assertEqual(router.db_for_read(BlogPost), 'replica')
+        with db_router.use_primary():
+            self.assertEqual(router.db_for_read(BlogPost), 'default')
+        self.assertEqual(router.db_for_read(BlogPost), 'replica')
+
+    def test_admin_message_routes_read_from_primary(self):
+        from django.urls import reverse
+
+        for path in (reverse('admin_messages_view'), reverse('admin_message_detail', args=[1])):
+            self.assertTrue(path.startswith(settings.DATABASE_PRIMARY_PATHS), path)
+
+
+@override_settings(STORAGES=PAGE_STORAGES, DATABASE_REPLICAS=['default'])
+class EventRegisterTests(TestCase):
+    def test_register_increments_without_overwriting_the_event(self):
+        event = Event.objects.create(
+            title='Oficina', slug='oficina', description='-', date=timezone.localdate() + timedelta(days=7),
+            start_time='19:00', end_time='21:00', location='Campus', capacity=10, organizer='NEABI',
+            registration_required=True,
+        )
+        # Edição feita no admin enquanto a inscrição lia uma cópia antiga
+        with mock.patch.object(Event, 'save', side_effect=AssertionError('save() regrava o evento inteiro')):
+            Event.objects.filter(pk=event.pk).update(title='Oficina (sala 2)')
+            response = self.client.get(f'/eventos/{event.slug}/register/')
+        self.assertEqual(response.status_code, 302)
+        self.assertIn(settings.DATABASE_STICKY_COOKIE, response.cookies)
+        event.refresh_from_db()
+        self.assertEqual((event.registered, event.title), (1, 'Oficina (sala 2)'))
+
+
+class ContentVersionTests(TestCase):
+    def test_version_changes_only_after_commit(self):
+        before = content_cache.get_content_version()
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            Category.objects.create(name='Geral')
+            # Ainda dentro da transação: quem reconstruir um cache agora usa a versão antiga
+            self.assertEqual(content_cache.get_content_version(), before)
+        self.assertTrue(callbacks)
+        self.assertNotEqual(content_cache.get_content_version(), before)
+
+    def test_renaming_a_speaker_bumps_the_version(self):
+        speaker = Speaker.objects.create(name='Ana', slug='ana')
+        before = content_cache.get_content_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            speaker.name = 'Ana Maria'
+            speaker.save()
+        self.assertNotEqual(content_cache.get_content_version(), before)
+
+
+@override_settings(STORAGES=PAGE_STORAGES)
+class ContentCounterTests(TestCase):
+    def setUp(self):
+        self.geral = Category.objects.create(name='Geral')
+        self.outra = Category.objects.create(name='Outra')
+        self.tag = Tag.objects.create(name='Racismo')
+
+    def counts(self, obj):
+        obj.refresh_from_db()
+        return obj.post_count, obj.event_count
+
+    def create_event(self, **fields):
+        fields = {
+            'title': 'Roda de conversa', 'slug': 'roda', 'description': '-', 'date': timezone.localdate(),
+            'start_time': '19:00', 'end_time': '21:00', 'location': 'Campus', 'capacity': 10,
+            'organizer': 'NEABI', 'registration_required': False, 'category': self.geral, **fields,
+        }
+        return Event.objects.create(**fields)
+
+    def test_publishing_a_post_counts_it(self):
+        post = BlogPost.objects.create(
+            title='Post', slug='post', excerpt='-', content='-', category=self.geral, status='draft',
+        )
+        post.tags.add(self.tag)
+        self.assertEqual((self.counts(self.geral), self.counts(self.tag)), ((0, 0), (0, 0)))
+        post.status = 'published'
+        post.save()
+        self.assertEqual((self.counts(self.geral), self.counts(self.tag)), ((1, 0), (1, 0)))
+
+    def test_recategorizing_moves_the_count(self):
+        event = self.create_event()
+        event.category = self.outra
+        event.save()
+        self.assertEqual((self.counts(self.geral), self.counts(self.outra)), ((0, 0), (0, 1)))
+
+    def test_retagging_moves_the_count(self):
+        event = self.create_event()
+        event.tags.add(self.tag)
+        outra = Tag.objects.create(name='Cultura')
+        event.tags.set([outra])
+        self.assertEqual((self.counts(self.tag), self.counts(outra)), ((0, 0), (0, 1)))
+        event.tags.clear()
+        self.assertEqual(self.counts(outra), (0, 0))
+
+    def test_deleting_removes_the_count(self):
+        event = self.create_event()
+        event.tags.add(self.tag)
+        event.delete()
+        self.assertEqual((self.counts(self.geral), self.counts(self.tag)), ((0, 0), (0, 0)))
+
+    def test_event_count_matches_the_tag_page(self):
+        for slug, status in (('proximo', 'upcoming'), ('agora', 'ongoing'), ('fim', 'completed'), ('nao', 'cancelled')):
+            self.create_event(slug=slug, status=status).tags.add(self.tag)
+        self.assertEqual(self.counts(self.tag), (0, 3))
+        response = self.client.get(f'/tags/{self.tag.slug}/')
+        self.assertEqual(len(response.context['page_obj'].object_list), 3)
+
+        event = Event.objects.get(slug='proximo')
+        event.status = 'cancelled'
+        event.save()
+        self.assertEqual((self.counts(self.geral), self.counts(self.tag)), ((0, 2), (0, 2)))
+
+
+class StaticCacheTests(SimpleTestCase):
+    def test_vite_and_manifest_hashes_are_immutable(self):
+        from whitenoise.middleware import WhiteNoiseMiddleware
+
+        test = WhiteNoiseMiddleware(lambda request: None).immutable_file_test
+        self.assertTrue(test('', '/static/spa/assets/index-BQ3_kz-a.js'))
+        self.assertTrue(test('', '/static/css/tailwind.4f2a9c1b0d3e.css'))
+        self.assertFalse(test('', '/static/css/tailwind.css'))
+        self.assertFalse(test('', '/static/spa/index.html'))
+
+
+@override_settings(WHITENOISE_AUTOREFRESH=True, WHITENOISE_USE_FINDERS=True)
+class AsgiStaticFilesTests(SimpleTestCase):
+    async def request(self, path, fallback):
+        from .asgi_static import StaticFilesApp
+
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {'type': 'http', 'method': 'GET', 'path': path, 'headers': [(b'host', b'testserver')]}
+        await StaticFilesApp(fallback)(scope, None, send)
+        return sent
+
+    async def test_static_file_is_served_before_django(self):
+        fallback = mock.AsyncMock()
+        sent = await self.request('/static/js/main.js', fallback)
+        fallback.assert_not_called()
+        self.assertEqual(sent[0]['status'], 200)
+        body = b''.join(message.get('body', b'') for message in sent[1:])
+        self.assertEqual(body, (settings.BASE_DIR / 'static' / 'js' / 'main.js').read_bytes())
+        self.assertFalse(sent[-1]['more_body'])
+
+    async def test_other_paths_go_to_django(self):
+        fallback = mock.AsyncMock()
+        await self.request('/api/eventos/', fallback)
+        fallback.assert_awaited_once()
+
+    def test_cached_feeds_are_async_views(self):
+        with override_settings(ASGI_MODE=True):
+            view = content_cache.content_cached_view('feed')(lambda request: None)
+        self.assertTrue(iscoroutinefunction(view))
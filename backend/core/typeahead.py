@@ -0,0 +1,117 @@
+"""Índice de prefixos em memória para a busca enquanto se digita.
+
+Cada processo mantém uma lista ordenada de chaves normalizadas (minúsculas,
+sem acentos) — o título inteiro e também o título a partir de cada palavra,
+para que "negra" encontre "Semana da Consciência Negra". Uma consulta é só
+um ``bisect`` seguido de uma varredura curta, sem acesso ao banco.
+
+O índice é reconstruído na primeira consulta depois que o carimbo de
+versão do conteúdo (core.content_cache) muda.
+"""
+import re
+import threading
+import unicodedata
+from bisect import bisect_left
+
+from django.db.models import Q
+from django.urls import reverse
+
+from .content_cache import get_content_version
+from .db_router import use_primary
+from .models import BlogPost, Event, Project, Tag
+
+
+KIND_LABELS = {
+    'post': 'Blog',
+    'event': 'Evento',
+    'project': 'Projeto',
+    'tag': 'Tag',
+}
+
+_NON_WORD_RE = re.compile(r'[^\w]+')
+
+
+def fold(text):
+    """Normaliza para comparação: sem acentos, minúsculo e só letras/números."""
+    text = unicodedata.normalize('NFKD', text)
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return _NON_WORD_RE.sub(' ', text.casefold()).strip()
+
+
+class PrefixIndex:
+    def __init__(self, entries):
+        # entries: lista de dicts {'kind', 'title', 'url'}
+        self.entries = entries
+        pairs = []
+        for entry_id, entry in enumerate(entries):
+            words = fold(entry['title']).split()
+            for position in range(len(words)):
+                pairs.append((' '.join(words[position:]), position, entry_id))
+        pairs.sort()
+        self.keys = [key for key, _position, _entry_id in pairs]
+        self.refs = [(position, entry_id) for _key, position, entry_id in pairs]
+
+    def search(self, query, limit=8):
+        query = fold(query)
+        if not query:
+            return []
+        start = bisect_left(self.keys, query)
+        found = {}
+        for index in range(start, len(self.keys)):
+            if not self.keys[index].startswith(query):
+                break
+            position, entry_id = self.refs[index]
+            if entry_id not in found or position < found[entry_id]:
+                found[entry_id] = position
+            if len(found) >= limit * 4:
+                break
+        # Títulos que começam com o termo vêm antes dos que só contêm uma palavra com ele
+        ranked = sorted(found, key=lambda entry_id: (found[entry_id], len(self.entries[entry_id]['title'])))
+        return [self.entries[entry_id] for entry_id in ranked[:limit]]
+
+
+def build_entries():
+    entries = []
+    sources = [
+        ('post', BlogPost.objects.filter(status='published'), 'blog_detail'),
+        ('event', Event.objects.exclude(status='cancelled'), 'event_detail'),
+        ('project', Project.objects.filter(status=True), 'project_detail'),
+    ]
+    for kind, queryset, url_name in sources:
+        for title, slug in queryset.values_list('title', 'slug').iterator():
+            entries.append({
+                'kind': kind,
+                'label': KIND_LABELS[kind],
+                'title': title,
+                'url': reverse(url_name, kwargs={'slug': slug}),
+            })
+    tags = Tag.objects.filter(Q(post_count__gt=0) | Q(event_count__gt=0) | Q(project_count__gt=0))
+    for name, slug in tags.values_list('name', 'slug'):
+        entries.append({
+            'kind': 'tag',
+            'label': KIND_LABELS['tag'],
+            'title': name,
+            'url': reverse('tag_detail', kwargs={'slug': slug}),
+        })
+    return entries
+
+
+_index = None
+_index_version = None
+_lock = threading.Lock()
+
+
+def get_index():
+    global _index, _index_version
+    version = get_content_version()
+    if _index is None or _index_version != version:
+        with _lock:
+            if _index is None or _index_version != version:
+                with use_primary():
+                    _index = PrefixIndex(build_entries())
+                _index_version = version
+    return _index
+
+
+def search(query, limit=8):
+    return get_index().search(query, limit=limit)
@@ -1,9 +1,11 @@
 from django.urls import path, include
 from django.contrib.auth import views as auth_views
+from django.contrib.sitemaps import views as sitemap_views
 
-from django.conf import settings
-from django.conf.urls.static import static
-
+from .content_cache import content_cached_view
+from .metrics import metrics_view
+from .feeds import EventsAtomFeed, EventsFeed, LatestPostsAtomFeed, LatestPostsFeed
+from .sitemaps import sitemaps
 
 from .views import (
     # Vistas Públicas
@@ -14,8 +16,14 @@ from .views import (
     projetos_view, # Mantida para a rota sem slug
     BlogListView,
     BlogDetailView,
+    post_like,
     EventListView,
     EventDetailView,
+    SpeakerListView,
+    SpeakerDetailView,
+    tag_cloud_view,
+    tag_detail_view,
+    robots_txt,
     contact_view,
     GalleryListView,
     event_register,
@@ -43,6 +51,7 @@ from .views import (
     admin_delete_user,      
     admin_edit_user_permissions, 
     eventos_json,
+    typeahead_view,
 
     # Vistas Admin (Classes)
     AdminPostListView,
@@ -68,6 +77,7 @@ from .views import (
     ProjectListView,
     ProjectDetailView,
     GalleryByEventView,
+    gallery_album_json,
     admin_message_detail,
 )
 
@@ -83,12 +93,33 @@ urlpatterns = [
     # Blog
     path('blog/', BlogListView.as_view(), name='blog'),
     path('blog/<slug:slug>/', BlogDetailView.as_view(), name='blog_detail'),
+    path('blog/<slug:slug>/like/', post_like, name='post_like'),
 
     # Eventos
     path('eventos/', EventListView.as_view(), name='eventos'),
     path('eventos/<slug:slug>/', EventDetailView.as_view(), name='event_detail'),
     path('eventos/<slug:slug>/register/', event_register, name='event_register'),
 
+    # Palestrantes
+    path('palestrantes/', SpeakerListView.as_view(), name='speaker_list'),
+    path('palestrantes/<slug:slug>/', SpeakerDetailView.as_view(), name='speaker_detail'),
+
+    # Tags (posts, eventos e projetos)
+    path('tags/', tag_cloud_view, name='tag_cloud'),
+    path('tags/<slug:slug>/', tag_detail_view, name='tag_detail'),
+
+    # Sitemap e feeds (guardados em cache até o conteúdo mudar)
+    path('robots.txt', robots_txt, name='robots_txt'),
+    path('metrics', metrics_view, name='metrics'),
+    path('sitemap.xml', content_cached_view('sitemap')(sitemap_views.index),
+         {'sitemaps': sitemaps, 'sitemap_url_name': 'sitemap_section'}, name='sitemap'),
+    path('sitemap-<section>.xml', content_cached_view('sitemap', query_params=('p',))(sitemap_views.sitemap),
+         {'sitemaps': sitemaps}, name='sitemap_section'),
+    path('feeds/blog/rss/', content_cached_view('feed')(LatestPostsFeed()), name='feed_blog_rss'),
+    path('feeds/blog/atom/', content_cached_view('feed')(LatestPostsAtomFeed()), name='feed_blog_atom'),
+    path('feeds/eventos/rss/', content_cached_view('feed')(EventsFeed()), name='feed_events_rss'),
+    path('feeds/eventos/atom/', content_cached_view('feed')(EventsAtomFeed()), name='feed_events_atom'),
+
     # Contato e Galeria
     path('contato/', contact_view, name='contato'),
     path('galeria/', GalleryListView.as_view(), name='galeria'),
@@ -180,6 +211,7 @@ urlpatterns = [
     path('admin-area/events/<slug:slug>/edit/', AdminEventUpdateView.as_view(), name='admin_event_update'),
     path('admin-area/events/<slug:slug>/delete/', AdminEventDeleteView.as_view(), name='admin_event_delete'),
     path('api/eventos/', eventos_json, name='eventos_json'),
+    path('api/busca/', typeahead_view, name='typeahead'),
 
     # --------------------
     # CRUD CATEGORIAS
@@ -198,6 +230,7 @@ urlpatterns = [
     path('admin-area/gallery/delete/<int:pk>/', AdminGalleryDeleteView.as_view(), name='admin_gallery_delete'),
     path("galeria/", GalleryListView.as_view(), name="galeria"),
     path("galeria/evento/<int:event_id>/", GalleryByEventView.as_view(), name="galeria_evento"),
+    path("api/galeria/evento/<int:event_id>/", gallery_album_json, name="galeria_evento_json"),
     # --------------------
     # CRUD TAGS
     # --------------------
@@ -220,6 +253,4 @@ urlpatterns = [
     
 
 
-]
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
+]
\ No newline at end of file
@@ -1,15 +1,28 @@
+import base64
+import binascii
+import hashlib
 from collections import defaultdict
 from datetime import date, datetime
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.mail import send_mail
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib.auth import authenticate, login, logout
 from django.contrib import messages
 from django.core.paginator import Paginator
-from django.db.models import Q
+from django.db import transaction
+from django.db.models import CharField, Count, DateTimeField, F, Q, Value
+from django.db.models.functions import Cast
 from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView
-from django.urls import reverse_lazy
-from django.http import JsonResponse
+from django.urls import reverse, reverse_lazy
+from django.http import HttpResponse, JsonResponse
 from django.utils.decorators import method_decorator
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.http import http_date, quote_etag
 from django.contrib.auth import get_user_model
 from django.contrib.auth.mixins import UserPassesTestMixin # Para garantir que apenas admins acessem
 from django.utils.text import slugify
@@ -35,7 +48,12 @@ from .forms import (
     ProjectForm,
 )
 
-from .models import BlogPost, Event, Category, ContactMessage, GalleryImage ,Tag ,Project ,GalleryGroup
+from .models import BlogPost, Event, Category, ContactMessage, GalleryImage ,Tag ,Project ,GalleryGroup, Speaker, TrendingItem
+from .content_cache import aget_content_version, bump_content_version, get_content_version
+from .db_router import primary_view, use_primary
+from .facets import EVENT_FACETS, POST_FACETS, PROJECT_FACETS
+from . import typeahead
+from .likes import get_like_count, has_liked, like_total, liker_fingerprint, toggle_like
 
 User = get_user_model()
 
@@ -48,20 +66,91 @@ def is_admin(user):
     return user.is_staff or user.is_superuser
 
 
+class ConditionalDetailMixin:
+    """GET condicional (ETag/Last-Modified) para páginas de detalhe.
+
+    Antes de renderizar, busca só ``updated_at`` do objeto (e junta o carimbo
+    de versão do conteúdo); se o navegador ou proxy já tem essa versão,
+    responde 304 sem consultar o resto nem renderizar o template.
+    """
+
+    # Colunas lidas junto com updated_at e repassadas a get_etag_extra
+    etag_fields = ()
+
+    def get_etag_extra(self, pk, values):
+        """Partes extras da ETag além de updated_at e do usuário; ``values`` traz as ``etag_fields``."""
+        return []
+
+    def on_not_modified(self, pk):
+        """Chamado quando a resposta é 304 (ex.: contar a visualização)."""
+
+    def _patch_validators(self, response, etag, updated_at):
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(updated_at.timestamp())
+        if self.request.user.is_authenticated:
+            patch_cache_control(response, private=True, max_age=0, must_revalidate=True)
+        else:
+            patch_cache_control(response, public=True, max_age=0, must_revalidate=True)
+        return response
+
+    def get(self, request, *args, **kwargs):
+        if len(messages.get_messages(request)):
+            # Mensagem pendente (ex.: erro de inscrição antes do redirect): a página
+            # precisa ser renderizada, e sem validadores, para não ser reaproveitada depois
+            return super().get(request, *args, **kwargs)
+
+        lookup = {self.slug_field: kwargs[self.slug_url_kwarg]}
+        row = self.get_queryset().filter(**lookup).values('pk', 'updated_at', *self.etag_fields).first()
+        if row is None:
+            # Deixa o DetailView responder o 404 normalmente
+            return super().get(request, *args, **kwargs)
+
+        pk, updated_at = row['pk'], row['updated_at']
+        # O carimbo de versão cobre os objetos relacionados exibidos na página
+        # (palestrantes, categoria, tags), cuja edição não altera updated_at
+        parts = [
+            self.model._meta.label_lower, pk, updated_at.isoformat(), get_content_version(), request.user.pk or 0,
+        ]
+        parts += self.get_etag_extra(pk, row)
+        etag = quote_etag(hashlib.md5(repr(parts).encode()).hexdigest())
+
+        response = get_conditional_response(request, etag=etag, last_modified=int(updated_at.timestamp()))
+        if response is not None:
+            self.on_not_modified(pk)
+            return self._patch_validators(response, etag, updated_at)
+
+        response = super().get(request, *args, **kwargs)
+        return self._patch_validators(response, etag, updated_at)
+
+
 # ==========================
 # 🌐 Views Públicas
 # ==========================
 def home_view(request):
-    featured_events = Event.objects.filter(featured=True, status='upcoming')[:2]
+    featured_events = Event.objects.upcoming().filter(featured=True)[:2]
     recent_posts = BlogPost.objects.filter(status='published').order_by('-created_at')[:3]
     recent_gallery_images = GalleryImage.objects.filter(published=True).order_by('-uploaded_at')[:6]
     context = {
         'featured_events': featured_events,
         'recent_posts': recent_posts,
         'recent_gallery_images': recent_gallery_images,
+        # Ranking "em alta" pré-calculado pelo comando update_trending
+        'trending_posts': TrendingItem.top('post', limit=3),
+        'trending_events': TrendingItem.top('event', limit=3),
     }
     return render(request, 'pages/home.html', context)
 
+def robots_txt(request):
+    lines = [
+        'User-agent: *',
+        'Disallow: /admin/',
+        'Disallow: /admin-area/',
+        'Disallow: /django-admin/',
+        '',
+        f"Sitemap: {request.build_absolute_uri(reverse('sitemap'))}",
+    ]
+    return HttpResponse('\n'.join(lines) + '\n', content_type='text/plain')
+
 def sobre_view(request):
     return render(request, 'pages/sobre.html')
 
@@ -80,7 +169,6 @@ class BlogListView(ListView):
     def get_queryset(self):
         queryset = BlogPost.objects.filter(status='published')
         search = self.request.GET.get('search')
-        category = self.request.GET.get('category')
         if search:
             queryset = queryset.filter(
                 Q(title__icontains=search) |
@@ -88,14 +176,17 @@ class BlogListView(ListView):
                 Q(author__first_name__icontains=search) |
                 Q(author__last_name__icontains=search)
             )
-        if category and category != 'Todos':
-            queryset = queryset.filter(category__name=category)
-        return queryset
+        # Base das contagens de filtro: tudo menos as próprias facetas
+        self.facet_base = queryset
+        return POST_FACETS.filter(queryset, POST_FACETS.active(self.request.GET))
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['categories'] = Category.objects.all()
+        context['facets'] = POST_FACETS.counts(
+            self.facet_base, self.request.GET, cache_extra=self.request.GET.get('search', ''),
+        )
         context['featured_posts'] = BlogPost.objects.filter(featured=True, status='published')[:3]
+        context['trending_posts'] = TrendingItem.top('post', limit=10)
         context['search_form'] = SearchForm(self.request.GET)
         return context
     
@@ -169,22 +260,36 @@ def semana_consciencia_negra(request):
     })
 
 
-def eventos_json(request):
-    eventos = Event.objects.all()
-    data = []
-
-    for evento in eventos:
-        start_dt = datetime.combine(evento.date, evento.start_time)
-        end_dt = datetime.combine(evento.date, evento.end_time)
-
-        data.append({
-            "title": evento.title,
-            "start": start_dt.isoformat(),
-            "end": end_dt.isoformat(),
-            "slug": evento.slug,
-            "description": evento.description or "",
-            "url": f"/eventos/{evento.slug}/",
-        })
+def typeahead_view(request):
+    """Sugestões de busca a partir do índice em memória (core.typeahead), sem consultar o banco."""
+    query = request.GET.get('q', '')[:100]
+    response = JsonResponse({'results': typeahead.search(query)})
+    patch_cache_control(response, public=True, max_age=60)
+    return response
+
+async def eventos_json(request):
+    # Cache invalidado pelo carimbo de versão do conteúdo (core.content_cache)
+    cache_key = f'eventos_json:{await aget_content_version()}'
+    data = await cache.aget(cache_key)
+
+    if data is None:
+        data = []
+        eventos = Event.objects.values('title', 'slug', 'description', 'date', 'start_time', 'end_time')
+        # Guardado sob a versão atual: lê do principal, não de uma réplica atrasada
+        with use_primary():
+            async for evento in eventos:
+                start_dt = datetime.combine(evento['date'], evento['start_time'])
+                end_dt = datetime.combine(evento['date'], evento['end_time'])
+
+                data.append({
+                    "title": evento['title'],
+                    "start": start_dt.isoformat(),
+                    "end": end_dt.isoformat(),
+                    "slug": evento['slug'],
+                    "description": evento['description'] or "",
+                    "url": f"/eventos/{evento['slug']}/",
+                })
+        await cache.aset(cache_key, data, timeout=60 * 60)
 
     return JsonResponse(data, safe=False)
 
@@ -210,7 +315,7 @@ def calendario_eventos(request):
     })
 
 
-class BlogDetailView(DetailView):
+class BlogDetailView(ConditionalDetailMixin, DetailView):
     model = BlogPost
     template_name = 'pages/post_detail.html'
     context_object_name = 'post'
@@ -220,13 +325,41 @@ class BlogDetailView(DetailView):
     def get_queryset(self):
         return BlogPost.objects.filter(status='published')
 
+    # A gravação das curtidas não altera updated_at: o total entra na ETag
+    etag_fields = ('likes', 'likes_applied')
+
+    def get_etag_extra(self, pk, values):
+        # A página mostra o total e o estado da curtida da sessão
+        total = like_total(pk, values['likes'], values['likes_applied'])
+        return [total, self.request.session.get('liker_id')]
+
+    def on_not_modified(self, pk):
+        # Visualização contada sem renderizar a página (não altera updated_at)
+        BlogPost.objects.filter(pk=pk).update(views=F('views') + 1)
+
     def get_object(self, queryset=None):
         obj = super().get_object(queryset)
-        # Incrementa visualizações
+        # Incrementa visualizações no banco (o objeto pode ter vindo de uma réplica atrasada)
+        BlogPost.objects.filter(pk=obj.pk).update(views=F('views') + 1)
         obj.views += 1
-        obj.save(update_fields=['views'])
         return obj
-    
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['like_count'] = get_like_count(self.object)
+        # Só consulta o estado da curtida se já houver identidade (não cria sessão na leitura)
+        if self.request.user.is_authenticated or 'liker_id' in self.request.session:
+            context['liked'] = has_liked(self.object, liker_fingerprint(self.request))
+        return context
+
+
+@require_POST
+def post_like(request, slug):
+    """Curte/descurte um post (uma vez por usuário ou sessão) e retorna o total atual."""
+    post = get_object_or_404(BlogPost.objects.only('pk', 'likes'), slug=slug, status='published')
+    liked, count = toggle_like(post, liker_fingerprint(request))
+    return JsonResponse({'liked': liked, 'likes': count})
+
 
 def edit_event(request, pk):
     event = get_object_or_404(Event, pk=pk)  # Busca o evento pelo ID
@@ -308,39 +441,78 @@ class EventListView(ListView):
     paginate_by = 6
 
     def get_queryset(self):
-        queryset = Event.objects.exclude(status='cancelled')
-        category = self.request.GET.get('category')
-        event_type = self.request.GET.get('type')
-        if category and category != 'Todos':
-            queryset = queryset.filter(category=category)
-        if event_type and event_type != 'Todos':
-            queryset = queryset.filter(event_type=event_type)
-        return queryset.order_by('date', 'start_time')
+        self.facet_base = Event.objects.exclude(status='cancelled')
+        queryset = EVENT_FACETS.filter(self.facet_base, EVENT_FACETS.active(self.request.GET))
+        return queryset.with_speakers().order_by('date', 'start_time')
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['featured_events'] = Event.objects.filter(featured=True, status='upcoming')[:2]
-        context['categories'] = Event.objects.values_list('category', flat=True).distinct()
-        context['event_types'] = Event.TYPE_CHOICES
+        context['featured_events'] = Event.objects.upcoming().filter(featured=True)[:2]
+        context['facets'] = EVENT_FACETS.counts(self.facet_base, self.request.GET)
         return context
 
-class EventDetailView(DetailView):
+class EventDetailView(ConditionalDetailMixin, DetailView):
     model = Event
     template_name = 'pages/event_detail.html'
     context_object_name = 'event'
     slug_field = 'slug'
     slug_url_kwarg = 'slug'
 
-def contact_view(request):
+    def get_queryset(self):
+        return Event.objects.with_speakers()
+
+
+class SpeakerListView(ListView):
+    model = Speaker
+    template_name = 'pages/palestrantes.html'
+    context_object_name = 'speakers'
+    paginate_by = 30
+
+    def get_queryset(self):
+        return Speaker.objects.annotate(
+            event_count=Count('event_links', filter=~Q(event_links__event__status='cancelled'))
+        ).order_by('name')
+
+
+class SpeakerDetailView(DetailView):
+    model = Speaker
+    template_name = 'pages/speaker_detail.html'
+    context_object_name = 'speaker'
+    slug_field = 'slug'
+    slug_url_kwarg = 'slug'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        # Busca pelo índice (speaker, event) da tabela de ligação, sem LIKE no texto
+        context['events'] = (
+            Event.objects.filter(speaker_links__speaker=self.object)
+            .exclude(status='cancelled')
+            .with_speakers()
+            .order_by('-date', '-start_time')
+        )
+        return context
+
+async def contact_view(request):
     if request.method == 'POST':
         form = ContactForm(request.POST)
         if form.is_valid():
-            form.save()
+            contact = form.instance
+            await contact.asave()
+            if settings.CONTACT_NOTIFICATION_EMAIL:
+                # O envio SMTP roda em uma thread, sem bloquear o worker/event loop
+                await sync_to_async(send_mail, thread_sensitive=False)(
+                    f'[NEABI] Nova mensagem: {contact.subject}',
+                    f'{contact.name} <{contact.email}> escreveu:\n\n{contact.message}',
+                    None,
+                    [settings.CONTACT_NOTIFICATION_EMAIL],
+                    fail_silently=True,
+                )
             messages.success(request, 'Mensagem enviada com sucesso!')
             return redirect('contato')
     else:
         form = ContactForm()
-    return render(request, 'pages/contato.html', {'form': form})
+    # Os context processors podem acessar request.user (banco): renderiza fora do event loop
+    return await sync_to_async(render)(request, 'pages/contato.html', {'form': form})
 
 @method_decorator([login_required, user_passes_test(is_admin)], name='dispatch')
 class EventUpdateView(UpdateView):
@@ -373,25 +545,71 @@ class GalleryListView(ListView):
         ).distinct()
     
 
-# 📌 Página do EVENTO: mostra TODAS as fotos do evento selecionado
+def _encode_album_cursor(cursor):
+    if cursor is None:
+        return None
+    uploaded_at, pk = cursor
+    return base64.urlsafe_b64encode(f'{uploaded_at.isoformat()}|{pk}'.encode()).decode()
+
+
+def _decode_album_cursor(value):
+    try:
+        uploaded_at, pk = base64.urlsafe_b64decode(value.encode()).decode().split('|')
+        uploaded_at = parse_datetime(uploaded_at)
+        if uploaded_at is None:
+            raise ValueError(value)
+        return uploaded_at, int(pk)
+    except (ValueError, UnicodeDecodeError, binascii.Error):
+        return None
+
+
+def _album_image_data(image):
+    return {
+        'id': image.pk,
+        'title': image.title,
+        'description': image.description,
+        'url': image.image.url,
+        'width': image.image_width,
+        'height': image.image_height,
+        'placeholder': image.image_placeholder,
+    }
+
+
+# 📌 Página do EVENTO: primeira tela de fotos no HTML, o restante sob demanda (gallery_album_json)
 class GalleryByEventView(ListView):
     model = GalleryImage
     template_name = 'pages/galeria_evento.html'
     context_object_name = 'images'
 
     def get_queryset(self):
-        event_id = self.kwargs["event_id"]
-        return GalleryImage.objects.filter(
-            event_id=event_id,
-            published=True
-        ).order_by("-uploaded_at")
+        self.event = get_object_or_404(Event, pk=self.kwargs["event_id"])
+        images, self.next_cursor = GalleryImage.album_page(self.event)
+        return images
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context["event"] = Event.objects.get(id=self.kwargs["event_id"])
+        context["event"] = self.event
+        context["next_cursor"] = _encode_album_cursor(self.next_cursor)
         return context
 
 
+def gallery_album_json(request, event_id):
+    event = Event.objects.filter(pk=event_id).first()
+    if event is None:
+        return JsonResponse({'error': 'evento não encontrado'}, status=404)
+    cursor = None
+    if request.GET.get('cursor'):
+        cursor = _decode_album_cursor(request.GET['cursor'])
+        if cursor is None:
+            return JsonResponse({'error': 'cursor inválido'}, status=400)
+
+    images, next_cursor = GalleryImage.album_page(event, cursor)
+    return JsonResponse({
+        'results': [_album_image_data(image) for image in images],
+        'next': _encode_album_cursor(next_cursor),
+    })
+
+
 
 class EventGalleryView(DetailView):
     model = Event
@@ -404,6 +622,7 @@ class EventGalleryView(DetailView):
         return context
 
 
+@primary_view
 def event_register(request, slug):
     event = get_object_or_404(Event, slug=slug)
     if not event.registration_required:
@@ -416,8 +635,10 @@ def event_register(request, slug):
         
     # Lógica de registro simples
     # Nota: Em um sistema real, você registraria o usuário (ou um objeto Inscrição) aqui
-    event.registered += 1
-    event.save()
+    # UPDATE atômico: não sobrescreve as demais colunas do evento. updated_at
+    # e o carimbo de versão mudam como no save(), para a página mostrar as vagas
+    Event.objects.filter(pk=event.pk).update(registered=F('registered') + 1, updated_at=timezone.now())
+    transaction.on_commit(bump_content_version)
     messages.success(request, f'Inscrição realizada com sucesso para "{event.title}"!')
     return redirect('event_detail', slug=slug)
 
@@ -473,17 +694,9 @@ def login_view(request):
         username_or_email = request.POST.get('username')
         password = request.POST.get('password')
 
-        # Tenta autenticar por username
+        # O backend (core.backends) aceita username ou email em uma única tentativa
         user = authenticate(request, username=username_or_email, password=password)
 
-        # Se não achou, tenta por email (opcional)
-        if user is None:
-            try:
-                user_obj = User.objects.get(email=username_or_email)
-                user = authenticate(request, username=user_obj.username, password=password)
-            except User.DoesNotExist:
-                user = None
-
         if user is not None:
             login(request, user)
             messages.success(request, f"Bem-vindo, {user.get_full_name()}!")
@@ -608,15 +821,74 @@ class ProjectListView(ListView):
 
     def get_queryset(self):
         # Filtra apenas projetos ativos (status=True) e ordena do mais recente para o mais antigo
-        return Project.objects.filter(status=True).order_by('-created_at')
+        self.facet_base = Project.objects.filter(status=True)
+        selected = PROJECT_FACETS.active(self.request.GET)
+        return PROJECT_FACETS.filter(self.facet_base, selected).order_by('-created_at')
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['facets'] = PROJECT_FACETS.counts(self.facet_base, self.request.GET)
+        return context
 
 # =======================================================
 #  SITE – DETALHE DO PROJETO PÚBLICO
 # =======================================================
-class ProjectDetailView(DetailView):
+class ProjectDetailView(ConditionalDetailMixin, DetailView):
     model = Project
     template_name = 'projects/project_detail.html'
     context_object_name = 'project'
+    slug_field = 'slug'
+    slug_url_kwarg = 'slug'
+
+
+# =======================================================
+#  SITE – PÁGINAS DE TAGS (posts, eventos e projetos juntos)
+# =======================================================
+def tag_cloud_view(request):
+    return render(request, 'pages/tags.html', {'tags': Tag.cloud(limit=100)})
+
+
+def tag_detail_view(request, slug):
+    tag = get_object_or_404(Tag, slug=slug)
+
+    # Um UNION ALL ordenado por data pagina os três tipos juntos no banco;
+    # depois só os itens da página atual são carregados.
+    def rows(queryset, kind, sort_date):
+        return queryset.filter(tags=tag).order_by().annotate(
+            kind=Value(kind, output_field=CharField()),
+            sort_date=sort_date,
+        ).values_list('pk', 'kind', 'sort_date')
+
+    merged = rows(
+        BlogPost.objects.filter(status='published'), 'post', F('published_date')
+    ).union(
+        rows(Event.objects.exclude(status='cancelled'), 'event', Cast('date', DateTimeField())),
+        rows(Project.objects.filter(status=True), 'project', F('created_at')),
+        all=True,
+    ).order_by('-sort_date', 'kind', '-pk')
+
+    page_obj = Paginator(merged, 12).get_page(request.GET.get('page'))
+
+    ids = defaultdict(list)
+    for pk, kind, _sort_date in page_obj.object_list:
+        ids[kind].append(pk)
+    loaded = {
+        'post': BlogPost.objects.select_related('category').in_bulk(ids['post']),
+        'event': Event.objects.in_bulk(ids['event']),
+        'project': Project.objects.in_bulk(ids['project']),
+    }
+    items = [
+        {'kind': kind, 'object': loaded[kind][pk]}
+        for pk, kind, _sort_date in page_obj.object_list
+        if pk in loaded[kind]
+    ]
+
+    return render(request, 'pages/tag_detail.html', {
+        'tag': tag,
+        'items': items,
+        'page_obj': page_obj,
+        'is_paginated': page_obj.has_other_pages(),
+    })
 
 
 # -----------------------------------
@@ -664,7 +936,7 @@ def admin_dashboard_view(request):
     }
     
     recent_posts = BlogPost.objects.order_by('-created_at')[:5]
-    upcoming_events = Event.objects.filter(status='upcoming').order_by('date')[:5]
+    upcoming_events = Event.objects.upcoming().order_by('date', 'start_time')[:5]
     recent_messages = ContactMessage.objects.filter(is_read=False).order_by('-created_at')[:5]
     
     context = {
@@ -985,9 +1257,17 @@ class AdminCategoryListView(ListView):
     context_object_name = 'categories'
     ordering = ['name']
     paginate_by = 10
+
+    def get_ordering(self):
+        # ?ordem=uso: mais usadas primeiro, pelos contadores desnormalizados (sem COUNT)
+        if self.request.GET.get('ordem') == 'uso':
+            return [(F('post_count') + F('event_count') + F('project_count')).desc(), 'name']
+        return self.ordering
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['form'] = CategoryForm()
+        context['ordem'] = self.request.GET.get('ordem', '')
         return context
 
 # ==========================
@@ -1001,6 +1281,9 @@ class AdminGalleryListView(ListView):
     paginate_by = 20
     ordering = ['-uploaded_at']
 
+    def get_queryset(self):
+        return super().get_queryset().select_related('event', 'near_duplicate_of')
+
 @method_decorator([login_required, user_passes_test(is_admin)], name='dispatch')
 class AdminGalleryCreateView(CreateView):
     model = GalleryImage
@@ -1008,8 +1291,19 @@ class AdminGalleryCreateView(CreateView):
     template_name = 'admin/gallery_form.html'
     success_url = reverse_lazy('admin_gallery_list')
     def form_valid(self, form):
+        response = super().form_valid(form)
+        if form.exact_duplicate is not None:
+            messages.info(
+                self.request,
+                f'Arquivo idêntico a "{form.exact_duplicate.title}": o arquivo existente foi reaproveitado.',
+            )
+        elif form.near_duplicates:
+            messages.warning(
+                self.request,
+                f'Imagem muito parecida com "{form.near_duplicates[0].title}". Verifique se não é repetida.',
+            )
         messages.success(self.request, 'Imagem adicionada à galeria com sucesso!')
-        return super().form_valid(form)
+        return response
 
 @method_decorator([login_required, user_passes_test(is_admin)], name='dispatch')
 class AdminGalleryUpdateView(UpdateView):
@@ -0,0 +1,114 @@
+"""Aquecimento do worker antes de ele receber tráfego.
+
+Sem isso, a primeira requisição de cada worker (depois de todo deploy ou
+reinício) paga sozinha: importar as views e formulários, montar o resolver
+de URLs, compilar os templates, abrir a conexão com o banco e reconstruir os
+caches do processo (índice da busca etc.).
+
+``warm_up()`` faz tudo isso no carregamento da aplicação. É chamado por
+``wsgi.py`` e ``asgi.py`` quando ``WARMUP_ON_START`` está ligado e pode ser
+medido etapa por etapa com ``python manage.py warmup``.
+"""
+import logging
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+from django.template import TemplateSyntaxError, engines
+from django.urls import get_resolver
+
+
+logger = logging.getLogger(__name__)
+
+
+def _urls():
+    resolver = get_resolver()
+    # Importa todos os módulos de views e monta o índice usado pelo reverse()
+    resolver.url_patterns
+    resolver.reverse_dict
+    return f'{len(resolver.reverse_dict)} nomes de URL'
+
+
+def _modules():
+    import PIL.ExifTags  # noqa: F401 — uploads (core.imagehash / core.imagemeta)
+    import PIL.Image  # noqa: F401
+
+    from . import forms  # noqa: F401 — layouts do crispy-forms
+    return 'formulários e Pillow'
+
+
+def _template_names(directory):
+    root = Path(directory)
+    for path in sorted(root.rglob('*.html')):
+        yield path.relative_to(root).as_posix()
+
+
+def _template_dirs(engine):
+    """Diretórios de todos os loaders: DIRS e os templates dos apps (admin, crispy-forms)."""
+    for loader in engine.template_loaders:
+        # O loader em cache só envolve os loaders de verdade
+        for inner in getattr(loader, 'loaders', [loader]):
+            if hasattr(inner, 'get_dirs'):
+                yield from inner.get_dirs()
+
+
+def _templates():
+    """Compila os templates do projeto e dos apps para o loader em cache do processo."""
+    engine = engines['django']
+    names = {name for directory in _template_dirs(engine.engine) for name in _template_names(directory)}
+    compiled = broken = 0
+    for name in sorted(names):
+        try:
+            engine.get_template(name)
+            compiled += 1
+        except TemplateSyntaxError as exc:
+            broken += 1
+            logger.warning('Template com erro de sintaxe: %s (%s)', name, exc)
+    return f'{compiled} templates' + (f', {broken} com erro' if broken else '')
+
+
+def _database():
+    for alias in connections:
+        connections[alias].ensure_connection()
+    return ', '.join(connections)
+
+
+def _caches():
+    from . import typeahead
+    from .content_cache import get_content_version
+
+    get_content_version()
+    index = typeahead.get_index()
+    return f'índice da busca com {len(index.entries)} itens'
+
+
+STEPS = [
+    ('urls', _urls),
+    ('módulos', _modules),
+    ('templates', _templates),
+    ('banco', _database),
+    ('caches', _caches),
+]
+
+
+def warm_up(skip=()):
+    """Executa as etapas e devolve [(etapa, segundos, resumo)]; falhas não impedem o worker de subir."""
+    results = []
+    for name, step in STEPS:
+        if name in skip:
+            continue
+        start = time.perf_counter()
+        try:
+            summary = step()
+        except Exception as exc:
+            logger.exception('Falha no aquecimento (%s)', name)
+            summary = f'falhou: {exc}'
+        results.append((name, time.perf_counter() - start, summary))
+    return results
+
+
+def warm_up_on_start(skip=()):
+    if settings.WARMUP_ON_START:
+        results = warm_up(skip)
+        logger.info('Worker aquecido em %.0f ms', sum(elapsed for _name, elapsed, _summary in results) * 1000)
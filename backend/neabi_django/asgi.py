@@ -0,0 +1,25 @@
+import os
+import threading
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'neabi_django.settings')
+# Ativa as versões assíncronas das views de E/O (ex.: entrega de mídia)
+os.environ.setdefault('NEABI_ASGI', '1')
+
+django_application = get_asgi_application()
+
+# Estáticos antes da pilha do Django (o WhiteNoiseMiddleware é só síncrono)
+from core.asgi_static import StaticFilesApp  # noqa: E402
+
+application = StaticFilesApp(django_application)
+
+# Prepara o worker antes da primeira requisição (WARMUP_ON_START). Roda em
+# outra thread: o servidor pode importar este módulo de dentro do event loop,
+# onde o ORM síncrono é proibido. A etapa do banco fica de fora: a conexão
+# aberta nessa thread seria descartada; o ganho no ASGI vem das URLs,
+# templates e caches.
+from core.warmup import warm_up_on_start  # noqa: E402
+
+_warmup = threading.Thread(target=warm_up_on_start, kwargs={'skip': ('banco',)}, name='warmup')
+_warmup.start()
+_warmup.join()
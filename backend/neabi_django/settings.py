@@ -20,6 +20,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.sitemaps',
     "whitenoise.runserver_nostatic",
     
     # Third party apps
@@ -32,9 +33,14 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.profiling.RequestProfilerMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    'core.metrics.RequestMetricsMiddleware',
+    'core.slowlog.SlowQueryContextMiddleware',
+    'core.db_router.ReplicaRoutingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
+    'core.middleware.AnonymousReadSessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
@@ -55,21 +61,96 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'core.context_processors.static_pipeline',
             ],
         },
     },
 ]
 
 WSGI_APPLICATION = 'neabi_django.wsgi.application'
+ASGI_APPLICATION = 'neabi_django.asgi.application'
+# Definido por asgi.py: servidores ASGI (uvicorn) usam as views assíncronas de E/O
+ASGI_MODE = os.getenv('NEABI_ASGI') == '1'
+if ASGI_MODE:
+    # O WhiteNoise só é síncrono e faria toda a pilha rodar via async_to_sync;
+    # no ASGI os estáticos são servidos por core.asgi_static, na frente do Django
+    MIDDLEWARE.remove('whitenoise.middleware.WhiteNoiseMiddleware')
 
 # Database
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Conexões persistentes: o worker reaproveita a conexão aberta no
+        # aquecimento. No ASGI cada requisição síncrona pode cair em outra
+        # thread, então lá o padrão continua sendo fechar a conexão.
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', '0' if ASGI_MODE else '60')),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+# Réplicas de leitura (core.db_router)
+# NEABI_DB_REPLICAS: arquivos SQLite separados por vírgula, para testar
+# localmente (copiados do principal por `python manage.py sync_replicas`). Com
+# PostgreSQL, declare as réplicas em DATABASES e liste os aliases aqui.
+DATABASE_REPLICAS = []
+for _index, _name in enumerate(filter(None, os.getenv('NEABI_DB_REPLICAS', '').split(',')), start=1):
+    DATABASES[f'replica{_index}'] = dict(DATABASES['default'], NAME=_name.strip(), TEST={'MIRROR': 'default'})
+    DATABASE_REPLICAS.append(f'replica{_index}')
+DATABASE_ROUTERS = ['core.db_router.PrimaryReplicaRouter']
+# Leituras destes caminhos sempre vão ao principal
+DATABASE_PRIMARY_PATHS = ('/admin-area/', '/django-admin/', '/admin/', '/messages/')
+# Depois de um POST, o visitante lê do principal por este tempo (s), até a réplica alcançá-lo
+DATABASE_STICKY_SECONDS = int(os.getenv('DB_STICKY_SECONDS', '15'))
+DATABASE_STICKY_COOKIE = 'neabi_primary'
+
+# Cache
+# Em produção com vários workers use um cache compartilhado (REDIS_URL);
+# localmente o cache em memória do processo é suficiente.
+# O cache 'likes' guarda curtidas ainda não gravadas no banco (core.likes):
+# fica separado para que o descarte de páginas em cache nunca as apague. No
+# Redis as chaves dele não têm expiração, então não são descartadas com
+# maxmemory-policy volatile-lru (ou noeviction).
+if os.getenv('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('REDIS_URL'),
+        },
+        'likes': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('REDIS_URL'),
+            'KEY_PREFIX': 'likes',
+        },
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'neabi',
+            'OPTIONS': {'MAX_ENTRIES': 10000},
+        },
+        'likes': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'neabi-likes',
+            # As entradas são apagadas a cada gravação em lote; o limite só evita descarte
+            'OPTIONS': {'MAX_ENTRIES': 1_000_000},
+        },
+    }
+
+# Sessões
+# Sem gravações no banco: sessões no cache compartilhado (Redis) ou em
+# cookie assinado. Mensagens vão em cookie para não criar sessões anônimas.
+if os.getenv('REDIS_URL'):
+    SESSION_ENGINE = 'django.contrib.sessions.backends.cache'
+else:
+    SESSION_ENGINE = 'django.contrib.sessions.backends.signed_cookies'
+SESSION_COOKIE_HTTPONLY = True
+# GETs anônimos que podem gravar na sessão (core.middleware.AnonymousReadSessionMiddleware):
+# a confirmação da redefinição de senha guarda o token na sessão antes de redirecionar
+SESSION_ANONYMOUS_GET_PATHS = ('/reset/', '/password-reset/', '/admin/login/')
+MESSAGE_STORAGE = 'django.contrib.messages.storage.cookie.CookieStorage'
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -98,11 +179,45 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 STATICFILES_DIRS = [
     BASE_DIR / 'static',
 ]
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+# Build do React/Vite (npx vite build --mode django) servido em /static/spa/
+VITE_BUILD_DIR = BASE_DIR.parent / 'dist' / 'spa'
+if VITE_BUILD_DIR.is_dir():
+    STATICFILES_DIRS.append(('spa', VITE_BUILD_DIR))
+# Cache "immutable" para os nomes com hash do Django (arquivo.0123456789ab.css) e
+# também para os do Vite (spa/assets/index-BQ3_kz-a.js), que o index.html do
+# bundle referencia diretamente, sem passar pelo manifest do collectstatic
+WHITENOISE_IMMUTABLE_FILE_TEST = (
+    rf'^{STATIC_URL}(?:.+\.[0-9a-f]{{12}}\.\w+|spa/assets/.+-[\w-]{{8}}\.\w+)$'
+)
+
+# Tailwind pré-compilado e purgado (npm run build:css); sem ele, base.html usa o CDN
+TAILWIND_PREBUILT = (BASE_DIR / 'static' / 'css' / 'tailwind.css').is_file()
+
+# collectstatic gera nomes com hash e variantes .br/.gz de cada arquivo.
+# Uploads são gravados pelo SHA-256 do conteúdo (core.storage); arquivos sem
+# referência são removidos pelo comando collect_media
+STORAGES = {
+    'default': {
+        'BACKEND': 'core.storage.ContentAddressedStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage',
+    },
+}
 
 # Media files
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+# Entrega de mídia (core.media): '' = o próprio Django envia o arquivo,
+# 'nginx' = X-Accel-Redirect para MEDIA_ACCEL_PREFIX, 'apache' = X-Sendfile
+MEDIA_ACCEL = os.getenv('MEDIA_ACCEL', '')
+MEDIA_ACCEL_PREFIX = os.getenv('MEDIA_ACCEL_PREFIX', '/protected-media/')
+MEDIA_CACHE_MAX_AGE = 60 * 60 * 24 * 365
+# Distância máxima (em bits do pHash) para sinalizar fotos da galeria como quase idênticas.
+# Até 3 a busca pelas faixas indexadas é exata (core.imagehash)
+GALLERY_NEAR_DUPLICATE_DISTANCE = 3
+# Fotos por página no álbum de cada evento (a primeira vem no HTML, as demais via JSON)
+GALLERY_ALBUM_PAGE_SIZE = 24
 
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
@@ -110,6 +225,9 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # Custom user model
 AUTH_USER_MODEL = 'core.User'
 
+# Login por username ou email com uma única verificação de senha
+AUTHENTICATION_BACKENDS = ['core.backends.EmailOrUsernameBackend']
+
 # Login URLs
 LOGIN_URL = '/admin/login/'
 LOGIN_REDIRECT_URL = '/admin/dashboard/'
@@ -132,6 +250,9 @@ MESSAGE_TAGS = {
 # EMAIL CONFIG (GMAIL + RENDER)
 # ==========================
 
+# Endereço que recebe aviso de novas mensagens do formulário de contato (vazio = sem aviso)
+CONTACT_NOTIFICATION_EMAIL = os.getenv('CONTACT_NOTIFICATION_EMAIL', '')
+
 if not DEBUG:
     EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
     EMAIL_HOST = os.getenv('EMAIL_HOST', 'smtp.gmail.com')
@@ -143,3 +264,85 @@ if not DEBUG:
 else:
     # Ambiente local
     EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
+
+
+# ==========================
+# RANKING "EM ALTA"
+# ==========================
+# Meia-vida (em horas) do decaimento exponencial usado pelo comando update_trending
+TRENDING_HALF_LIFE_HOURS = float(os.getenv('TRENDING_HALF_LIFE_HOURS', 72))
+# Quantidade de itens mantidos na tabela de ranking por tipo
+TRENDING_SIZE = int(os.getenv('TRENDING_SIZE', 20))
+
+
+# ==========================
+# CURTIDAS
+# ==========================
+# Intervalo (em segundos) entre gravações em lote das curtidas no banco
+LIKES_FLUSH_INTERVAL = int(os.getenv('LIKES_FLUSH_INTERVAL', 60))
+
+
+# ==========================
+# MÉTRICAS
+# ==========================
+# Server-Timing para a equipe e /metrics (Prometheus); desligado, o middleware sai da pilha
+METRICS_ENABLED = os.getenv('METRICS_ENABLED') == '1'
+# Token do coletor: Authorization: Bearer <METRICS_TOKEN> (sem ele, só usuários da equipe)
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+
+
+# ==========================
+# CONSULTAS LENTAS
+# ==========================
+# Consultas acima deste tempo (ms) vão para o log com o plano de execução (0 = desligado)
+SLOW_QUERY_MS = float(os.getenv('SLOW_QUERY_MS', 0))
+SLOW_QUERY_LOG_FILE = os.getenv('SLOW_QUERY_LOG_FILE', str(BASE_DIR / 'logs' / 'slow_queries.log'))
+# PostgreSQL: fração das consultas lentas explicadas com EXPLAIN ANALYZE (roda a consulta de novo)
+SLOW_QUERY_EXPLAIN_ANALYZE_RATE = float(os.getenv('SLOW_QUERY_EXPLAIN_ANALYZE_RATE', 0.1))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'message': {'format': '%(message)s'},
+    },
+    'handlers': {
+        'slow_queries': {
+            'class': 'logging.handlers.RotatingFileHandler',
+            'filename': SLOW_QUERY_LOG_FILE,
+            'maxBytes': 10 * 1024 * 1024,
+            'backupCount': 5,
+            'encoding': 'utf-8',
+            'delay': True,
+            'formatter': 'message',
+        },
+    },
+    'loggers': {
+        # Uma linha JSON por consulta lenta (core.slowlog)
+        'neabi.slow_queries': {
+            'handlers': ['slow_queries'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
+    },
+}
+
+
+# ==========================
+# PROFILING SOB DEMANDA
+# ==========================
+# Validade (s) do token exibido em /django-admin/ → Perfis de Requisição (core.profiling)
+PROFILER_TOKEN_MAX_AGE = 60 * 60
+# Intervalo entre amostras da pilha, em segundos
+PROFILER_INTERVAL = 0.001
+# Perfis guardados no banco (os mais antigos são apagados)
+PROFILER_KEEP = 50
+
+
+# ==========================
+# AQUECIMENTO DOS WORKERS
+# ==========================
+# wsgi.py/asgi.py carregam URLs, templates, conexão com o banco e caches antes
+# de o worker atender a primeira requisição (core.warmup). Desligado por
+# padrão em desenvolvimento, para o autoreload continuar rápido.
+WARMUP_ON_START = os.getenv('NEABI_WARMUP', '0' if DEBUG else '1') == '1'
@@ -1,14 +1,21 @@
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 from django.conf import settings
 from django.conf.urls.static import static
 
+from core.media import aserve_media, serve_media
+
 urlpatterns = [
     path('django-admin/', admin.site.urls),  # Django admin
+    # Arquivos enviados: servidos também em produção (ver core.media)
+    re_path(
+        r'^%s(?P<path>.+)$' % settings.MEDIA_URL.lstrip('/'),
+        aserve_media if settings.ASGI_MODE else serve_media,
+        name='media',
+    ),
     path('', include('core.urls')),  # Main app URLs
 ]
 
-# Serve media files during development
+# Serve static files during development
 if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
     urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
@@ -4,3 +4,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'neabi_django.settings')
 
 application = get_wsgi_application()
+
+# Prepara o worker antes da primeira requisição (WARMUP_ON_START)
+from core.warmup import warm_up_on_start  # noqa: E402
+
+warm_up_on_start()
@@ -236,6 +236,58 @@ document.addEventListener("DOMContentLoaded", function () {
 
   initTooltips();
 
+  // Busca enquanto digita (inputs com data-typeahead-url)
+  document.querySelectorAll("input[data-typeahead-url]").forEach(function (input) {
+    const list = document.createElement("div");
+    list.className =
+      "absolute left-0 right-0 mt-1 bg-white border rounded-md shadow-lg z-30 hidden";
+    input.parentNode.classList.add("relative");
+    input.parentNode.appendChild(list);
+
+    let timer = null;
+    let lastQuery = "";
+
+    function render(results) {
+      list.innerHTML = "";
+      results.forEach(function (item) {
+        const link = document.createElement("a");
+        link.href = item.url;
+        link.className =
+          "flex justify-between px-4 py-2 text-sm text-gray-700 hover:bg-amber-50 hover:text-amber-600";
+        const title = document.createElement("span");
+        title.textContent = item.title;
+        const label = document.createElement("span");
+        label.className = "text-xs text-gray-400 ml-4";
+        label.textContent = item.label;
+        link.append(title, label);
+        list.appendChild(link);
+      });
+      list.classList.toggle("hidden", results.length === 0);
+    }
+
+    input.setAttribute("autocomplete", "off");
+    input.addEventListener("input", function () {
+      clearTimeout(timer);
+      const query = input.value.trim();
+      if (!query) {
+        render([]);
+        return;
+      }
+      timer = setTimeout(function () {
+        lastQuery = query;
+        fetch(input.dataset.typeaheadUrl + "?q=" + encodeURIComponent(query))
+          .then((response) => response.json())
+          .then(function (data) {
+            // Ignora respostas fora de ordem
+            if (query === lastQuery) render(data.results);
+          });
+      }, 80);
+    });
+    input.addEventListener("blur", function () {
+      setTimeout(() => list.classList.add("hidden"), 150);
+    });
+  });
+
   console.log("NEABI JavaScript loaded successfully");
 });
 
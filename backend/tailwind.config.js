@@ -0,0 +1,33 @@
+/**
+ * Tailwind para os templates Django (backend/templates).
+ * Gera backend/static/css/tailwind.css já purgado e minificado:
+ *   npm run build:css
+ * Substitui o script do CDN usado em base.html durante o desenvolvimento.
+ */
+module.exports = {
+  content: [
+    "./backend/templates/**/*.html",
+    "./backend/static/js/**/*.js",
+  ],
+  theme: {
+    extend: {
+      colors: {
+        amber: {
+          50: "#fffbeb",
+          100: "#fef3c7",
+          600: "#d97706",
+          700: "#b45309",
+        },
+        red: {
+          700: "#b91c1c",
+        },
+        "neabi-primary": "#bb2c3d",
+        "neabi-dark": "#333",
+      },
+      fontFamily: {
+        sans: ["Inter", "sans-serif"],
+      },
+    },
+  },
+  plugins: [],
+};
@@ -13,8 +13,12 @@ export default defineConfig(({ mode }) => ({
       deny: [".env", ".env.*", "*.{crt,pem}", "**/.git/**", "server/**"],
     },
   },
+  // `vite build --mode django`: bundle coletado pelo collectstatic do Django e
+  // servido em /static/spa/. O build padrão (Netlify) continua publicado na raiz.
+  base: mode === "django" ? "/static/spa/" : "/",
   build: {
     outDir: "dist/spa",
+    manifest: true,
   },
   plugins: [react(), expressPlugin()],
   resolve: {